@@ -1,9 +1,8 @@
 #databaseconfig.py
-import pyodbc
-import pandas as pd
-from sqlalchemy import create_engine, text
 import warnings
 
+from etl_logging import logger
+
 warnings.filterwarnings("ignore")
 
 
@@ -12,6 +11,7 @@ class DatabaseConfig:
     SOURCE_DATABASE = "Northwind"
     TARGET_DATABASE = "Dw"
     ACCESS_PATH = r"C:/Users/hicha/SPACE/9RAYA/bizb/Projet-BI/data/access/Nw.accdb"
+    ACCESS_DB_PATH = ACCESS_PATH
 
 
 
@@ -26,27 +26,31 @@ def build_connection(db_name):
 
 
 def connect_to_database(db_name):
+    # pyodbc loads the ODBC driver manager, so it is only imported once a connection is needed
+    import pyodbc
+
     try:
         connection = pyodbc.connect(build_connection(db_name))
-        print(f"✅ Successfully connected to [{db_name}]")
+        # Debug level: parallel load workers and dashboard pools open one connection each
+        logger.debug(f"✅ Successfully connected to [{db_name}]")
         return connection
     except Exception as err:
-        print(f"❌ Connection error on [{db_name}]: {err}")
+        logger.error(f"❌ Connection error on [{db_name}]: {err}")
         return None
 
 
 def validate_connections():
-    print("Testing source database connection...")
+    logger.info("Testing source database connection...")
     source_conn = connect_to_database(DatabaseConfig.SOURCE_DATABASE)
     if source_conn:
         source_conn.close()
-        print("Source database: PASSED")
+        logger.info("Source database: PASSED")
 
-    print("\nTesting data warehouse connection...")
+    logger.info("\nTesting data warehouse connection...")
     warehouse_conn = connect_to_database(DatabaseConfig.TARGET_DATABASE)
     if warehouse_conn:
         warehouse_conn.close()
-        print("Data warehouse: PASSED")
+        logger.info("Data warehouse: PASSED")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+import argparse
+import os
+
+import pandas as pd
+
+
+SIMULATED_CHANGE_LOG_PATH = os.path.join('data', 'cdc', 'change_log.csv')
+
+# Change-tracked source tables: (primary key column read from the change table,
+# extracted dataset the changes re-extract, pipeline stage that loads that dataset)
+CHANGE_TRACKED_TABLES = {
+    'Customers': ('CustomerID', 'customer_data', 'dimensions'),
+    'Orders': ('OrderID', 'order_data', 'facts'),
+    'Order Details': ('OrderID', 'order_data', 'facts')
+}
+
+# Tables whose deletes remove the row itself; a deleted order line only changes its order
+ROW_DELETING_TABLES = ['Customers', 'Orders']
+
+# Changed keys per IN (...) list, under the 2100 parameter limit of a SQL Server request
+CHANGED_KEY_BATCH_SIZE = 1000
+
+SYNC_VERSION_QUERY = "SELECT SourceTable, LastSyncVersion FROM SourceSyncVersion"
+
+SYNC_VERSION_SAVE_QUERY = """
+    UPDATE SourceSyncVersion SET LastSyncVersion = ?, SyncedAt = GETDATE() WHERE SourceTable = ?;
+    IF @@ROWCOUNT = 0
+        INSERT INTO SourceSyncVersion (SourceTable, LastSyncVersion) VALUES (?, ?)
+"""
+
+
+class ChangeTrackingSource:
+    """SQL Server Change Tracking on the operational database"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def _scalar(self, query, *parameters):
+        cursor = self.connection.cursor()
+        cursor.execute(query, *parameters)
+        value = cursor.fetchone()[0]
+        cursor.close()
+        return value
+
+    def current_version(self):
+        version = self._scalar("SELECT CHANGE_TRACKING_CURRENT_VERSION()")
+        if version is None:
+            raise ValueError("Change Tracking is not enabled on the source database")
+        return int(version)
+
+    def min_valid_version(self, table_name):
+        """Oldest version the table's change history still covers; older syncs must re-extract in full"""
+        version = self._scalar("SELECT CHANGE_TRACKING_MIN_VALID_VERSION(OBJECT_ID(?))", f"[{table_name}]")
+        if version is None:
+            raise ValueError(f"Change Tracking is not enabled on [{table_name}]")
+        return int(version)
+
+    def changes(self, table_name, key_column, since_version):
+        """(PrimaryKey, Operation) per row changed after since_version, net of intermediate changes"""
+        return pd.read_sql(
+            f"SELECT ct.[{key_column}] AS PrimaryKey, ct.SYS_CHANGE_OPERATION AS Operation "
+            f"FROM CHANGETABLE(CHANGES [{table_name}], ?) AS ct",
+            self.connection, params=[since_version]
+        )
+
+
+class SimulatedChangeLog:
+    """File-backed stand-in for Change Tracking, for running the CDC mode locally.
+
+    Each line of the CSV records (Version, SourceTable, PrimaryKey, Operation);
+    record_changes appends under the next version, and changes() reports the last
+    operation per key after a version, as CHANGETABLE(CHANGES ...) does.
+    """
+
+    COLUMNS = ['Version', 'SourceTable', 'PrimaryKey', 'Operation']
+
+    def __init__(self, path=SIMULATED_CHANGE_LOG_PATH):
+        self.path = path
+
+    def _log(self):
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=self.COLUMNS)
+        return pd.read_csv(self.path, dtype={'SourceTable': str, 'PrimaryKey': str, 'Operation': str})
+
+    def current_version(self):
+        log = self._log()
+        return int(log['Version'].max()) if not log.empty else 0
+
+    def min_valid_version(self, table_name):
+        return 0
+
+    def changes(self, table_name, key_column, since_version):
+        log = self._log()
+        table_changes = log[(log['SourceTable'] == table_name) & (log['Version'] > since_version)]
+        table_changes = table_changes.sort_values('Version').drop_duplicates('PrimaryKey', keep='last')
+        return table_changes[['PrimaryKey', 'Operation']].reset_index(drop=True)
+
+    def record_changes(self, table_name, primary_keys, operation='U'):
+        """Append one change per key under a new version; returns that version"""
+        version = self.current_version() + 1
+        entries = pd.DataFrame({'Version': version, 'SourceTable': table_name,
+                                'PrimaryKey': [str(key) for key in primary_keys], 'Operation': operation})
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        entries.to_csv(self.path, mode='a', header=not os.path.exists(self.path), index=False)
+        return version
+
+
+def changed_keys(change_sets):
+    """Keys to re-extract and keys deleted, per dataset, from {table name: changes frame}.
+
+    Order line changes re-extract their order; a row deleted at source is only
+    reported as deleted when its own table says so.
+    """
+    upserts, deletes = {}, {}
+    for table_name, changes in change_sets.items():
+        key_column, dataset_name, _ = CHANGE_TRACKED_TABLES[table_name]
+        keys = changes['PrimaryKey'].astype(str).str.strip()
+        deleted = (changes['Operation'].astype(str).str.strip() == 'D').to_numpy()
+        if table_name in ROW_DELETING_TABLES:
+            deletes.setdefault(dataset_name, set()).update(keys[deleted])
+            upserts.setdefault(dataset_name, set()).update(keys[~deleted])
+        else:
+            upserts.setdefault(dataset_name, set()).update(keys)
+
+    # A row deleted at source cannot be re-extracted, whatever else changed on it
+    upserts = {dataset_name: sorted(keys - deletes.get(dataset_name, set())) for dataset_name, keys in upserts.items()}
+    deletes = {dataset_name: sorted(keys) for dataset_name, keys in deletes.items()}
+    return upserts, deletes
+
+
+def key_batches(keys):
+    for start in range(0, len(keys), CHANGED_KEY_BATCH_SIZE):
+        yield keys[start:start + CHANGED_KEY_BATCH_SIZE]
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Record source changes in the simulated change log")
+    argument_parser.add_argument('table', choices=list(CHANGE_TRACKED_TABLES))
+    argument_parser.add_argument('keys', nargs='+', help="primary keys of the changed rows")
+    argument_parser.add_argument('--operation', choices=['I', 'U', 'D'], default='U')
+    argument_parser.add_argument('--change-log', default=SIMULATED_CHANGE_LOG_PATH)
+    arguments = argument_parser.parse_args()
+
+    recorded_version = SimulatedChangeLog(arguments.change_log).record_changes(
+        arguments.table, arguments.keys, arguments.operation
+    )
+    print(f"✅ {len(arguments.keys)} {arguments.table} changes recorded at version {recorded_version}")
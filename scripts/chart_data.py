@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+
+# Points sent to the browser per chart type; Plotly's WebGL 3D traces stay
+# responsive up to a few thousand markers, bubbles carry an extra size array
+CHART_POINT_BUDGET = {
+    'Scatter 3D': 5000,
+    'Bubble 3D': 2000
+}
+SURFACE_MAX_PERIODS = 60
+SURFACE_MAX_CUSTOMERS = 40
+TIME_SERIES_POINT_BUDGET = 1000
+TABLE_ROW_BUDGET = 1000
+
+CHART_DIMENSIONS = ['YearMonth', 'Customer', 'Employee']
+
+
+def aggregate_orders(orders, dimensions=None):
+    """One row per dimension combination with order count, amount and delivery rate"""
+    dimensions = dimensions or CHART_DIMENSIONS
+    if orders.empty:
+        return pd.DataFrame(columns=dimensions + ['OrderCount', 'TotalAmount', 'DeliveryRate'])
+
+    grouped = orders.groupby(dimensions, observed=True, sort=False)
+    aggregated = grouped.agg(
+        OrderCount=('OrderID', 'size'),
+        TotalAmount=('TotalAmount', 'sum'),
+        DeliveredOrders=('IsDelivered', 'sum')
+    ).reset_index()
+    aggregated['DeliveryRate'] = aggregated['DeliveredOrders'] / aggregated['OrderCount'] * 100
+    return aggregated.drop(columns=['DeliveredOrders'])
+
+
+def cap_points(aggregated, max_points, weight='TotalAmount'):
+    """Keep the heaviest groups and fold the rest into one 'Autres' point per period.
+
+    One slot per period is reserved for its fold, so every period's totals stay
+    complete. Only when there are more periods than max_points does every group
+    get folded, with the lightest periods' folds dropped to respect the budget.
+    Returns (points, number of groups folded); the result never exceeds max_points.
+    """
+    if len(aggregated) <= max_points:
+        return aggregated, 0
+
+    period_count = aggregated['YearMonth'].nunique()
+    keep_count = max(max_points - period_count, 0)
+
+    ranked = aggregated.sort_values(weight, ascending=False)
+    kept = ranked.iloc[:keep_count]
+    remainder = ranked.iloc[keep_count:]
+
+    # Folded points keep each period's totals honest; the rate is order-weighted
+    folded = remainder.assign(DeliveredOrders=remainder['DeliveryRate'] * remainder['OrderCount'] / 100)
+    folded = folded.groupby('YearMonth', observed=True).agg(
+        OrderCount=('OrderCount', 'sum'),
+        TotalAmount=('TotalAmount', 'sum'),
+        DeliveredOrders=('DeliveredOrders', 'sum')
+    ).reset_index()
+    folded['DeliveryRate'] = folded.pop('DeliveredOrders') / folded['OrderCount'] * 100
+    # Drops nothing unless the periods alone exceed the budget
+    folded = folded.nlargest(max_points - keep_count, weight).assign(Customer='Autres', Employee='Autres')
+
+    return pd.concat([kept, folded], ignore_index=True), len(remainder)
+
+
+def lttb_downsample(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of the points that best keep the series' shape.
+
+    x must be numeric and sorted; the first and last points are always kept.
+    """
+    point_count = len(x)
+    if threshold >= point_count or threshold < 3:
+        return np.arange(point_count)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    bucket_edges = np.linspace(1, point_count - 1, threshold - 1).astype(int)
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = point_count - 1
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start, end = bucket_edges[bucket], bucket_edges[bucket + 1]
+        next_end = bucket_edges[bucket + 2] if bucket + 2 < len(bucket_edges) else point_count
+        # Average of the following bucket is the third triangle vertex
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def downsample_time_series(series, x_column, y_column, max_points=TIME_SERIES_POINT_BUDGET):
+    """Sorted series reduced with LTTB when it has more than max_points rows"""
+    series = series.sort_values(x_column)
+    if len(series) <= max_points:
+        return series
+
+    x_values = series[x_column]
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype('int64')
+    selected = lttb_downsample(x_values.to_numpy(), series[y_column].to_numpy(), max_points)
+    return series.iloc[selected]
+
+
+def prepare_3d_points(orders, graph_type, max_points=None):
+    """Aggregated (YearMonth, Customer, Employee) points capped for the chart type.
+
+    Returns (points, raw order count, groups folded into 'Autres').
+    """
+    max_points = max_points or CHART_POINT_BUDGET.get(graph_type, CHART_POINT_BUDGET['Scatter 3D'])
+    aggregated = aggregate_orders(orders)
+    points, folded_groups = cap_points(aggregated, max_points)
+    return points.sort_values('YearMonth'), len(orders), folded_groups
+
+
+def prepare_surface_grid(orders, max_periods=SURFACE_MAX_PERIODS, max_customers=SURFACE_MAX_CUSTOMERS):
+    """YearMonth x Customer amount matrix limited to the most recent periods and top customers"""
+    if orders.empty:
+        return pd.DataFrame()
+
+    aggregated = aggregate_orders(orders, ['YearMonth', 'Customer'])
+    periods = np.sort(aggregated['YearMonth'].astype(str).unique())[-max_periods:]
+    top_customers = (
+        aggregated.groupby('Customer', observed=True)['TotalAmount'].sum().nlargest(max_customers).index
+    )
+
+    grid_rows = aggregated[aggregated['YearMonth'].astype(str).isin(periods) & aggregated['Customer'].isin(top_customers)]
+    return grid_rows.pivot_table(
+        index='Customer', columns='YearMonth', values='TotalAmount', aggfunc='sum', fill_value=0, observed=True
+    )
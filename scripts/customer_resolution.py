@@ -0,0 +1,258 @@
+import numpy as np
+import pandas as pd
+
+from geography import MISSING_TEXT
+
+
+# Legal forms and filler words that vary between sources for the same company
+COMPANY_NAME_NOISE = [
+    'inc', 'incorporated', 'ltd', 'limited', 'llc', 'plc', 'corp', 'corporation', 'co', 'company',
+    'gmbh', 'ag', 'kg', 'sa', 'sarl', 'srl', 'spa', 'bv', 'nv', 'ab', 'as', 'oy',
+    'the', 'and', 'et', 'y', 'und'
+]
+
+MISSING_KEY_TEXT = [token.casefold() for token in MISSING_TEXT]
+
+# Similarity weights per attribute; a cross-source pair scoring MATCH_THRESHOLD or more is one customer
+MATCH_WEIGHTS = {'CompanyName': 0.6, 'PostalCode': 0.2, 'City': 0.1, 'Phone': 0.1}
+MATCH_THRESHOLD = 0.7
+
+# A block this large is too unselective to compare pairwise and is left out
+MAX_BLOCK_SIZE = 500
+
+# Cluster masters are taken from the first source in this order, then the lowest CustomerKey
+MASTER_SOURCE_PRECEDENCE = ['SQL', 'Access', 'Excel']
+
+CUSTOMER_RESOLUTION_QUERY = """
+    SELECT CustomerKey, SourceSystem, RowHash, CompanyName, City, PostalCode, Country, Phone
+    FROM DimCustomer
+"""
+
+XREF_QUERY = "SELECT CustomerKey, MasterCustomerKey, MatchScore, ResolvedRowHash FROM CustomerMasterXref"
+
+XREF_COLUMNS = ['CustomerKey', 'MasterCustomerKey', 'MatchScore', 'ResolvedRowHash']
+
+XREF_STAGING_CREATE_QUERY = """
+    IF OBJECT_ID('tempdb..#CustomerXrefStaging') IS NULL
+        CREATE TABLE #CustomerXrefStaging (
+            CustomerKey INT NOT NULL,
+            MasterCustomerKey INT NOT NULL,
+            MatchScore DECIMAL(5,4),
+            ResolvedRowHash BIGINT
+        )
+"""
+
+XREF_STAGE_QUERY = """
+    INSERT INTO #CustomerXrefStaging (CustomerKey, MasterCustomerKey, MatchScore, ResolvedRowHash)
+    VALUES (?, ?, ?, ?)
+"""
+
+XREF_UPDATE_QUERY = """
+    UPDATE x
+    SET MasterCustomerKey = s.MasterCustomerKey,
+        MatchScore = s.MatchScore,
+        ResolvedRowHash = s.ResolvedRowHash,
+        ResolvedAt = GETDATE()
+    FROM CustomerMasterXref x
+    JOIN #CustomerXrefStaging s ON x.CustomerKey = s.CustomerKey
+    WHERE EXISTS (
+        SELECT s.MasterCustomerKey, s.MatchScore, s.ResolvedRowHash
+        EXCEPT
+        SELECT x.MasterCustomerKey, x.MatchScore, x.ResolvedRowHash
+    )
+"""
+
+XREF_MERGE_QUERY = """
+    INSERT INTO CustomerMasterXref (CustomerKey, MasterCustomerKey, MatchScore, ResolvedRowHash)
+    SELECT s.CustomerKey, s.MasterCustomerKey, s.MatchScore, s.ResolvedRowHash
+    FROM #CustomerXrefStaging s
+    WHERE NOT EXISTS (SELECT 1 FROM CustomerMasterXref x WHERE x.CustomerKey = s.CustomerKey)
+"""
+
+XREF_STAGING_CLEAR_QUERY = "TRUNCATE TABLE #CustomerXrefStaging"
+
+
+def _plain_text(values):
+    """Casefolded ASCII text with accents stripped, '' where missing"""
+    text = values.where(values.notna(), '').astype(str).str.strip()
+    text = text.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii').str.casefold()
+    return text.mask(text.isin(MISSING_KEY_TEXT), '')
+
+
+def resolution_keys(customers):
+    """Normalized CompanyName, City, PostalCode, Country and Phone, the text blocking and scoring compare"""
+    keys = pd.DataFrame(index=customers.index)
+    noise = r'\b(?:' + '|'.join(COMPANY_NAME_NOISE) + r')\b'
+    keys['CompanyName'] = (
+        _plain_text(customers['CompanyName'])
+        .str.replace(r'[^a-z0-9]+', ' ', regex=True)
+        .str.replace(noise, ' ', regex=True)
+        .str.split().str.join(' ')
+    )
+    keys['City'] = _plain_text(customers['City'])
+    keys['PostalCode'] = _plain_text(customers['PostalCode']).str.replace(r'[\s-]', '', regex=True)
+    keys['Country'] = _plain_text(customers['Country'])
+    # Trailing digits only, so international prefixes and formatting do not matter
+    keys['Phone'] = _plain_text(customers['Phone']).str.replace(r'\D', '', regex=True).str[-8:]
+    return keys
+
+
+def blocking_keys(keys):
+    """One Series per blocking pass: exact normalized name, country and postal code, country and first name word"""
+    first_word = keys['CompanyName'].str.split().str[0].fillna('')
+    return [
+        keys['CompanyName'].mask(keys['CompanyName'] == '', None),
+        (keys['Country'] + '|' + keys['PostalCode']).mask(keys['PostalCode'] == '', None),
+        (keys['Country'] + '|' + first_word).mask(first_word == '', None)
+    ]
+
+
+def candidate_pairs(keys, source_systems, pending):
+    """(Left, Right) row positions sharing a block, from different sources, with at least one side pending"""
+    pairs = []
+    for block in blocking_keys(keys):
+        members = pd.DataFrame({'Block': block.to_numpy(), 'Record': np.arange(len(block))}).dropna()
+        block_sizes = members['Block'].map(members['Block'].value_counts())
+        members = members[block_sizes.to_numpy() <= MAX_BLOCK_SIZE]
+        # Only pending records open a comparison, so settled pairs are never scored again
+        pending_members = members[pending[members['Record'].to_numpy()]]
+        matched = pending_members.merge(members, on='Block', suffixes=('Left', 'Right'))
+        pairs.append(matched[['RecordLeft', 'RecordRight']].to_numpy())
+
+    pairs = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype='int64')
+    pairs = np.sort(pairs, axis=1)
+    pairs = pairs[source_systems[pairs[:, 0]] != source_systems[pairs[:, 1]]]
+    return pd.DataFrame(np.unique(pairs, axis=0), columns=['Left', 'Right'])
+
+
+def _trigrams(names):
+    """(Record, Gram) rows, each distinct character trigram of each name once, built one offset at a time"""
+    padded = '  ' + names + ' '
+    lengths = padded.str.len().to_numpy()
+    grams = [
+        pd.DataFrame({'Record': names.index[lengths >= offset + 3], 'Gram': padded.str[offset:offset + 3][lengths >= offset + 3]})
+        for offset in range(max(int(lengths.max()) - 2, 0))
+    ] if len(names) else []
+    if not grams:
+        return pd.DataFrame(columns=['Record', 'Gram'])
+    return pd.concat(grams, ignore_index=True).drop_duplicates()
+
+
+def name_similarity(names, pairs):
+    """Jaccard similarity of the trigram sets of each pair's names, shared trigrams counted with one join"""
+    involved = np.unique(pairs[['Left', 'Right']].to_numpy())
+    involved_names = names.iloc[involved]
+    involved_names = pd.Series(involved_names.to_numpy(), index=involved)
+    grams = _trigrams(involved_names[involved_names != ''])
+    gram_counts = grams.groupby('Record').size()
+
+    pair_grams = pairs[['Left', 'Right']].reset_index().rename(columns={'index': 'Pair'})
+    shared = (
+        pair_grams.merge(grams.rename(columns={'Record': 'Left'}), on='Left')
+        .merge(grams.rename(columns={'Record': 'Right'}), on=['Right', 'Gram'])
+        .groupby('Pair').size()
+        .reindex(pairs.index, fill_value=0).to_numpy()
+    )
+    left_counts = gram_counts.reindex(pairs['Left']).fillna(0).to_numpy()
+    right_counts = gram_counts.reindex(pairs['Right']).fillna(0).to_numpy()
+    union = left_counts + right_counts - shared
+    return np.divide(shared, union, out=np.zeros(len(pairs)), where=union > 0)
+
+
+def score_pairs(keys, pairs):
+    """Weighted similarity per candidate pair; pairs in different known countries score 0"""
+    scores = MATCH_WEIGHTS['CompanyName'] * name_similarity(keys['CompanyName'], pairs)
+    for attribute in ['PostalCode', 'City', 'Phone']:
+        left = keys[attribute].to_numpy()[pairs['Left'].to_numpy()]
+        right = keys[attribute].to_numpy()[pairs['Right'].to_numpy()]
+        scores = scores + MATCH_WEIGHTS[attribute] * ((left == right) & (left != ''))
+
+    left_country = keys['Country'].to_numpy()[pairs['Left'].to_numpy()]
+    right_country = keys['Country'].to_numpy()[pairs['Right'].to_numpy()]
+    conflicting = (left_country != right_country) & (left_country != '') & (right_country != '')
+    return np.where(conflicting, 0.0, scores).round(4)
+
+
+def connected_components(nodes, edges):
+    """Smallest node of each node's component, by min-label propagation until no label moves"""
+    labels = pd.Series(nodes, index=nodes)
+    if edges.empty:
+        return labels
+
+    left, right = edges['Left'].to_numpy(), edges['Right'].to_numpy()
+    while True:
+        edge_labels = np.minimum(labels.reindex(left).to_numpy(), labels.reindex(right).to_numpy())
+        proposals = pd.Series(np.concatenate([edge_labels, edge_labels]), index=np.concatenate([left, right]))
+        proposals = proposals.groupby(level=0).min().reindex(labels.index).fillna(labels)
+        updated = np.minimum(labels, proposals).astype(labels.dtype)
+        if updated.equals(labels):
+            return labels
+        labels = updated
+
+
+def resolve_customers(customers, xref):
+    """Cross-reference rows for every customer in a cluster touched by a new or changed record.
+
+    customers holds CUSTOMER_RESOLUTION_QUERY rows, xref the stored CustomerMasterXref.
+    A customer is pending when it has no cross-reference or its RowHash moved since
+    it was resolved; the rest of its previous cluster is re-scored with it. Returns
+    (rows in XREF_COLUMNS, statistics).
+    """
+    customers = customers.reset_index(drop=True)
+    statistics = {'pending': 0, 'pairs': 0, 'matches': 0, 'clusters': 0}
+    if customers.empty:
+        return pd.DataFrame(columns=XREF_COLUMNS), statistics
+
+    customer_keys = customers['CustomerKey'].astype('int64')
+    stored = xref.drop_duplicates('CustomerKey').set_index('CustomerKey')
+    stored_masters = stored['MasterCustomerKey'].astype('float64').reindex(customer_keys).to_numpy()
+    # Nullable integers: 64-bit hashes do not survive a round trip through float
+    stored_hashes = stored['ResolvedRowHash'].astype('Int64').reindex(customer_keys).reset_index(drop=True)
+    moved = (stored_hashes != customers['RowHash'].astype('Int64')).fillna(True).to_numpy(dtype=bool)
+    changed = np.isnan(stored_masters) | moved
+
+    reopened_masters = np.union1d(customer_keys[changed], stored_masters[changed & ~np.isnan(stored_masters)])
+    pending = changed | np.isin(stored_masters, reopened_masters)
+    statistics['pending'] = int(pending.sum())
+    if not pending.any():
+        return pd.DataFrame(columns=XREF_COLUMNS), statistics
+
+    keys = resolution_keys(customers)
+    pairs = candidate_pairs(keys, customers['SourceSystem'].astype(str).to_numpy(), pending)
+    pairs['Score'] = score_pairs(keys, pairs) if not pairs.empty else []
+    matches = pairs[pairs['Score'] >= MATCH_THRESHOLD]
+    statistics['pairs'], statistics['matches'] = len(pairs), len(matches)
+
+    # Links of clusters no pending record belonged to stand as they are
+    settled = ~pending & ~np.isnan(stored_masters) & (stored_masters != customer_keys.to_numpy())
+    edges = pd.concat([
+        pd.DataFrame({'Left': customer_keys[settled].to_numpy(), 'Right': stored_masters[settled].astype('int64')}),
+        pd.DataFrame({'Left': customer_keys.to_numpy()[matches['Left'].to_numpy()],
+                      'Right': customer_keys.to_numpy()[matches['Right'].to_numpy()]})
+    ], ignore_index=True)
+    components = connected_components(customer_keys.to_numpy(), edges)
+
+    touched = np.isin(components.to_numpy(), components.to_numpy()[pending])
+    resolved = customers.loc[touched, ['CustomerKey', 'SourceSystem', 'RowHash']].copy()
+    resolved['Component'] = components.to_numpy()[touched]
+
+    precedence = resolved['SourceSystem'].map({source: rank for rank, source in enumerate(MASTER_SOURCE_PRECEDENCE)})
+    masters = (
+        resolved.assign(Precedence=precedence.fillna(len(MASTER_SOURCE_PRECEDENCE)))
+        .sort_values(['Precedence', 'CustomerKey'])
+        .drop_duplicates('Component')
+        .set_index('Component')['CustomerKey']
+    )
+    resolved['MasterCustomerKey'] = resolved['Component'].map(masters)
+
+    # Best accepted score linking each customer into its cluster; unmatched customers have none
+    match_scores = pd.concat([
+        pd.Series(matches['Score'].to_numpy(), index=customer_keys.to_numpy()[matches['Left'].to_numpy()]),
+        pd.Series(matches['Score'].to_numpy(), index=customer_keys.to_numpy()[matches['Right'].to_numpy()]),
+        stored.loc[stored.index.isin(customer_keys[settled]), 'MatchScore'].astype(float)
+    ]).groupby(level=0).max()
+    resolved['MatchScore'] = resolved['CustomerKey'].map(match_scores)
+    resolved['ResolvedRowHash'] = resolved['RowHash'].astype('Int64')
+
+    statistics['clusters'] = int((resolved['Component'].value_counts() > 1).sum())
+    return resolved[XREF_COLUMNS].astype({'CustomerKey': 'int64', 'MasterCustomerKey': 'int64'}), statistics
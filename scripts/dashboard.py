@@ -1,9 +1,6 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
-import io
 
 # ------------------------------
 # PAGE CONFIGURATION
@@ -111,61 +108,69 @@ st.markdown("""
 def get_dw_connection():
     """Connect to the Data Warehouse."""
     try:
-        from DatabaseConfig import connect_to_database
-        connection = connect_to_database()
+        from DatabaseConfig import DatabaseConfig, connect_to_database
+        connection = connect_to_database(DatabaseConfig.TARGET_DATABASE)
         return connection
     except Exception as e:
         st.error(f"Connection failed: {e}")
         return None
 
 # ------------------------------
-# LOAD DASHBOARD DATA
+# KPI SNAPSHOT (WRITTEN BY THE ETL)
 # ------------------------------
 @st.cache_data(ttl=300)
-def fetch_dashboard_data():
-    """Query and prepare dashboard data from DW."""
+def fetch_kpi_snapshot():
+    """Headline metrics and filter options, read from the ETL snapshot file."""
+    from kpi_snapshot import build_kpi_snapshot, load_kpi_snapshot
+
+    snapshot = load_kpi_snapshot()
+    if snapshot is not None:
+        return snapshot
+
+    # No snapshot yet (ETL never ran here): aggregate server-side instead
     conn = get_dw_connection()
     if conn is None:
-        return pd.DataFrame()
+        return None
+    try:
+        return build_kpi_snapshot(conn)
+    except Exception as e:
+        st.error(f"KPI loading error: {e}")
+        return None
 
+# ------------------------------
+# LOAD DASHBOARD DATA
+# ------------------------------
+@st.cache_resource
+def get_query_service():
+    """Thread pool and pooled connections shared by the panel queries."""
+    from DatabaseConfig import DatabaseConfig, connect_to_database
+    from dashboard_queries import PanelQueryService
+    return PanelQueryService(lambda: connect_to_database(DatabaseConfig.TARGET_DATABASE))
+
+@st.cache_data(ttl=300)
+def fetch_dashboard_data():
+    """Query detailed orders and ranking panels from DW concurrently."""
     try:
-        query = """
-        SELECT 
-            fo.OrderID,
-            fo.OrderDate,
-            fo.ShippedDate,
-            fo.TotalAmount,
-            fo.IsDelivered,
-            fo.SourceSystem,
-            dc.CompanyName as Customer,
-            de.FirstName + ' ' + de.LastName as Employee
-        FROM FactOrders fo
-        LEFT JOIN DimCustomer dc ON fo.CustomerKey = dc.CustomerKey
-        LEFT JOIN DimEmployee de ON fo.EmployeeKey = de.EmployeeKey
-        WHERE fo.OrderDate IS NOT NULL
-        ORDER BY fo.OrderDate DESC
-        """
-        df = pd.read_sql(query, conn)
-        conn.close()
-
-        # Parse dates
-        df['OrderDate'] = pd.to_datetime(df['OrderDate'], errors='coerce')
-        df['ShippedDate'] = pd.to_datetime(df['ShippedDate'], errors='coerce')
-        df['Year'] = df['OrderDate'].dt.year
-        df['Month'] = df['OrderDate'].dt.month
-        df['YearMonth'] = df['OrderDate'].dt.strftime('%Y-%m')
-
-        # Delivery status
-        df['Status'] = df['IsDelivered'].apply(lambda x: 'Livrée' if x == 1 else 'Non Livrée')
-
-        # Fill missing names
-        df['Customer'] = df['Customer'].fillna('Client inconnu')
-        df['Employee'] = df['Employee'].fillna('Employé inconnu')
-
-        return df
+        panel_results = get_query_service().fetch_panels()
     except Exception as e:
         st.error(f"Data loading error: {e}")
-        return pd.DataFrame()
+        return {'orders': pd.DataFrame(), 'top_customers': pd.DataFrame(), 'employee_performance': pd.DataFrame(),
+                'manager_rollup': pd.DataFrame()}
+
+    panels = {}
+    for panel_name, result in panel_results.items():
+        if isinstance(result, Exception):
+            st.error(f"Data loading error ({panel_name}): {result}")
+            panels[panel_name] = pd.DataFrame()
+        else:
+            panels[panel_name] = result
+
+    # Dates, Year/YearMonth, Status and categorical names derived column-wise
+    if not panels['orders'].empty:
+        from dashboard_frame import prepare_order_frame
+        panels['orders'] = prepare_order_frame(panels['orders'])
+
+    return panels
 
 # ------------------------------
 # ETL PROCESS
@@ -175,7 +180,7 @@ def execute_etl():
     try:
         from etl import etl
         etl_instance = etl()
-        etl_instance.run_full_etl()
+        etl_instance.execute_full_pipeline()
         return True, "✅ ETL terminé avec succès!"
     except Exception as e:
         return False, f"❌ Erreur ETL: {str(e)}"
@@ -183,9 +188,6 @@ def execute_etl():
 # ------------------------------
 # SESSION STATE INITIALIZATION
 # ------------------------------
-if 'df_data' not in st.session_state:
-    st.session_state.df_data = fetch_dashboard_data()
-
 if 'last_update' not in st.session_state:
     st.session_state.last_update = datetime.now()
 
@@ -202,7 +204,7 @@ with col2:
             if success:
                 st.success(msg)
                 st.cache_data.clear()
-                st.session_state.df_data = fetch_dashboard_data()
+                st.session_state.pop('df_data', None)
                 st.session_state.last_update = datetime.now()
                 st.experimental_rerun()
             else:
@@ -216,13 +218,13 @@ st.caption(f"*Dernière mise à jour: {st.session_state.last_update.strftime('%Y
 st.markdown('<h2 class="section-heading">Indicateurs Clés</h2>', unsafe_allow_html=True)
 metrics_col1, metrics_col2, metrics_col3 = st.columns(3)
 
-df = st.session_state.df_data
+kpis = fetch_kpi_snapshot()
 
-if not df.empty:
-    total_orders = len(df)
-    delivered_orders = df['IsDelivered'].sum()
-    pending_orders = total_orders - delivered_orders
-    delivery_pct = delivered_orders / total_orders * 100 if total_orders else 0
+if kpis is not None and kpis['totals']['total_orders'] > 0:
+    total_orders = kpis['totals']['total_orders']
+    delivered_orders = kpis['totals']['delivered_orders']
+    pending_orders = kpis['totals']['pending_orders']
+    delivery_pct = kpis['totals']['delivery_rate']
 
     # Total Orders
     with metrics_col1:
@@ -261,17 +263,19 @@ else:
 # ------------------------------
 st.sidebar.markdown("## Filtres de données")
 
-if not df.empty:
+if kpis is not None and kpis['totals']['total_orders'] > 0:
+    filter_values = kpis['filters']
+
     # Year
-    years_options = sorted(df['Year'].dropna().unique())
+    years_options = filter_values['years']
     selected_years = st.sidebar.multiselect("Année", options=years_options, default=years_options[:min(3,len(years_options))])
 
     # Customers
-    customer_options = sorted(df['Customer'].dropna().unique())
+    customer_options = filter_values['customers']
     selected_customers = st.sidebar.multiselect("Client", options=customer_options, default=customer_options[:min(5,len(customer_options))])
 
     # Employees
-    employee_options = sorted(df['Employee'].dropna().unique())
+    employee_options = filter_values['employees']
     selected_employees = st.sidebar.multiselect("Employé", options=employee_options, default=employee_options[:min(5,len(employee_options))])
 
     # Status
@@ -282,13 +286,20 @@ if not df.empty:
     graph_options = ['Scatter 3D','Surface 3D','Bubble 3D']
     graph_type = st.sidebar.selectbox("Type de graphique 3D", options=graph_options)
 
-    # Apply filters
-    filtered_df = df.copy()
-    if selected_years: filtered_df = filtered_df[filtered_df['Year'].isin(selected_years)]
-    if selected_customers: filtered_df = filtered_df[filtered_df['Customer'].isin(selected_customers)]
-    if selected_employees: filtered_df = filtered_df[filtered_df['Employee'].isin(selected_employees)]
-    if selected_status == 'Livrée': filtered_df = filtered_df[filtered_df['IsDelivered']==1]
-    if selected_status == 'Non Livrée': filtered_df = filtered_df[filtered_df['IsDelivered']==0]
+    # Detailed orders are only fetched once the metrics and filters are on screen
+    if 'df_data' not in st.session_state:
+        with st.spinner("Chargement des commandes détaillées..."):
+            from dashboard_frame import OrderFilterIndex
+            st.session_state.panels = fetch_dashboard_data()
+            st.session_state.df_data = st.session_state.panels['orders']
+            st.session_state.order_index = OrderFilterIndex(st.session_state.df_data) if not st.session_state.df_data.empty else None
+    df = st.session_state.df_data
+
+    # Apply filters: integer-code mask intersection, no copy of the loaded frame
+    if st.session_state.order_index is not None:
+        filtered_df = st.session_state.order_index.select(selected_years, selected_customers, selected_employees, selected_status)
+    else:
+        filtered_df = df
 else:
     filtered_df = pd.DataFrame()
     graph_type = 'Scatter 3D'
@@ -298,7 +309,78 @@ else:
 # ------------------------------
 tab1, tab2, tab3 = st.tabs(["📊 Graph 3D","📈 Évolution","📋 Données"])
 
-# The content of the tabs can be similarly rewritten with new variable names, colors, labels, and plot settings.
+# Charts receive aggregated, capped points rather than one marker per order
+from chart_data import (TABLE_ROW_BUDGET, downsample_time_series,
+                        prepare_3d_points, prepare_surface_grid)
+
+with tab1:
+    if filtered_df.empty:
+        st.info("Aucune donnée pour les filtres sélectionnés.")
+    else:
+        import plotly.graph_objects as go
+
+        if graph_type == 'Surface 3D':
+            grid = prepare_surface_grid(filtered_df)
+            fig = go.Figure(go.Surface(
+                z=grid.values, x=grid.columns.astype(str), y=grid.index.astype(str), colorscale='Blues'
+            ))
+            st.caption(f"{grid.shape[0]} clients x {grid.shape[1]} mois pour {len(filtered_df):,} commandes")
+        else:
+            points, order_count, folded_groups = prepare_3d_points(filtered_df, graph_type)
+            marker = dict(size=4, color=points['DeliveryRate'], colorscale='RdYlGn',
+                          colorbar=dict(title="Livraison %"), opacity=0.8)
+            if graph_type == 'Bubble 3D':
+                marker.update(size=points['OrderCount'], sizemode='area',
+                              sizeref=2 * points['OrderCount'].max() / 30 ** 2, sizemin=2)
+            fig = go.Figure(go.Scatter3d(
+                x=points['YearMonth'].astype(str), y=points['Customer'].astype(str), z=points['TotalAmount'],
+                mode='markers', marker=marker, text=points['Employee'].astype(str),
+                hovertemplate="%{x}<br>%{y}<br>%{text}<br>Montant: %{z:,.2f}<extra></extra>"
+            ))
+            note = f" ({folded_groups:,} groupes regroupés dans « Autres »)" if folded_groups else ""
+            st.caption(f"{len(points):,} points agrégés pour {order_count:,} commandes{note}")
+
+        fig.update_layout(
+            scene=dict(xaxis_title="Mois", yaxis_title="Client", zaxis_title="Montant"),
+            height=650, margin=dict(l=0, r=0, t=30, b=0)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+with tab2:
+    if filtered_df.empty:
+        st.info("Aucune donnée pour les filtres sélectionnés.")
+    else:
+        import plotly.graph_objects as go
+
+        daily_amounts = filtered_df.groupby(filtered_df['OrderDate'].dt.normalize())['TotalAmount'].sum().reset_index()
+        trend = downsample_time_series(daily_amounts, 'OrderDate', 'TotalAmount')
+        fig = go.Figure(go.Scattergl(x=trend['OrderDate'], y=trend['TotalAmount'], mode='lines', line=dict(color='#0069d9')))
+        fig.update_layout(xaxis_title="Date", yaxis_title="Montant", height=450, margin=dict(l=0, r=0, t=30, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{len(trend):,} points affichés sur {len(daily_amounts):,} jours")
+
+    # Ranking panels come from their own server-side queries, fetched alongside the orders
+    panels = st.session_state.get('panels', {})
+    rank_col1, rank_col2 = st.columns(2)
+    with rank_col1:
+        st.markdown("**Top clients (toutes périodes)**")
+        top_customers = panels.get('top_customers', pd.DataFrame())
+        if not top_customers.empty:
+            st.bar_chart(top_customers.set_index('Customer')['TotalAmount'])
+    with rank_col2:
+        st.markdown("**Performance des employés (toutes périodes)**")
+        employee_performance = panels.get('employee_performance', pd.DataFrame())
+        if not employee_performance.empty:
+            st.dataframe(employee_performance, use_container_width=True, hide_index=True)
+        st.markdown("**Ventes par responsable (équipe incluse)**")
+        manager_rollup = panels.get('manager_rollup', pd.DataFrame())
+        if not manager_rollup.empty:
+            st.dataframe(manager_rollup, use_container_width=True, hide_index=True)
+
+with tab3:
+    st.dataframe(filtered_df.head(TABLE_ROW_BUDGET), use_container_width=True)
+    if len(filtered_df) > TABLE_ROW_BUDGET:
+        st.caption(f"{TABLE_ROW_BUDGET:,} premières lignes sur {len(filtered_df):,}")
 
 # ------------------------------
 # FOOTER
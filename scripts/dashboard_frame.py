@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+
+STATUS_LABELS = ['Non Livrée', 'Livrée']
+UNKNOWN_CUSTOMER = 'Client inconnu'
+UNKNOWN_EMPLOYEE = 'Employé inconnu'
+
+
+def _year_month_categories(order_dates):
+    """YearMonth as a categorical built from integer year*100+month codes, never per-row strftime"""
+    period_numbers = (order_dates.dt.year * 100 + order_dates.dt.month).to_numpy(dtype='float64', na_value=np.nan)
+    known = ~np.isnan(period_numbers)
+
+    periods = np.unique(period_numbers[known]).astype(int)
+    labels = [f"{period // 100}-{period % 100:02d}" for period in periods]
+
+    codes = np.full(len(period_numbers), -1, dtype='int32')
+    codes[known] = np.searchsorted(periods, period_numbers[known].astype(int))
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+def prepare_order_frame(orders):
+    """Dashboard order frame with derived columns computed column-wise and low-cardinality text as categoricals"""
+    orders['OrderDate'] = pd.to_datetime(orders['OrderDate'], errors='coerce')
+    orders['ShippedDate'] = pd.to_datetime(orders['ShippedDate'], errors='coerce')
+    orders['Year'] = orders['OrderDate'].dt.year.astype('Int16')
+    orders['Month'] = orders['OrderDate'].dt.month.astype('Int8')
+    orders['YearMonth'] = _year_month_categories(orders['OrderDate'])
+
+    delivered = pd.to_numeric(orders['IsDelivered'], errors='coerce').fillna(0).astype('int8')
+    orders['IsDelivered'] = delivered
+    orders['Status'] = pd.Categorical.from_codes((delivered == 1).astype('int8'), categories=STATUS_LABELS)
+
+    orders['Customer'] = orders['Customer'].fillna(UNKNOWN_CUSTOMER).astype('category')
+    orders['Employee'] = orders['Employee'].fillna(UNKNOWN_EMPLOYEE).astype('category')
+    orders['SourceSystem'] = orders['SourceSystem'].astype('category')
+
+    return orders
+
+
+class OrderFilterIndex:
+    """Integer codes per filter dimension, built once per loaded frame.
+
+    A filter selection becomes a small boolean lookup table per dimension; gathering
+    it with the row codes and AND-ing the results resolves any combination without
+    string comparisons or copying the frame.
+    """
+
+    def __init__(self, orders):
+        self.orders = orders
+        self.codes = {}
+        self.categories = {}
+
+        for column in ['Customer', 'Employee', 'YearMonth']:
+            self.categories[column] = orders[column].cat.categories
+            self.codes[column] = orders[column].cat.codes.to_numpy()
+
+        years = orders['Year']
+        self.categories['Year'] = pd.Index(np.sort(years.dropna().unique().astype(int)))
+        year_codes = self.categories['Year'].get_indexer(years.fillna(-1).astype(int))
+        self.codes['Year'] = year_codes
+
+        self.delivered = orders['IsDelivered'].to_numpy() == 1
+
+    def _dimension_mask(self, column, selected_values):
+        lookup = np.zeros(len(self.categories[column]) + 1, dtype=bool)
+        positions = self.categories[column].get_indexer(list(selected_values))
+        lookup[positions[positions >= 0]] = True
+        # Code -1 (missing) indexes the trailing False slot
+        return lookup[self.codes[column]]
+
+    def mask(self, years=None, customers=None, employees=None, status='Tous'):
+        """Boolean row mask; an empty selection leaves that dimension unfiltered"""
+        row_mask = np.ones(len(self.orders), dtype=bool)
+        for column, selected_values in [('Year', years), ('Customer', customers), ('Employee', employees)]:
+            if selected_values:
+                row_mask &= self._dimension_mask(column, selected_values)
+
+        if status == 'Livrée':
+            row_mask &= self.delivered
+        elif status == 'Non Livrée':
+            row_mask &= ~self.delivered
+        return row_mask
+
+    def select(self, years=None, customers=None, employees=None, status='Tous'):
+        """Rows matching the selection; the loaded frame itself when nothing is filtered"""
+        row_mask = self.mask(years, customers, employees, status)
+        if row_mask.all():
+            return self.orders
+        return self.orders[row_mask]
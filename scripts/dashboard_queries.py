@@ -0,0 +1,160 @@
+import contextlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+PANEL_QUERY_WORKERS = 4
+
+ORDER_DETAIL_QUERY = """
+    SELECT
+        fo.OrderID,
+        fo.OrderDate,
+        fo.ShippedDate,
+        fo.TotalAmount,
+        fo.DeliveryStatus as IsDelivered,
+        fo.SourceSystem,
+        dc.CompanyName as Customer,
+        de.FirstName + ' ' + de.LastName as Employee
+    FROM FactOrders fo
+    LEFT JOIN DimCustomer dc ON fo.CustomerKey = dc.CustomerKey
+    LEFT JOIN DimEmployee de ON fo.EmployeeKey = de.EmployeeKey
+    WHERE fo.OrderDate IS NOT NULL
+    ORDER BY fo.OrderDate DESC
+"""
+
+# Customers resolved to one master across sources are ranked once, under the master's name
+TOP_CUSTOMERS_QUERY = """
+    SELECT TOP 10
+        dc.CompanyName as Customer,
+        COUNT(*) as OrderCount,
+        SUM(fo.TotalAmount) as TotalAmount
+    FROM FactOrders fo
+    LEFT JOIN CustomerMasterXref x ON fo.CustomerKey = x.CustomerKey
+    JOIN DimCustomer dc ON dc.CustomerKey = COALESCE(x.MasterCustomerKey, fo.CustomerKey)
+    GROUP BY dc.CompanyName
+    ORDER BY SUM(fo.TotalAmount) DESC
+"""
+
+EMPLOYEE_PERFORMANCE_QUERY = """
+    SELECT
+        de.FirstName + ' ' + de.LastName as Employee,
+        COUNT(*) as OrderCount,
+        SUM(fo.TotalAmount) as TotalAmount,
+        AVG(CAST(fo.DeliveryStatus AS FLOAT)) * 100 as DeliveryRate
+    FROM FactOrders fo
+    JOIN DimEmployee de ON fo.EmployeeKey = de.EmployeeKey
+    GROUP BY de.FirstName, de.LastName
+    ORDER BY SUM(fo.TotalAmount) DESC
+"""
+
+# Each manager's sales including every direct and indirect report, one join through the closure bridge
+MANAGER_ROLLUP_QUERY = """
+    SELECT
+        de.FirstName + ' ' + de.LastName as Manager,
+        COUNT(DISTINCT b.DescendantKey) - 1 as Reports,
+        COUNT(fo.FactOrderKey) as OrderCount,
+        SUM(fo.TotalAmount) as TotalAmount
+    FROM BridgeEmployeeHierarchy b
+    JOIN DimEmployee de ON b.AncestorKey = de.EmployeeKey
+    LEFT JOIN FactOrders fo ON fo.EmployeeKey = b.DescendantKey
+    GROUP BY b.AncestorKey, de.FirstName, de.LastName
+    HAVING COUNT(DISTINCT b.DescendantKey) > 1
+    ORDER BY SUM(fo.TotalAmount) DESC
+"""
+
+DASHBOARD_PANELS = {
+    'orders': ORDER_DETAIL_QUERY,
+    'top_customers': TOP_CUSTOMERS_QUERY,
+    'employee_performance': EMPLOYEE_PERFORMANCE_QUERY,
+    'manager_rollup': MANAGER_ROLLUP_QUERY
+}
+
+
+class ConnectionPool:
+    """Bounded set of warehouse connections, one per concurrent query.
+
+    pyodbc connections must not be shared between threads, so each query borrows
+    a connection for its duration; connections that raised are discarded.
+    """
+
+    def __init__(self, connection_factory, size=PANEL_QUERY_WORKERS):
+        self.connection_factory = connection_factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self.connection_factory()
+                if connection is None:
+                    raise ConnectionError("Data warehouse unreachable")
+
+            try:
+                yield connection
+            except Exception:
+                with contextlib.suppress(Exception):
+                    connection.close()
+                raise
+            self._idle.put(connection)
+
+    def close(self):
+        while not self._idle.empty():
+            with contextlib.suppress(Exception):
+                self._idle.get_nowait().close()
+
+
+class PanelQueryService:
+    """Runs independent dashboard panel queries concurrently over a connection pool.
+
+    Identical queries already in flight share one future, so panels asking for the
+    same data during a rerun cost a single round trip.
+    """
+
+    def __init__(self, connection_factory, max_workers=PANEL_QUERY_WORKERS):
+        self.pool = ConnectionPool(connection_factory, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='panel-query')
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _run_query(self, sql, params):
+        with self.pool.connection() as connection:
+            return pd.read_sql(sql, connection, params=list(params) or None)
+
+    def submit(self, sql, params=()):
+        query_key = (sql, tuple(params))
+        with self._lock:
+            future = self._in_flight.get(query_key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._run_query, sql, query_key[1])
+            self._in_flight[query_key] = future
+
+        # Registered outside the lock: a query that already finished runs the callback inline
+        future.add_done_callback(lambda _, key=query_key: self._forget(key))
+        return future
+
+    def _forget(self, query_key):
+        with self._lock:
+            self._in_flight.pop(query_key, None)
+
+    def fetch_panels(self, panels=None):
+        """Issue every panel query at once and wait: {panel: DataFrame or the exception it raised}"""
+        futures = {name: self.submit(sql) for name, sql in (panels or DASHBOARD_PANELS).items()}
+
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+        return results
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+        self.pool.close()
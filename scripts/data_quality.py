@@ -0,0 +1,141 @@
+import os
+
+import pandas as pd
+
+from etl_logging import logger
+
+
+QUALITY_DIRECTORY = os.path.join('data', 'quality')
+REJECT_SAMPLE_SIZE = 1000
+
+
+class ValidationRule:
+    """One data-quality check evaluated as a boolean violation mask over a whole frame.
+
+    severity='reject' routes violating rows to quarantine; severity='warn' only counts
+    and samples them.
+    """
+
+    def __init__(self, name, kind, columns, severity='warn', **options):
+        self.name = name
+        self.kind = kind
+        self.columns = columns
+        self.severity = severity
+        self.options = options
+
+    @classmethod
+    def not_null(cls, name, column, severity='warn', placeholders=()):
+        """Null, or equal to one of the placeholder values a failed conversion leaves behind"""
+        return cls(name, 'null', [column], severity, placeholders=list(placeholders))
+
+    @classmethod
+    def referential(cls, name, column, reference=None, severity='warn'):
+        """Value outside the reference values; without a reference, an unresolved (null) surrogate key"""
+        return cls(name, 'referential', [column], severity, reference=reference)
+
+    @classmethod
+    def in_range(cls, name, column, minimum=None, maximum=None, severity='warn'):
+        return cls(name, 'range', [column], severity, minimum=minimum, maximum=maximum)
+
+    @classmethod
+    def date_order(cls, name, earlier, later, severity='warn'):
+        """Both dates present and the later milestone falls before the earlier one"""
+        return cls(name, 'date_order', [earlier, later], severity)
+
+    def violations(self, frame):
+        if any(column not in frame.columns for column in self.columns):
+            return pd.Series(False, index=frame.index)
+
+        values = frame[self.columns[0]]
+
+        if self.kind == 'null':
+            mask = values.isna()
+            if self.options['placeholders']:
+                mask |= values.isin(self.options['placeholders'])
+            return mask
+
+        if self.kind == 'referential':
+            reference = self.options['reference']
+            if reference is None:
+                return values.isna()
+            return values.notna() & ~values.isin(reference)
+
+        if self.kind == 'range':
+            numeric_values = pd.to_numeric(values, errors='coerce')
+            mask = pd.Series(False, index=frame.index)
+            if self.options['minimum'] is not None:
+                mask |= numeric_values < self.options['minimum']
+            if self.options['maximum'] is not None:
+                mask |= numeric_values > self.options['maximum']
+            return mask
+
+        if self.kind == 'date_order':
+            earlier = pd.to_datetime(frame[self.columns[0]], errors='coerce')
+            later = pd.to_datetime(frame[self.columns[1]], errors='coerce')
+            return earlier.notna() & later.notna() & (later < earlier)
+
+        raise ValueError(f"Unknown validation rule kind: {self.kind}")
+
+
+class DataQualityValidator:
+    """Evaluate rule sets, report aggregated counts and keep a sampled reject file per dataset"""
+
+    def __init__(self, directory=QUALITY_DIRECTORY, sample_size=REJECT_SAMPLE_SIZE):
+        self.directory = directory
+        self.sample_size = sample_size
+        self.results = {}
+
+    def validate(self, frame, rules, dataset_name):
+        """Return (accepted rows, rejected rows with RejectReasons, violation count per rule)"""
+        violations = pd.DataFrame({rule.name: rule.violations(frame) for rule in rules}, index=frame.index)
+        violation_counts = violations.sum().astype(int)
+
+        reject_rules = [rule.name for rule in rules if rule.severity == 'reject']
+        rejected_mask = violations[reject_rules].any(axis=1) if reject_rules else pd.Series(False, index=frame.index)
+        flagged_mask = violations.any(axis=1)
+
+        # Rule names of every violated rule, concatenated column-wise rather than per row
+        reject_reasons = violations.dot(violations.columns + ';').str.rstrip(';')
+
+        self.results[dataset_name] = {
+            'rows': len(frame),
+            'rejected': int(rejected_mask.sum()),
+            'flagged': int(flagged_mask.sum()),
+            'rules': violation_counts.to_dict()
+        }
+        self._report(dataset_name, rules, violation_counts)
+
+        if flagged_mask.any():
+            self._write_reject_sample(frame[flagged_mask].assign(RejectReasons=reject_reasons[flagged_mask]), dataset_name)
+
+        rejected = frame[rejected_mask].assign(RejectReasons=reject_reasons[rejected_mask])
+        return frame[~rejected_mask], rejected, violation_counts
+
+    def _report(self, dataset_name, rules, violation_counts):
+        result = self.results[dataset_name]
+        logger.info(f"  🔎 Validation [{dataset_name}]: {result['rows']:,} rows, "
+                    f"{result['rejected']:,} rejected, {result['flagged']:,} flagged")
+        for rule in rules:
+            if violation_counts[rule.name] > 0:
+                logger.info(f"    - {rule.name} ({rule.severity}): {violation_counts[rule.name]:,}")
+
+    def _write_reject_sample(self, flagged, dataset_name):
+        sample = flagged
+        if len(flagged) > self.sample_size:
+            sample = flagged.sample(n=self.sample_size, random_state=0).sort_index()
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            sample_path = os.path.join(self.directory, f"{dataset_name}_rejects.csv")
+            sample.to_csv(sample_path, index=False)
+            logger.info(f"    💾 {len(sample):,} of {len(flagged):,} flagged rows sampled to {sample_path}")
+        except Exception as e:
+            logger.warning(f"    ⚠️  Reject sample not written: {e}")
+
+
+def quarantine_payloads(rejected):
+    """One JSON document per rejected row, serialised in a single pass"""
+    if rejected.empty:
+        return []
+    payload = rejected.drop(columns=['RejectReasons'], errors='ignore')
+    return payload.to_json(orient='records', lines=True, date_format='iso').splitlines()
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+
+HIERARCHY_STAGING_CREATE_QUERY = """
+    IF OBJECT_ID('tempdb..#EmployeeHierarchyStaging') IS NULL
+        CREATE TABLE #EmployeeHierarchyStaging (
+            AncestorKey INT NOT NULL,
+            DescendantKey INT NOT NULL,
+            Depth INT NOT NULL,
+            SourceSystem VARCHAR(20) NOT NULL
+        )
+"""
+
+HIERARCHY_STAGE_QUERY = """
+    INSERT INTO #EmployeeHierarchyStaging (AncestorKey, DescendantKey, Depth, SourceSystem)
+    VALUES (?, ?, ?, ?)
+"""
+
+# The staged closure is complete for its source systems: pairs it no longer
+# contains (or now reaches at another depth) are removed, the rest inserted
+HIERARCHY_PRUNE_QUERY = """
+    DELETE b
+    FROM BridgeEmployeeHierarchy b
+    JOIN DimEmployee d ON d.EmployeeKey = b.DescendantKey
+    WHERE d.SourceSystem IN (SELECT DISTINCT SourceSystem FROM #EmployeeHierarchyStaging)
+      AND NOT EXISTS (
+          SELECT 1 FROM #EmployeeHierarchyStaging s
+          WHERE s.AncestorKey = b.AncestorKey AND s.DescendantKey = b.DescendantKey AND s.Depth = b.Depth
+      )
+"""
+
+HIERARCHY_MERGE_QUERY = """
+    INSERT INTO BridgeEmployeeHierarchy (AncestorKey, DescendantKey, Depth)
+    SELECT s.AncestorKey, s.DescendantKey, s.Depth
+    FROM #EmployeeHierarchyStaging s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM BridgeEmployeeHierarchy b
+        WHERE b.AncestorKey = s.AncestorKey AND b.DescendantKey = s.DescendantKey
+    )
+"""
+
+HIERARCHY_STAGING_CLEAR_QUERY = "TRUNCATE TABLE #EmployeeHierarchyStaging"
+
+def _climb(employee_ids, manager_of):
+    """Breadth-first closure, one vectorized join per management level.
+
+    Returns (closure levels, employees found to be their own ancestor).
+    """
+    stride = int(employee_ids.max()) + 1
+    levels = [pd.DataFrame({'AncestorID': employee_ids, 'DescendantID': employee_ids, 'Depth': 0})]
+    seen_pairs = employee_ids * stride + employee_ids
+    cycle_members = []
+
+    frontier = pd.DataFrame({'AncestorID': manager_of.to_numpy().astype('int64'), 'DescendantID': manager_of.index.to_numpy()})
+    depth = 1
+    while not frontier.empty:
+        cyclic = frontier['AncestorID'] == frontier['DescendantID']
+        cycle_members.append(frontier.loc[cyclic, 'DescendantID'].to_numpy())
+
+        # A pair seen at a shallower depth means the walk went round a cycle again
+        pair_codes = frontier['AncestorID'].to_numpy() * stride + frontier['DescendantID'].to_numpy()
+        frontier = frontier[~cyclic.to_numpy() & ~np.isin(pair_codes, seen_pairs)]
+        if frontier.empty:
+            break
+
+        levels.append(frontier.assign(Depth=depth))
+        seen_pairs = np.concatenate([seen_pairs, frontier['AncestorID'].to_numpy() * stride + frontier['DescendantID'].to_numpy()])
+
+        next_ancestors = manager_of.reindex(frontier['AncestorID'].to_numpy()).to_numpy()
+        climbing = ~np.isnan(next_ancestors)
+        frontier = pd.DataFrame({
+            'AncestorID': next_ancestors[climbing].astype('int64'),
+            'DescendantID': frontier['DescendantID'].to_numpy()[climbing]
+        })
+        depth += 1
+
+    return levels, np.unique(np.concatenate(cycle_members)) if cycle_members else np.array([], dtype='int64')
+
+
+def employee_hierarchy_closure(employees):
+    """Transitive closure of ReportsTo: (closure, orphan IDs, cycle member IDs).
+
+    closure has one (AncestorID, DescendantID, Depth) row per management pair,
+    including every employee as its own ancestor at depth 0. Employees whose
+    manager is not among the employees (orphans) and employees on a reporting
+    cycle are treated as top of their chain.
+    """
+    employee_ids = pd.to_numeric(employees['EmployeeID'], errors='coerce')
+    manager_ids = pd.to_numeric(employees['ReportsTo'], errors='coerce')
+    known = employee_ids.notna()
+    employee_ids, manager_ids = employee_ids[known].astype('int64'), manager_ids[known]
+
+    unique_ids = np.unique(employee_ids.to_numpy())
+    if len(unique_ids) == 0:
+        return pd.DataFrame(columns=['AncestorID', 'DescendantID', 'Depth']), unique_ids, unique_ids
+
+    reporting = pd.DataFrame({'DescendantID': employee_ids.to_numpy(), 'ManagerID': manager_ids.to_numpy()})
+    reporting = reporting.dropna().drop_duplicates('DescendantID', keep='last')
+    reporting['ManagerID'] = reporting['ManagerID'].astype('int64')
+
+    orphaned = ~reporting['ManagerID'].isin(unique_ids)
+    orphans = reporting.loc[orphaned, 'DescendantID'].to_numpy()
+    reporting = reporting[~orphaned]
+    manager_of = pd.Series(reporting['ManagerID'].to_numpy(dtype='float64'), index=reporting['DescendantID'].to_numpy())
+
+    levels, cycle_members = _climb(unique_ids, manager_of)
+    if len(cycle_members):
+        levels, _ = _climb(unique_ids, manager_of.drop(cycle_members))
+
+    closure = pd.concat(levels, ignore_index=True)
+    closure['Depth'] = closure['Depth'].astype('int64')
+    return closure, orphans, cycle_members
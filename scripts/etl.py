@@ -1,51 +1,425 @@
+import argparse
+import contextlib
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
-import pyodbc
-from DatabaseConfig import DatabaseConfig, connect_to_database, validate_connections
-import create_datawarehouse
+from DatabaseConfig import DatabaseConfig, connect_to_database
+from reporting_cache import ReportingDatasetCache, derive_reporting_labels
+from schema_registry import SchemaRegistry
+from kpi_snapshot import KPI_SNAPSHOT_PATH, build_kpi_snapshot, write_kpi_snapshot
+from inventory import (
+    INVENTORY_EARLIEST_NEW_QUERY, INVENTORY_LOAD_COLUMN_NAMES, INVENTORY_MERGE_QUERY, INVENTORY_STAGE_QUERY,
+    INVENTORY_STAGING_CLEAR_QUERY, INVENTORY_STAGING_CREATE_QUERY, SNAPSHOT_CLEAR_QUERY, SNAPSHOT_INSERT_QUERY,
+    SNAPSHOT_LOAD_COLUMNS, SNAPSHOT_OPENING_QUERY, SNAPSHOT_RANGE_QUERY, DAILY_MOVEMENT_QUERY,
+    daily_stock_snapshot, dates_from_keys, read_inventory_workbooks, transform_inventory_transactions,
+    transform_products
+)
+from change_tracking import (
+    CHANGE_TRACKED_TABLES, SYNC_VERSION_QUERY, SYNC_VERSION_SAVE_QUERY, ChangeTrackingSource, SimulatedChangeLog,
+    changed_keys, key_batches
+)
+from customer_resolution import (
+    CUSTOMER_RESOLUTION_QUERY, XREF_COLUMNS, XREF_MERGE_QUERY, XREF_QUERY, XREF_STAGE_QUERY,
+    XREF_STAGING_CLEAR_QUERY, XREF_STAGING_CREATE_QUERY, XREF_UPDATE_QUERY, resolve_customers
+)
+from employee_hierarchy import (
+    HIERARCHY_MERGE_QUERY, HIERARCHY_PRUNE_QUERY, HIERARCHY_STAGE_QUERY, HIERARCHY_STAGING_CLEAR_QUERY,
+    HIERARCHY_STAGING_CREATE_QUERY, employee_hierarchy_closure
+)
+from geography import (
+    GEOGRAPHY_KEYS_QUERY, GEOGRAPHY_MERGE_QUERY, GEOGRAPHY_STAGE_QUERY, GEOGRAPHY_STAGING_CLEAR_QUERY,
+    GEOGRAPHY_STAGING_CREATE_QUERY, SHIP_TO_GEOGRAPHY, factorize_geographies, geography_match_index,
+    normalize_geography
+)
+from purchasing import (
+    PURCHASE_LOAD_COLUMN_NAMES, PURCHASE_MERGE_QUERY, PURCHASE_ORDER_MILESTONES, PURCHASE_STAGE_QUERY,
+    PURCHASE_STAGING_CLEAR_QUERY, PURCHASE_STAGING_CREATE_QUERY, PURCHASE_UPDATE_QUERY, read_purchasing_workbooks,
+    transform_purchase_order_lines, transform_suppliers
+)
+from etl_logging import DEFAULT_LEVEL, configure_logging, logger, log_limited, flush_limited
+from etl_profiling import PROFILE_DIRECTORY, PROFILE_TOP_N, PipelineProfiler
+from data_quality import DataQualityValidator, ValidationRule, quarantine_payloads
+
+
+# Access attribute names consumed by the transformation methods (also the extraction projection)
+LEGACY_CUSTOMER_ATTRIBUTES = {
+    'ID': 'CustomerID',
+    'Company': 'CompanyName',
+    'Last Name': 'LastName',
+    'First Name': 'FirstName',
+    'Business Phone': 'Phone',
+    'Address': 'Address',
+    'City': 'City',
+    'State/Province': 'Region',
+    'ZIP/Postal Code': 'PostalCode',
+    'Country/Region': 'Country'
+}
+
+LEGACY_EMPLOYEE_ATTRIBUTES = {
+    'ID': 'EmployeeID',
+    'Last Name': 'LastName',
+    'First Name': 'FirstName',
+    'Job Title': 'Title',
+    'Business Phone': 'HomePhone',
+    'Address': 'Address',
+    'City': 'City',
+    'State/Province': 'Region',
+    'ZIP/Postal Code': 'PostalCode',
+    'Country/Region': 'Country'
+}
+
+LEGACY_ORDER_ATTRIBUTES = {
+    'Order ID': 'OrderID',
+    'ID': 'OrderID',
+    'Customer': 'CustomerID',
+    'Employee': 'EmployeeID',
+    'Order Date': 'OrderDate',
+    'Required Date': 'RequiredDate',
+    'Shipped Date': 'ShippedDate',
+    'Shipping Fee': 'Freight',
+    'Ship Fee': 'Freight',
+    'Ship Name': 'ShipName',
+    'Ship Address': 'ShipAddress',
+    'Ship City': 'ShipCity',
+    'Ship State/Province': 'ShipRegion',
+    'Ship Region': 'ShipRegion',
+    'Ship ZIP/Postal Code': 'ShipPostalCode',
+    'Ship Postal Code': 'ShipPostalCode',
+    'Ship Country/Region': 'ShipCountry',
+    'Ship Country': 'ShipCountry'
+}
+
+LEGACY_ORDER_DETAIL_ATTRIBUTES = ['Order ID', 'Quantity', 'Unit Price', 'Discount']
+
+# Operational extraction; {key_filter} narrows a query to changed keys in CDC mode
+OPERATIONAL_DATA_QUERIES = {
+    'customer_data': """
+        SELECT CustomerID, CompanyName, ContactName, ContactTitle, 
+               Address, City, Region, PostalCode, Country, Phone
+        FROM Customers
+        WHERE CustomerID IS NOT NULL{key_filter}
+    """,
+    'employee_data': """
+        SELECT EmployeeID, LastName, FirstName, Title, TitleOfCourtesy,
+               BirthDate, HireDate, Address, City, Region, PostalCode,
+               Country, HomePhone, ReportsTo
+        FROM Employees
+        WHERE EmployeeID IS NOT NULL{key_filter}
+    """,
+    'order_data': """
+        SELECT o.OrderID, o.CustomerID, o.EmployeeID, 
+               o.OrderDate, o.RequiredDate, o.ShippedDate,
+               o.ShipVia, o.Freight, o.ShipName, o.ShipAddress,
+               o.ShipCity, o.ShipRegion, o.ShipPostalCode, o.ShipCountry,
+               SUM(od.Quantity * od.UnitPrice * (1 - od.Discount)) as TransactionValue
+        FROM Orders o
+        LEFT JOIN [Order Details] od ON o.OrderID = od.OrderID
+        WHERE o.OrderID IS NOT NULL{key_filter}
+        GROUP BY o.OrderID, o.CustomerID, o.EmployeeID, o.OrderDate, 
+                 o.RequiredDate, o.ShippedDate, o.ShipVia, o.Freight,
+                 o.ShipName, o.ShipAddress, o.ShipCity, o.ShipRegion,
+                 o.ShipPostalCode, o.ShipCountry
+        ORDER BY o.OrderID
+    """
+}
+
+# Datasets CDC mode re-extracts by key: (filtered column, key type)
+CHANGED_KEY_FILTERS = {
+    'customer_data': ('CustomerID', str),
+    'order_data': ('o.OrderID', int)
+}
+
+# Pipeline stages and source systems selectable from the command line
+PIPELINE_STAGES = ['dates', 'extract', 'dimensions', 'facts', 'resolution', 'inventory', 'purchasing', 'aggregates', 'export']
+SOURCE_SYSTEMS = ['SQL', 'Access', 'Excel']
+DEFAULT_SOURCES = ['SQL', 'Access']
+SOURCE_MODES = ['full', 'cdc']
+DEFAULT_START_DATE = '1990-01-01'
+DEFAULT_END_DATE = '2025-12-31'
+
+# Sources shipped in the Access column layout (Excel holds exports of the same tables)
+LEGACY_LAYOUT_SOURCES = ('Access', 'Excel')
+EXCEL_DIRECTORY = os.path.join('data', 'excel')
+
+# Source-level checks on transformed orders: counted and sampled, never dropped
+ORDER_SOURCE_RULES = [
+    ValidationRule.not_null('customer_id_present', 'CustomerID', placeholders=['nan', 'None', 'LEG-0']),
+    ValidationRule.not_null('employee_id_present', 'EmployeeID', placeholders=[2000]),
+    ValidationRule.date_order('shipped_after_order', 'OrderDate', 'ShippedDate'),
+    ValidationRule.date_order('required_after_order', 'OrderDate', 'RequiredDate'),
+]
+
+# Load-time checks once surrogate keys are resolved; rejected rows go to QuarantineOrders
+FACT_LOAD_RULES = [
+    ValidationRule.not_null('order_id_present', 'OrderID', severity='reject', placeholders=[0]),
+    ValidationRule.not_null('order_date_present', 'OrderDateKey', severity='reject'),
+    ValidationRule.referential('customer_reference', 'CustomerKey'),
+    ValidationRule.referential('employee_reference', 'EmployeeKey'),
+    ValidationRule.in_range('freight_non_negative', 'Freight', minimum=0),
+    ValidationRule.in_range('amount_non_negative', 'TransactionValue', minimum=0),
+]
+
+# Below this many orders the process start-up and pickling cost more than they save
+PARALLEL_TRANSFORM_MIN_ROWS = 200_000
+
+
+# Fact loading: rows per executemany round trip, and deadlock retry policy for concurrent loads
+FACT_LOAD_BATCH_SIZE = 5000
+FACT_LOAD_MAX_RETRIES = 5
+FACT_LOAD_RETRY_BACKOFF = 0.5
+
+FACT_LOAD_COLUMNS = """
+        OrderID, CustomerKey, EmployeeKey, OrderDateKey,
+        OrderDate, RequiredDateKey, RequiredDate,
+        ShippedDateKey, ShippedDate, ShipVia, Freight,
+        ShipName, ShipAddress, GeographyKey, TotalAmount,
+        DeliveryStatus, DeliveryDelay, SourceSystem
+"""
+
+FACT_LOAD_COLUMN_NAMES = [column.strip() for column in FACT_LOAD_COLUMNS.split(',')]
+
+# Accumulating snapshot: the order lifecycle columns that move after an order
+# is first loaded, refreshed in place when the source reports a new milestone
+FACT_MILESTONE_COLUMNS = [
+    'OrderDateKey', 'OrderDate', 'RequiredDateKey', 'RequiredDate',
+    'ShippedDateKey', 'ShippedDate', 'DeliveryStatus', 'DeliveryDelay'
+]
+
+# Candidate facts are bulk-copied to a session temp table and deduplicated
+# in the warehouse, so existing keys never travel to the client
+FACT_STAGING_CREATE_QUERY = """
+    IF OBJECT_ID('tempdb..#FactOrdersStaging') IS NULL
+        CREATE TABLE #FactOrdersStaging (
+            OrderID INT NOT NULL,
+            CustomerKey INT,
+            EmployeeKey INT,
+            OrderDateKey INT,
+            OrderDate DATE,
+            RequiredDateKey INT,
+            RequiredDate DATE,
+            ShippedDateKey INT,
+            ShippedDate DATE,
+            ShipVia INT,
+            Freight DECIMAL(10,2),
+            ShipName VARCHAR(100),
+            ShipAddress VARCHAR(200),
+            GeographyKey INT,
+            TotalAmount DECIMAL(10,2),
+            DeliveryStatus BIT,
+            DeliveryDelay INT,
+            SourceSystem VARCHAR(20)
+        )
+"""
+
+FACT_STAGE_QUERY = f"""
+    INSERT INTO #FactOrdersStaging ({FACT_LOAD_COLUMNS})
+    VALUES ({', '.join('?' * len(FACT_LOAD_COLUMN_NAMES))})
+"""
+
+FACT_MERGE_QUERY = f"""
+    INSERT INTO FactOrders ({FACT_LOAD_COLUMNS})
+    SELECT {FACT_LOAD_COLUMNS}
+    FROM #FactOrdersStaging s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM FactOrders f
+        WHERE f.OrderID = s.OrderID AND f.SourceSystem = s.SourceSystem
+    )
+"""
+
+# Upsert: everything about a loaded order that the source can still change, for
+# orders re-extracted because Change Tracking reported them (freight, lines, shipping)
+FACT_UPSERT_COLUMNS = [column for column in FACT_LOAD_COLUMN_NAMES if column not in ('OrderID', 'SourceSystem')]
+
+
+def fact_update_query(columns):
+    """Refresh the given columns of loaded orders from staging.
+
+    Only orders whose values differ are touched; EXCEPT compares NULLs as equal,
+    so an order still unshipped on both sides is left alone.
+    """
+    return f"""
+    UPDATE f
+    SET {', '.join(f'{column} = s.{column}' for column in columns)},
+        MilestoneUpdatedAt = GETDATE()
+    FROM FactOrders f
+    JOIN #FactOrdersStaging s ON f.OrderID = s.OrderID AND f.SourceSystem = s.SourceSystem
+    WHERE EXISTS (
+        SELECT {', '.join(f's.{column}' for column in columns)}
+        EXCEPT
+        SELECT {', '.join(f'f.{column}' for column in columns)}
+    )
+"""
+
+
+FACT_MILESTONE_UPDATE_QUERY = fact_update_query(FACT_MILESTONE_COLUMNS)
+FACT_UPSERT_UPDATE_QUERY = fact_update_query(FACT_UPSERT_COLUMNS)
+
+FACT_STAGING_CLEAR_QUERY = "TRUNCATE TABLE #FactOrdersStaging"
+
+# Fact load modes with the update applied to orders already loaded; insert only adds new orders
+FACT_UPDATE_QUERIES = {
+    'accumulating': FACT_MILESTONE_UPDATE_QUERY,
+    'upsert': FACT_UPSERT_UPDATE_QUERY
+}
+FACT_LOAD_MODES = ['accumulating', 'upsert', 'insert']
+
+# Orders deleted at source, removed in batches of parameterized keys
+FACT_SOURCE_DELETE_QUERY = "DELETE FROM FactOrders WHERE SourceSystem = ? AND OrderID IN ({keys})"
+
+# Dimension attributes covered by RowHash, with the conversions applied when loading
+DIMENSION_LOAD_SPECS = {
+    'DimCustomer': {
+        'surrogate_key': 'CustomerKey',
+        'business_key': 'CustomerID',
+        'attributes': ['CompanyName', 'ContactName', 'ContactTitle', 'Address', 'City',
+                       'Region', 'PostalCode', 'Country', 'Phone'],
+        'date_attributes': [],
+        'integer_attributes': []
+    },
+    'DimEmployee': {
+        'surrogate_key': 'EmployeeKey',
+        'business_key': 'EmployeeID',
+        'attributes': ['LastName', 'FirstName', 'Title', 'TitleOfCourtesy', 'BirthDate', 'HireDate',
+                       'Address', 'City', 'Region', 'PostalCode', 'Country', 'HomePhone', 'ReportsTo'],
+        'date_attributes': ['BirthDate', 'HireDate'],
+        'integer_attributes': ['ReportsTo']
+    },
+    'DimProduct': {
+        'surrogate_key': 'ProductKey',
+        'business_key': 'ProductID',
+        'attributes': ['ProductCode', 'ProductName', 'Category', 'ReorderLevel', 'TargetLevel'],
+        'date_attributes': [],
+        'integer_attributes': ['ReorderLevel', 'TargetLevel']
+    },
+    'DimSupplier': {
+        'surrogate_key': 'SupplierKey',
+        'business_key': 'SupplierID',
+        'attributes': ['CompanyName', 'ContactName', 'ContactTitle', 'Address', 'City',
+                       'Region', 'PostalCode', 'Country', 'Phone'],
+        'date_attributes': [],
+        'integer_attributes': []
+    }
+}
+
+
+def dimension_load_frame(dimension, spec):
+    """Business key, attributes and SourceSystem converted to the values written to the warehouse"""
+    business_key = spec['business_key']
+    load_frame = pd.DataFrame(index=dimension.index)
+
+    if business_key == 'CustomerID':
+        load_frame[business_key] = dimension[business_key].where(dimension[business_key].notna(), '').astype(str)
+        load_frame = load_frame[load_frame[business_key] != '']
+    else:
+        load_frame[business_key] = pd.to_numeric(dimension[business_key], errors='coerce').fillna(0).astype('int64')
+        load_frame = load_frame[load_frame[business_key] != 0]
+    dimension = dimension.loc[load_frame.index]
+
+    for attribute in spec['attributes']:
+        values = dimension[attribute] if attribute in dimension.columns else pd.Series(None, index=dimension.index, dtype=object)
+        if attribute in spec['date_attributes']:
+            load_frame[attribute] = pd.to_datetime(values, errors='coerce')
+        elif attribute in spec['integer_attributes']:
+            load_frame[attribute] = pd.to_numeric(values, errors='coerce').astype('Int64')
+        else:
+            load_frame[attribute] = values.where(values.notna(), '').astype(str)
+
+    source_system = dimension['SourceSystem'] if 'SourceSystem' in dimension.columns else pd.Series('Unknown', index=dimension.index)
+    load_frame['SourceSystem'] = source_system.where(source_system.notna(), 'Unknown').astype(str)
+    return load_frame
+
+
+def dimension_row_hashes(load_frame, spec):
+    """64-bit content hash per row over the normalized attribute text, computed column-wise"""
+    normalized = {}
+    for attribute in spec['attributes']:
+        values = load_frame[attribute]
+        if attribute in spec['date_attributes']:
+            values = values.dt.strftime('%Y-%m-%d')
+        normalized[attribute] = values.astype(str).where(values.notna(), '')
+    # hash_pandas_object uses a fixed key, so hashes are stable from run to run
+    row_hashes = pd.util.hash_pandas_object(pd.DataFrame(normalized), index=False)
+    return pd.Series(row_hashes.to_numpy().view('int64'), index=load_frame.index)
+
+
+def is_deadlock_error(error):
+    """SQL Server reports a deadlock victim as SQLSTATE 40001 / native error 1205.
+
+    pyodbc errors carry the SQLSTATE as their first argument and the native code
+    in parentheses just before the ODBC call name, e.g. "(1205) (SQLExecDirectW)";
+    numbers quoted elsewhere in the message never match.
+    """
+    arguments = getattr(error, 'args', ())
+    if arguments and arguments[0] == '40001':
+        return True
+    return len(arguments) > 1 and re.search(r'\(1205\) \(SQL\w+\)', str(arguments[1])) is not None
+
+
+def transform_order_partition(order_partition, source_identifier):
+    """Worker entry point: transform one order partition without per-record console output"""
+    logger.disable(__name__)
+    return etl._transform_order_facts(order_partition.copy(), source_identifier)
 
 
 class etl:
 
     def __init__(self):
-        print("=" * 50)
-        print("NORTHWIND DATA INTEGRATION INITIALIZATION")
-        print("=" * 50)
+        self.legacy_source = None
+        self._legacy_extraction = {}
+        self._legacy_mapping = None
+        self.employee_hierarchies = {}
+        self.transform_workers = 1
+        self.load_workers = 1
+        self.reporting_cache = ReportingDatasetCache()
+        self.quality = DataQualityValidator()
+        self.profiler = None
+        self.load_batch_size = FACT_LOAD_BATCH_SIZE
+        self.bulk_load_mode = 'batch'
+        self.fact_load_mode = 'accumulating'
+        self.source_mode = 'full'
+        self.change_log_path = None
+        self.pending_sync_versions = {}
+        self.source_deletes = {}
+        self.extracted_changes = False
+        self.dry_run = False
+
+        logger.info("=" * 50)
+        logger.info("NORTHWIND DATA INTEGRATION INITIALIZATION")
+        logger.info("=" * 50)
 
         # Establish connection to operational database
-        print("\n1. Connecting to operational SQL database...")
+        logger.info("\n1. Connecting to operational SQL database...")
         self.source_connection = connect_to_database(DatabaseConfig.SOURCE_DATABASE)
         self.target_connection = connect_to_database(DatabaseConfig.TARGET_DATABASE)
 
         if self.source_connection is None:
             raise Exception("Connection failed: Operational database unreachable")
-        print("   ✅ Operational database connection established")
+        logger.info("   ✅ Operational database connection established")
 
-        # Initialize data warehouse
-        print("\n2. Verifying data warehouse structure...")
-        try:
-            if create_datawarehouse.initialize_warehouse():
-                print("   ✅ Data warehouse verified")
-                if create_datawarehouse.setup_warehouse_schema():
-                    print("   ✅ Warehouse schema configured")
-                else:
-                    print("   ⚠️ Schema may already exist")
-            else:
-                print("   ⚠️ Warehouse initialization incomplete")
-        except Exception as e:
-            print(f"   ⚠️ Warehouse setup issue: {e}")
+        # Connect to data warehouse, creating the database on first use
+        logger.info("\n2. Connecting to data warehouse...")
+        if self.target_connection is None:
+            import create_datawarehouse
 
-        # Connect to data warehouse
-        print("\n3. Connecting to data warehouse...")
-        self.warehouse_connection = validate_connections()
+            if create_datawarehouse.init_datawarehouse():
+                self.target_connection = connect_to_database(DatabaseConfig.TARGET_DATABASE)
+        self.warehouse_connection = self.target_connection
 
         if self.warehouse_connection is None:
             raise Exception("Connection failed: Data warehouse unreachable")
-        print("   ✅ Data warehouse connection established")
+        logger.info("   ✅ Data warehouse connection established")
 
-        print("\n" + "=" * 50)
-        print("✅ ALL CONNECTIONS SUCCESSFUL")
-        print("=" * 50)
+        # Tables are created and migrated by the schema registry, once per process
+        self.schema = SchemaRegistry(self.warehouse_connection)
+
+        logger.info("\n" + "=" * 50)
+        logger.info("✅ ALL CONNECTIONS SUCCESSFUL")
+        logger.info("=" * 50)
 
     # UTILITY METHODS
     def table_exists_check(self, table_identifier):
@@ -60,26 +434,32 @@ class etl:
             cursor.close()
             return exists_flag
         except Exception as e:
-            print(f"⚠️ Table verification error for {table_identifier}: {e}")
+            logger.warning(f"⚠️ Table verification error for {table_identifier}: {e}")
             return False
 
     def populate_date_dimension(self, start_year=1990, end_year=2025):
-        print("\nDATE DIMENSION POPULATION")
-        print("-" * 30)
+        logger.info("\nDATE DIMENSION POPULATION")
+        logger.info("-" * 30)
+
+        self.ensure_warehouse_schema()
 
-        self._verify_date_dimension_structure()
+        logger.info(f" Generating date range {start_year} through {end_year}...")
+
+        date_sequence = pd.date_range(start=f'{start_year}-01-01', end=f'{end_year}-12-31', freq='D')
 
         try:
-            record_count = self.warehouse_connection.execute("SELECT COUNT(*) FROM DimDate").fetchone()[0]
-            if record_count > 0:
-                print(f" Date dimension contains {record_count:,} entries")
+            existing_keys = pd.read_sql(
+                "SELECT DateKey FROM DimDate WHERE DateKey BETWEEN ? AND ?",
+                self.warehouse_connection,
+                params=[int(f'{start_year}0101'), int(f'{end_year}1231')]
+            )['DateKey']
+            if len(existing_keys) >= len(date_sequence):
+                logger.info(f" Date dimension contains {len(existing_keys):,} entries for the window")
                 return pd.DataFrame()
+            if not existing_keys.empty:
+                date_sequence = date_sequence[~date_sequence.strftime('%Y%m%d').astype(int).isin(existing_keys)]
         except:
             pass
-
-        print(f" Generating date range {start_year} through {end_year}...")
-
-        date_sequence = pd.date_range(start=f'{start_year}-01-01', end=f'{end_year}-12-31', freq='D')
         date_dimension = pd.DataFrame({
             'DateKey': date_sequence.strftime('%Y%m%d').astype(int),
             'Date': date_sequence.date,
@@ -92,7 +472,11 @@ class etl:
             'WeekendFlag': (date_sequence.weekday >= 5).astype(int)
         })
 
-        print(f" Loading {len(date_dimension):,} date entries...")
+        logger.info(f" Loading {len(date_dimension):,} date entries...")
+
+        if self.dry_run:
+            logger.info(f" 🧪 Dry run: {len(date_dimension):,} date entries not written")
+            return date_dimension
 
         cursor = self.warehouse_connection.cursor()
         cursor.fast_executemany = True
@@ -121,196 +505,102 @@ class etl:
         self.warehouse_connection.commit()
         cursor.close()
 
-        print(f" Date dimension populated: {len(date_dimension):,} entries")
+        logger.info(f" Date dimension populated: {len(date_dimension):,} entries")
         return date_dimension
 
-    def build_legacy_system_mapping(self):
-        """Construct mapping between legacy system IDs and business entities"""
-        print("\n🗺️  LEGACY SYSTEM MAPPING CONSTRUCTION")
-        print("-" * 30)
-
-        entity_mapping = {
-            'customer_mapping': {},  # Customer identifier to organization name
-            'employee_mapping': {}   # Employee identifier to personnel name
-        }
-
-        try:
-            legacy_connection_string = f"DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={DatabaseConfig.ACCESS_DB_PATH};"
-            legacy_connection = pyodbc.connect(legacy_connection_string)
-
-            # Map customer entities
-            customer_records = pd.read_sql("SELECT [ID], [Company] FROM [Customers]", legacy_connection)
-            for _, record in customer_records.iterrows():
-                customer_identifier = str(record['ID'])
-                organization_name = str(record['Company'])
-                entity_mapping['customer_mapping'][customer_identifier] = organization_name
-
-            # Map employee entities
-            employee_records = pd.read_sql("SELECT [ID], [First Name], [Last Name] FROM [Employees]", legacy_connection)
-            for _, record in employee_records.iterrows():
-                employee_identifier = str(record['ID'])
-                given_name = str(record['First Name'])
-                family_name = str(record['Last Name'])
-                complete_name = f"{given_name} {family_name}"
-                entity_mapping['employee_mapping'][employee_identifier] = complete_name
+    def _extend_date_dimension(self, facts, date_key_columns):
+        """Cover the years of a fact's date keys in DimDate, whatever date window the run was given"""
+        date_keys = pd.concat([facts[column] for column in date_key_columns]).dropna()
+        if date_keys.empty:
+            return
+        years = date_keys.astype('int64') // 10000
+        self.populate_date_dimension(int(years.min()), int(years.max()))
+
+    def build_legacy_system_mapping(self, legacy_data=None, refresh=False):
+        """Legacy ID -> company and personnel names, per Access-layout source extracted in this run.
+
+        legacy_data maps a source identifier to its raw extraction and defaults to the
+        frames the selected Access and Excel sources returned, so each source's orders
+        fall back on its own tables. Empty when no such source was extracted.
+        """
+        # One mapping per extraction: the fact load and any later caller share it
+        if legacy_data is None and not refresh and self._legacy_mapping is not None:
+            return self._legacy_mapping
+
+        if legacy_data is None:
+            legacy_data = self._legacy_extraction
+        if not legacy_data:
+            return {}
 
-            legacy_connection.close()
+        logger.info("\n🗺️  LEGACY SYSTEM MAPPING CONSTRUCTION")
+        logger.info("-" * 30)
 
-            print(f"  ✅ Mapping constructed: {len(entity_mapping['customer_mapping'])} customers, {len(entity_mapping['employee_mapping'])} employees")
+        source_mappings = {}
+        for source_identifier, raw_extraction in legacy_data.items():
+            entity_mapping = {
+                'customer_mapping': pd.Series(dtype=object),  # Customer identifier to organization name
+                'employee_mapping': pd.Series(dtype=object)   # Employee identifier to personnel name
+            }
 
-        except Exception as e:
-            print(f"  ❌ Mapping construction error: {e}")
+            try:
+                # Map customer entities
+                customer_records = raw_extraction.get('customer_raw', pd.DataFrame())
+                if {'ID', 'Company'}.issubset(customer_records.columns):
+                    entity_mapping['customer_mapping'] = self._indexed_mapping(
+                        customer_records['ID'],
+                        customer_records['Company'].astype(str)
+                    )
+
+                # Map employee entities
+                employee_records = raw_extraction.get('employee_raw', pd.DataFrame())
+                if {'ID', 'First Name', 'Last Name'}.issubset(employee_records.columns):
+                    entity_mapping['employee_mapping'] = self._indexed_mapping(
+                        employee_records['ID'],
+                        employee_records['First Name'].astype(str) + ' ' + employee_records['Last Name'].astype(str)
+                    )
+
+                logger.info(f"  ✅ {source_identifier} mapping constructed: {len(entity_mapping['customer_mapping'])} customers, "
+                            f"{len(entity_mapping['employee_mapping'])} employees")
 
-        return entity_mapping
+            except Exception as e:
+                logger.error(f"  ❌ {source_identifier} mapping construction error: {e}")
 
-    def _verify_customer_dimension_structure(self):
-        """Validate customer dimension table structure"""
-        try:
-            cursor = self.warehouse_connection.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimCustomer' AND xtype='U')
-                BEGIN
-                    CREATE TABLE DimCustomer (
-                        CustomerKey INT IDENTITY(1,1) PRIMARY KEY,
-                        CustomerID VARCHAR(10) NOT NULL,
-                        CompanyName VARCHAR(100) NOT NULL,
-                        ContactName VARCHAR(100),
-                        ContactTitle VARCHAR(100),
-                        Address VARCHAR(200),
-                        City VARCHAR(50),
-                        Region VARCHAR(50),
-                        PostalCode VARCHAR(20),
-                        Country VARCHAR(50),
-                        Phone VARCHAR(30),
-                        SourceSystem VARCHAR(20),
-                        UNIQUE(CustomerID, SourceSystem)
-                    );
-                END
-            """)
-            self.warehouse_connection.commit()
-            cursor.close()
-        except Exception as e:
-            print(f"⚠️  Customer dimension structure issue: {e}")
+            source_mappings[source_identifier] = entity_mapping
 
-    def _verify_employee_dimension_structure(self):
-        """Validate employee dimension table structure"""
-        try:
-            cursor = self.warehouse_connection.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimEmployee' AND xtype='U')
-                BEGIN
-                    CREATE TABLE DimEmployee (
-                        EmployeeKey INT IDENTITY(1,1) PRIMARY KEY,
-                        EmployeeID INT NOT NULL,
-                        LastName VARCHAR(50) NOT NULL,
-                        FirstName VARCHAR(50) NOT NULL,
-                        Title VARCHAR(100),
-                        TitleOfCourtesy VARCHAR(25),
-                        BirthDate DATE,
-                        HireDate DATE,
-                        Address VARCHAR(200),
-                        City VARCHAR(50),
-                        Region VARCHAR(50),
-                        PostalCode VARCHAR(20),
-                        Country VARCHAR(50),
-                        HomePhone VARCHAR(30),
-                        ReportsTo INT,
-                        SourceSystem VARCHAR(20),
-                        UNIQUE(EmployeeID, SourceSystem)
-                    );
-                END
-            """)
-            self.warehouse_connection.commit()
-            cursor.close()
-        except Exception as e:
-            print(f"⚠️  Employee dimension structure issue: {e}")
+        self._legacy_mapping = source_mappings
+        return source_mappings
 
-    def _verify_order_facts_structure(self):
-        """Validate order facts table structure"""
-        try:
-            cursor = self.warehouse_connection.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='FactOrders' AND xtype='U')
-                BEGIN
-                    CREATE TABLE FactOrders (
-                        FactOrderKey INT IDENTITY(1,1) PRIMARY KEY,
-                        OrderID INT NOT NULL,
-                        CustomerKey INT,
-                        EmployeeKey INT,
-                        OrderDateKey INT,
-                        OrderDate DATE,
-                        RequiredDate DATE,
-                        ShippedDate DATE,
-                        ShipVia INT,
-                        Freight DECIMAL(10,2),
-                        ShipName VARCHAR(100),
-                        ShipAddress VARCHAR(200),
-                        ShipCity VARCHAR(50),
-                        ShipRegion VARCHAR(50),
-                        ShipPostalCode VARCHAR(20),
-                        ShipCountry VARCHAR(50),
-                        TotalAmount DECIMAL(10,2),
-                        DeliveryStatus BIT,
-                        DeliveryDelay INT,
-                        SourceSystem VARCHAR(20),
-                        FOREIGN KEY (CustomerKey) REFERENCES DimCustomer(CustomerKey),
-                        FOREIGN KEY (EmployeeKey) REFERENCES DimEmployee(EmployeeKey),
-                        FOREIGN KEY (OrderDateKey) REFERENCES DimDate(DateKey)
-                    );
-
-                    -- Performance optimization indexes
-                    CREATE INDEX IX_OrderDate_Reference ON FactOrders(OrderDateKey);
-                    CREATE INDEX IX_Customer_Reference ON FactOrders(CustomerKey);
-                    CREATE INDEX IX_Employee_Reference ON FactOrders(EmployeeKey);
-                END
-            """)
-            self.warehouse_connection.commit()
-            cursor.close()
-            print("  ✅ Order facts structure verified")
-        except Exception as e:
-            print(f"  ❌ Order facts structure error: {e}")
+    @staticmethod
+    def _indexed_mapping(identifiers, labels):
+        """Series keyed by the stringified legacy ID; the last occurrence wins, as with dict assignment"""
+        mapping = pd.Series(labels.to_numpy(), index=identifiers.astype(str).to_numpy(), dtype=object)
+        return mapping[~mapping.index.duplicated(keep='last')]
 
-    def _verify_date_dimension_structure(self):
-        """Validate date dimension table structure"""
+    def ensure_warehouse_schema(self):
+        """Apply pending schema migrations; a no-op after the first check in this process"""
         try:
-            cursor = self.warehouse_connection.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimDate' AND xtype='U')
-                BEGIN
-                    CREATE TABLE DimDate (
-                        DateKey INT PRIMARY KEY,
-                        Date DATE NOT NULL,
-                        Year INT NOT NULL,
-                        Quarter INT NOT NULL,
-                        Month INT NOT NULL,
-                        Day INT NOT NULL,
-                        MonthName VARCHAR(20) NOT NULL,
-                        DayOfWeek VARCHAR(20) NOT NULL,
-                        IsWeekend BIT NOT NULL
-                    );
-
-                    -- Temporal query optimization
-                    CREATE INDEX IX_Temporal_Date ON DimDate(Date);
-                    CREATE INDEX IX_Temporal_Year ON DimDate(Year);
-                    CREATE INDEX IX_Temporal_YearMonth ON DimDate(Year, Month);
-                END
-            """)
-            self.warehouse_connection.commit()
-            cursor.close()
-            print("  ✅ Date dimension structure verified")
+            return self.schema.ensure_current(apply=not self.dry_run)
         except Exception as e:
-            print(f"  ❌ Date dimension structure error: {e}")
+            logger.error(f"  ❌ Warehouse schema migration error: {e}")
+            return None
 
-    def prepare_reporting_dataset(self):
+    def prepare_reporting_dataset(self, use_cache=True):
         """Compile comprehensive dataset for analytical reporting"""
-        print("\n📊 ANALYTICAL DATASET PREPARATION")
-        print("-" * 30)
+        logger.info("\n📊 ANALYTICAL DATASET PREPARATION")
+        logger.info("-" * 30)
 
         if self.warehouse_connection is None:
-            print("  ❌ Data warehouse connection unavailable")
+            logger.error("  ❌ Data warehouse connection unavailable")
             return pd.DataFrame()
 
         try:
+            data_version = self.reporting_cache.data_version(self.warehouse_connection)
+            if use_cache:
+                analytical_data = self.reporting_cache.load(data_version)
+                if analytical_data is not None:
+                    logger.info(f"  ⚡ Analytical data served from cache: {len(analytical_data)} records (version {data_version})")
+                    return analytical_data
+
             analytical_query = """
             SELECT 
                 fo.OrderID,
@@ -340,162 +630,183 @@ class etl:
 
             analytical_data = pd.read_sql(analytical_query, self.warehouse_connection)
 
-            analytical_data['DeliveryStatusText'] = analytical_data['DeliveryStatus'].apply(lambda x: 'Completed' if x == 1 else 'Pending')
+            analytical_data = derive_reporting_labels(analytical_data)
 
-            if 'DeliveryDelay' in analytical_data.columns:
-                analytical_data['DeliveryTimeliness'] = analytical_data['DeliveryDelay'].apply(
-                    lambda x: 'On Schedule' if x <= 0 else ('Delayed' if x > 0 else 'Unknown')
-                )
+            logger.info(f"  ✅ Analytical data compiled: {len(analytical_data)} records")
 
-            print(f"  ✅ Analytical data compiled: {len(analytical_data)} records")
+            self.reporting_cache.store(data_version, analytical_data)
 
             analytical_data.to_csv('data/analytical_dataset.csv', index=False)
-            print("  💾 Dataset archived to data/analytical_dataset.csv")
+            logger.info("  💾 Dataset archived to data/analytical_dataset.csv")
 
             return analytical_data
 
         except Exception as e:
-            print(f"  ❌ Analytical dataset compilation error: {e}")
+            logger.error(f"  ❌ Analytical dataset compilation error: {e}")
             return pd.DataFrame()
 
 
     # DATA ACQUISITION METHODS
     def acquire_operational_data(self):
-        print("\n📥 OPERATIONAL DATA ACQUISITION")
-        print("-" * 30)
-
-        data_queries = {
-            'customer_data': """
-                SELECT CustomerID, CompanyName, ContactName, ContactTitle, 
-                       Address, City, Region, PostalCode, Country, Phone
-                FROM Customers
-                WHERE CustomerID IS NOT NULL
-            """,
-            'employee_data': """
-                SELECT EmployeeID, LastName, FirstName, Title, TitleOfCourtesy,
-                       BirthDate, HireDate, Address, City, Region, PostalCode,
-                       Country, HomePhone, ReportsTo
-                FROM Employees
-                WHERE EmployeeID IS NOT NULL
-            """,
-            'order_data': """
-                SELECT o.OrderID, o.CustomerID, o.EmployeeID, 
-                       o.OrderDate, o.RequiredDate, o.ShippedDate,
-                       o.ShipVia, o.Freight, o.ShipName, o.ShipAddress,
-                       o.ShipCity, o.ShipRegion, o.ShipPostalCode, o.ShipCountry,
-                       SUM(od.Quantity * od.UnitPrice * (1 - od.Discount)) as TransactionValue
-                FROM Orders o
-                LEFT JOIN [Order Details] od ON o.OrderID = od.OrderID
-                WHERE o.OrderID IS NOT NULL
-                GROUP BY o.OrderID, o.CustomerID, o.EmployeeID, o.OrderDate, 
-                         o.RequiredDate, o.ShippedDate, o.ShipVia, o.Freight,
-                         o.ShipName, o.ShipAddress, o.ShipCity, o.ShipRegion,
-                         o.ShipPostalCode, o.ShipCountry
-                ORDER BY o.OrderID
-            """
-        }
+        logger.info("\n📥 OPERATIONAL DATA ACQUISITION")
+        logger.info("-" * 30)
+
+        self.extracted_changes = False
+        if self.source_mode == 'cdc':
+            changed_data = self._acquire_changed_operational_data()
+            if changed_data is not None:
+                self.extracted_changes = True
+                return changed_data
 
         acquired_data = {}
-        for dataset_name, query in data_queries.items():
+        for dataset_name, query in OPERATIONAL_DATA_QUERIES.items():
             try:
-                acquired_data[dataset_name] = pd.read_sql(query, self.source_connection)
-                print(f"  ✅ {dataset_name}: {len(acquired_data[dataset_name])} records acquired")
+                acquired_data[dataset_name] = pd.read_sql(query.format(key_filter=''), self.source_connection)
+                logger.info(f"  ✅ {dataset_name}: {len(acquired_data[dataset_name])} records acquired")
             except Exception as e:
-                print(f"  ❌ Acquisition error for {dataset_name}: {e}")
+                logger.error(f"  ❌ Acquisition error for {dataset_name}: {e}")
                 acquired_data[dataset_name] = pd.DataFrame()
 
         return acquired_data
 
-    def acquire_legacy_system_data(self):
-        """Extract raw data from legacy system without transformation"""
-        if not DatabaseConfig.ACCESS_DB_PATH:
-            print("\nℹ️  Legacy system path not configured")
-            return {}
+    def _change_tracker(self):
+        if self.change_log_path:
+            return SimulatedChangeLog(self.change_log_path)
+        return ChangeTrackingSource(self.source_connection)
 
-        print("\n📥 LEGACY SYSTEM DATA EXTRACTION (RAW)")
-        print("-" * 30)
+    def _acquire_changed_operational_data(self):
+        """Re-extract only the customers and orders changed since the last sync; None when a full extract is needed.
 
+        The source version is read before anything is extracted and only saved once
+        the loads have run, so changes made during a run are picked up by the next one.
+        Without a usable sync version (first run, history cleaned up) the full extract
+        becomes the baseline.
+        """
         try:
-            legacy_connection_string = f"DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={DatabaseConfig.ACCESS_DB_PATH};"
-            legacy_connection = pyodbc.connect(legacy_connection_string)
-
-            cursor = legacy_connection.cursor()
-            available_tables = cursor.tables(tableType='TABLE')
-            table_catalog = []
-            for table in available_tables:
-                table_catalog.append(table.table_name)
-            cursor.close()
+            self.ensure_warehouse_schema()
+            tracker = self._change_tracker()
+            current_version = tracker.current_version()
+            synced_versions = pd.read_sql(SYNC_VERSION_QUERY, self.warehouse_connection)
+            synced_versions = synced_versions.set_index('SourceTable')['LastSyncVersion']
+            self.pending_sync_versions = {table_name: current_version for table_name in CHANGE_TRACKED_TABLES}
+
+            change_sets = {}
+            for table_name, (key_column, _, _) in CHANGE_TRACKED_TABLES.items():
+                last_version = synced_versions.get(table_name)
+                if last_version is None or pd.isna(last_version) or last_version < tracker.min_valid_version(table_name):
+                    logger.warning(f"  ⚠️  No usable sync version for [{table_name}]: full extract as the CDC baseline")
+                    return None
+                change_sets[table_name] = tracker.changes(table_name, key_column, int(last_version))
+        except Exception as e:
+            logger.warning(f"  ⚠️  Change tracking unavailable, full extract instead: {e}")
+            self.pending_sync_versions = {}
+            return None
+
+        upserts, self.source_deletes = changed_keys(change_sets)
+        logger.info(f"  🔄 Changes up to version {current_version}: "
+                    f"{len(upserts.get('customer_data', []))} customers and {len(upserts.get('order_data', []))} orders "
+                    f"to re-extract, {len(self.source_deletes.get('order_data', []))} orders deleted")
+
+        # Employees are not change-tracked and keep their loaded rows
+        acquired_data = {'employee_data': pd.DataFrame()}
+        for dataset_name, (key_column, key_type) in CHANGED_KEY_FILTERS.items():
+            changed_records = []
+            try:
+                for batch in key_batches([key_type(key) for key in upserts.get(dataset_name, [])]):
+                    key_filter = f" AND {key_column} IN ({', '.join('?' * len(batch))})"
+                    changed_records.append(pd.read_sql(
+                        OPERATIONAL_DATA_QUERIES[dataset_name].format(key_filter=key_filter),
+                        self.source_connection, params=batch
+                    ))
+                acquired_data[dataset_name] = pd.concat(changed_records, ignore_index=True) if changed_records else pd.DataFrame()
+                logger.info(f"  ✅ {dataset_name}: {len(acquired_data[dataset_name])} changed records acquired")
+            except Exception as e:
+                logger.error(f"  ❌ Acquisition error for {dataset_name}: {e}")
+                acquired_data[dataset_name] = pd.DataFrame()
+                # Keep the last sync version so the next run fetches these changes again
+                self.pending_sync_versions = {}
 
-            print(f"Legacy system tables: {table_catalog}")
+        return acquired_data
 
-            raw_extraction = {}
+    def _apply_source_deletes(self):
+        """Remove the facts of orders deleted at source; deleted customers stay in DimCustomer for their history"""
+        deleted_orders = [int(key) for key in self.source_deletes.get('order_data', [])]
+        deleted_customers = self.source_deletes.get('customer_data', [])
+        if deleted_customers:
+            logger.info(f"  ℹ️  {len(deleted_customers)} customers deleted at source kept in DimCustomer")
+        if not deleted_orders:
+            return
 
-            try:
-                print("  Extracting customer data (raw)...")
-                customer_source = 'Customers'
-                if customer_source not in table_catalog:
-                    for table in table_catalog:
-                        if 'customer' in table.lower():
-                            customer_source = table
-                            break
-
-                query = f"SELECT * FROM [{customer_source}]"
-                raw_extraction['customer_raw'] = pd.read_sql(query, legacy_connection)
-                print(f"  ✅ Raw customer data: {len(raw_extraction['customer_raw'])} records")
-                print(f"    Attributes: {list(raw_extraction['customer_raw'].columns)}")
-            except Exception as e:
-                print(f"  ❌ Customer extraction error: {e}")
-                raw_extraction['customer_raw'] = pd.DataFrame()
+        if self.dry_run:
+            logger.info(f"  🧪 Dry run: {len(deleted_orders)} orders deleted at source not removed")
+            return
 
-            try:
-                print("  Extracting employee data (raw)...")
-                employee_source = 'Employees'
-                if employee_source not in table_catalog:
-                    for table in table_catalog:
-                        if 'employee' in table.lower():
-                            employee_source = table
-                            break
-
-                query = f"SELECT * FROM [{employee_source}]"
-                raw_extraction['employee_raw'] = pd.read_sql(query, legacy_connection)
-                print(f"  ✅ Raw employee data: {len(raw_extraction['employee_raw'])} records")
-            except Exception as e:
-                print(f"  ❌ Employee extraction error: {e}")
-                raw_extraction['employee_raw'] = pd.DataFrame()
+        cursor = self.warehouse_connection.cursor()
+        removed = 0
+        for batch in key_batches(deleted_orders):
+            cursor.execute(FACT_SOURCE_DELETE_QUERY.format(keys=', '.join('?' * len(batch))), 'SQL', *batch)
+            removed += cursor.rowcount
+        self.warehouse_connection.commit()
+        cursor.close()
+        logger.info(f"  🗑️  {removed} facts of orders deleted at source removed")
+
+    def _save_sync_versions(self, stages):
+        """Advance the sync version of each change-tracked table whose loading stage ran"""
+        versions = [(version, table_name, table_name, version)
+                    for table_name, version in self.pending_sync_versions.items()
+                    if CHANGE_TRACKED_TABLES[table_name][2] in stages]
+        self.pending_sync_versions = {}
+        if not versions or self.dry_run:
+            return
 
-            try:
-                print("  Extracting order data (raw)...")
-                order_source = 'Orders'
-                if order_source not in table_catalog:
-                    for table in table_catalog:
-                        if 'order' in table.lower() and 'detail' not in table.lower():
-                            order_source = table
-                            break
-
-                query = f"SELECT * FROM [{order_source}]"
-                raw_extraction['order_raw'] = pd.read_sql(query, legacy_connection)
-                print(f"  ✅ Raw order data: {len(raw_extraction['order_raw'])} records")
-            except Exception as e:
-                print(f"  ❌ Order extraction error: {e}")
-                raw_extraction['order_raw'] = pd.DataFrame()
+        cursor = self.warehouse_connection.cursor()
+        cursor.executemany(SYNC_VERSION_SAVE_QUERY, versions)
+        self.warehouse_connection.commit()
+        cursor.close()
+        logger.info(f"  🔖 Source synced to version {versions[0][0]} for {', '.join(version[1] for version in versions)}")
 
-            try:
-                print("  Extracting order detail data (raw)...")
-                detail_source = 'Order Details'
-                if detail_source not in table_catalog:
-                    for table in table_catalog:
-                        if 'order detail' in table.lower() or 'order_details' in table.lower():
-                            detail_source = table
-                            break
-
-                query = f"SELECT * FROM [{detail_source}]"
-                raw_extraction['order_detail_raw'] = pd.read_sql(query, legacy_connection)
-                print(f"  ✅ Raw order detail data: {len(raw_extraction['order_detail_raw'])} records")
-            except Exception as e:
-                print(f"  ⚠️  Order detail extraction error: {e}")
-                raw_extraction['order_detail_raw'] = pd.DataFrame()
+    def _legacy_source(self):
+        """Shared Access adapter: one connection and one table catalog per ETL instance"""
+        if self.legacy_source is None:
+            from legacy_source import LegacySourceAdapter
+
+            self.legacy_source = LegacySourceAdapter(DatabaseConfig.ACCESS_DB_PATH)
+        return self.legacy_source
+
+    def acquire_legacy_system_data(self):
+        """Extract raw data from legacy system without transformation"""
+        if not DatabaseConfig.ACCESS_DB_PATH:
+            logger.info("\nℹ️  Legacy system path not configured")
+            return {}
+
+        logger.info("\n📥 LEGACY SYSTEM DATA EXTRACTION (RAW)")
+        logger.info("-" * 30)
+
+        legacy_tables = [
+            ('customer_raw', 'customer', 'Customers',
+             lambda name: 'customer' in name, list(LEGACY_CUSTOMER_ATTRIBUTES)),
+            ('employee_raw', 'employee', 'Employees',
+             lambda name: 'employee' in name, list(LEGACY_EMPLOYEE_ATTRIBUTES)),
+            ('order_raw', 'order', 'Orders',
+             lambda name: 'order' in name and 'detail' not in name, list(LEGACY_ORDER_ATTRIBUTES)),
+            ('order_detail_raw', 'order detail', 'Order Details',
+             lambda name: 'order detail' in name or 'order_details' in name, LEGACY_ORDER_DETAIL_ATTRIBUTES),
+        ]
+
+        try:
+            legacy_source = self._legacy_source()
+            logger.info(f"Legacy system tables: {legacy_source.table_catalog()}")
 
-            legacy_connection.close()
+            raw_extraction = {}
+            for dataset_name, label, preferred_table, matcher, projection in legacy_tables:
+                try:
+                    logger.info(f"  Extracting {label} data (raw)...")
+                    raw_extraction[dataset_name] = legacy_source.extract(preferred_table, matcher, projection)
+                    logger.info(f"  ✅ Raw {label} data: {len(raw_extraction[dataset_name])} records")
+                    logger.debug(f"    Attributes: {list(raw_extraction[dataset_name].columns)}")
+                except Exception as e:
+                    logger.error(f"  ❌ {label.capitalize()} extraction error: {e}")
+                    raw_extraction[dataset_name] = pd.DataFrame()
 
             data_present = False
             for key, dataset in raw_extraction.items():
@@ -504,39 +815,79 @@ class etl:
                     break
 
             if not data_present:
-                print("  ℹ️  No data extracted from legacy system")
+                logger.info("  ℹ️  No data extracted from legacy system")
 
+            self._legacy_extraction['Access'] = raw_extraction
+            self._legacy_mapping = None
             return raw_extraction
 
         except Exception as e:
-            print(f"  ❌ Legacy system access error: {e}")
+            logger.error(f"  ❌ Legacy system access error: {e}")
+            return {}
+
+
+    def acquire_excel_data(self, directory=EXCEL_DIRECTORY):
+        """Read the Excel exports in the legacy layout, mapping lookup display values back to IDs"""
+        logger.info("\n📥 EXCEL WORKBOOK EXTRACTION (RAW)")
+        logger.info("-" * 30)
+
+        def read_workbook(workbook_name, columns):
+            return pd.read_excel(os.path.join(directory, f"{workbook_name}.xlsx"), usecols=lambda column: column in columns)
+
+        try:
+            customers = read_workbook('Customers', LEGACY_CUSTOMER_ATTRIBUTES)
+            employees = read_workbook('Employees', LEGACY_EMPLOYEE_ATTRIBUTES)
+            orders = read_workbook('Orders', list(LEGACY_ORDER_ATTRIBUTES) + ['Ship Via'])
+            order_details = read_workbook('Order Details', LEGACY_ORDER_DETAIL_ATTRIBUTES)
+            shippers = read_workbook('Shippers', ['ID', 'Company'])
+
+            # The workbooks carry company and personnel names where Access stores foreign keys
+            customer_ids = customers.drop_duplicates('Company').set_index('Company')['ID']
+            employee_names = employees['First Name'].astype(str) + ' ' + employees['Last Name'].astype(str)
+            employee_ids = pd.Series(employees['ID'].to_numpy(), index=employee_names)
+            employee_ids = employee_ids[~employee_ids.index.duplicated()]
+            shipper_ids = shippers.drop_duplicates('Company').set_index('Company')['ID']
+
+            orders['Customer'] = orders['Customer'].map(customer_ids)
+            orders['Employee'] = orders['Employee'].map(employee_ids)
+            orders['ShipVia'] = orders.pop('Ship Via').map(shipper_ids)
+
+            line_values = order_details['Quantity'] * order_details['Unit Price'] * (1 - order_details['Discount'])
+            order_values = line_values.groupby(order_details['Order ID']).sum()
+            orders['TransactionValue'] = orders['Order ID'].map(order_values).fillna(0)
+
+            excel_extraction = {
+                'customer_raw': customers,
+                'employee_raw': employees,
+                'order_raw': orders,
+                'order_detail_raw': order_details
+            }
+            for dataset_name, dataset in excel_extraction.items():
+                logger.info(f"  ✅ {dataset_name}: {len(dataset)} records")
+
+            # Order IDs are already mapped above; the workbook IDs still back the name fallback
+            self._legacy_extraction['Excel'] = excel_extraction
+            self._legacy_mapping = None
+            return excel_extraction
+
+        except Exception as e:
+            logger.error(f"  ❌ Excel extraction error: {e}")
             return {}
 
 
     # DATA TRANSFORMATION METHODS
     def process_customer_dimension(self, customer_dataset, source_identifier='SQL'):
-        print(f"\n👥 CUSTOMER DIMENSION PROCESSING ({source_identifier})")
-        print("-" * 30)
+        logger.info(f"\n👥 CUSTOMER DIMENSION PROCESSING ({source_identifier})")
+        logger.info("-" * 30)
 
         if customer_dataset.empty:
-            print("  ⚠️  Customer dataset empty")
+            logger.warning("  ⚠️  Customer dataset empty")
             return pd.DataFrame()
 
         processed_customers = customer_dataset.copy()
 
-        if source_identifier == 'Access':
-            attribute_mapping = {
-                'ID': 'CustomerID',
-                'Company': 'CompanyName',
-                'Last Name': 'LastName',
-                'First Name': 'FirstName',
-                'Business Phone': 'Phone',
-                'Address': 'Address',
-                'City': 'City',
-                'State/Province': 'Region',
-                'ZIP/Postal Code': 'PostalCode',
-                'Country/Region': 'Country'
-            }
+        if source_identifier in LEGACY_LAYOUT_SOURCES:
+            attribute_mapping = LEGACY_CUSTOMER_ATTRIBUTES
 
             for legacy_attribute, standard_attribute in attribute_mapping.items():
                 if legacy_attribute in processed_customers.columns:
@@ -578,7 +929,7 @@ class etl:
 
         processed_customers['SourceSystem'] = source_identifier
 
-        if source_identifier == 'Access':
+        if source_identifier in LEGACY_LAYOUT_SOURCES:
             if 'CustomerID' in processed_customers.columns:
                 processed_customers['CustomerID'] = pd.to_numeric(processed_customers['CustomerID'], errors='coerce')
                 processed_customers['CustomerID'] = 'LEG-' + processed_customers['CustomerID'].fillna(0).astype(int).astype(str)
@@ -588,7 +939,7 @@ class etl:
             processed_customers = processed_customers[processed_customers['CustomerID'].notna()]
             filtered_records = len(processed_customers)
             if filtered_records < initial_records:
-                print(f"  ⚠️  {initial_records - filtered_records} records filtered (missing CustomerID)")
+                logger.warning(f"  ⚠️  {initial_records - filtered_records} records filtered (missing CustomerID)")
 
         if 'Region' in processed_customers.columns:
             processed_customers['Region'] = processed_customers['Region'].fillna('Unknown')
@@ -605,32 +956,23 @@ class etl:
         if available_attributes:
             processed_customers = processed_customers[available_attributes + ['SourceSystem']]
 
-        print(f"  ✅ {len(processed_customers)} customers processed")
+        processed_customers = self._attach_row_hashes(processed_customers, DIMENSION_LOAD_SPECS['DimCustomer'])
+
+        logger.info(f"  ✅ {len(processed_customers)} customers processed")
         return processed_customers
 
     def process_employee_dimension(self, employee_dataset, source_identifier='SQL'):
-        print(f"\n👨‍💼 EMPLOYEE DIMENSION PROCESSING ({source_identifier})")
-        print("-" * 30)
+        logger.info(f"\n👨‍💼 EMPLOYEE DIMENSION PROCESSING ({source_identifier})")
+        logger.info("-" * 30)
 
         if employee_dataset.empty:
-            print("  ⚠️  Employee dataset empty")
+            logger.warning("  ⚠️  Employee dataset empty")
             return pd.DataFrame()
 
         processed_employees = employee_dataset.copy()
 
-        if source_identifier == 'Access':
-            attribute_mapping = {
-                'ID': 'EmployeeID',
-                'Last Name': 'LastName',
-                'First Name': 'FirstName',
-                'Job Title': 'Title',
-                'Business Phone': 'HomePhone',
-                'Address': 'Address',
-                'City': 'City',
-                'State/Province': 'Region',
-                'ZIP/Postal Code': 'PostalCode',
-                'Country/Region': 'Country'
-            }
+        if source_identifier in LEGACY_LAYOUT_SOURCES:
+            attribute_mapping = LEGACY_EMPLOYEE_ATTRIBUTES
 
             for legacy_attribute, standard_attribute in attribute_mapping.items():
                 if legacy_attribute in processed_employees.columns:
@@ -679,7 +1021,7 @@ class etl:
 
         processed_employees['SourceSystem'] = source_identifier
 
-        if source_identifier == 'Access':
+        if source_identifier in LEGACY_LAYOUT_SOURCES:
             if 'EmployeeID' in processed_employees.columns:
                 processed_employees['EmployeeID'] = pd.to_numeric(processed_employees['EmployeeID'], errors='coerce')
                 processed_employees['EmployeeID'] = 2000 + processed_employees['EmployeeID'].fillna(0).astype(int)
@@ -689,7 +1031,7 @@ class etl:
             processed_employees = processed_employees[processed_employees['EmployeeID'].notna()]
             filtered_records = len(processed_employees)
             if filtered_records < initial_records:
-                print(f"  ⚠️  {initial_records - filtered_records} records filtered (missing EmployeeID)")
+                logger.warning(f"  ⚠️  {initial_records - filtered_records} records filtered (missing EmployeeID)")
 
         temporal_attributes = ['BirthDate', 'HireDate']
         for attribute in temporal_attributes:
@@ -711,6 +1053,9 @@ class etl:
 
         if 'ReportsTo' in processed_employees.columns:
             processed_employees['ReportsTo'] = pd.to_numeric(processed_employees['ReportsTo'], errors='coerce')
+            if source_identifier in LEGACY_LAYOUT_SOURCES:
+                # Same offset as the legacy EmployeeID, so managers resolve within the source
+                processed_employees['ReportsTo'] = processed_employees['ReportsTo'] + 2000
 
         for attribute in processed_employees.columns:
             if processed_employees[attribute].dtype == 'object':
@@ -720,43 +1065,87 @@ class etl:
         if available_attributes:
             processed_employees = processed_employees[available_attributes + ['SourceSystem']]
 
-        print(f"  ✅ {len(processed_employees)} employees processed")
+        processed_employees = self._attach_row_hashes(processed_employees, DIMENSION_LOAD_SPECS['DimEmployee'])
+
+        # Management chains resolved once here, so rollups never recurse at query time
+        hierarchy, orphans, cycle_members = employee_hierarchy_closure(processed_employees)
+        if len(orphans):
+            logger.warning(f"  ⚠️  {len(orphans)} employees report to an unknown manager, treated as top level")
+        if len(cycle_members):
+            logger.warning(f"  ⚠️  Reporting cycle among employees {', '.join(str(member) for member in cycle_members)}, "
+                           f"treated as top level")
+        self.employee_hierarchies[source_identifier] = hierarchy
+
+        logger.info(f"  ✅ {len(processed_employees)} employees processed, "
+                    f"{len(hierarchy) - len(processed_employees)} reporting relationships")
         return processed_employees
 
-    def process_order_facts(self, order_dataset, source_identifier='SQL'):
-        print(f"\n📦 ORDER FACTS PROCESSING ({source_identifier})")
-        print("-" * 30)
+    @staticmethod
+    def _attach_row_hashes(processed_dimension, spec):
+        """Convert to warehouse values and add RowHash, so loads only diff compact hashes"""
+        if processed_dimension.empty or spec['business_key'] not in processed_dimension.columns:
+            return processed_dimension
+        load_frame = dimension_load_frame(processed_dimension, spec)
+        load_frame['RowHash'] = dimension_row_hashes(load_frame, spec)
+        return load_frame
+
+    def process_order_facts(self, order_dataset, source_identifier='SQL', workers=None):
+        logger.info(f"\n📦 ORDER FACTS PROCESSING ({source_identifier})")
+        logger.info("-" * 30)
 
         if order_dataset.empty:
-            print("  ⚠️  Order dataset empty")
+            logger.warning("  ⚠️  Order dataset empty")
             return pd.DataFrame()
 
-        processed_orders = order_dataset.copy()
+        if workers is None:
+            workers = self.transform_workers
 
-        if source_identifier == 'Access' and 'TransactionValue' not in processed_orders.columns:
-            print("  ℹ️  Calculating transaction values from order details...")
+        if workers > 1 and len(order_dataset) >= PARALLEL_TRANSFORM_MIN_ROWS:
+            processed_orders = self._transform_order_facts_partitioned(order_dataset, source_identifier, workers)
+        else:
+            processed_orders = self._transform_order_facts(order_dataset.copy(), source_identifier)
 
-        if source_identifier == 'Access':
-            attribute_mapping = {
-                'Order ID': 'OrderID',
-                'ID': 'OrderID',
-                'Customer': 'CustomerID',
-                'Employee': 'EmployeeID',
-                'Order Date': 'OrderDate',
-                'Required Date': 'RequiredDate',
-                'Shipped Date': 'ShippedDate',
-                'Shipping Fee': 'Freight',
-                'Ship Fee': 'Freight',
-                'Ship Name': 'ShipName',
-                'Ship Address': 'ShipAddress',
-                'Ship City': 'ShipCity',
-                'Ship State/Province': 'ShipRegion',
-                'Ship Region': 'ShipRegion',
-                'Ship ZIP/Postal Code': 'ShipPostalCode',
-                'Ship Postal Code': 'ShipPostalCode',
-                'Ship Country/Region': 'ShipCountry',
-                'Ship Country': 'ShipCountry'
-            }
+        logger.info(f"  ✅ {len(processed_orders)} orders processed")
+
+        self.quality.validate(processed_orders, ORDER_SOURCE_RULES, f"orders_{source_identifier}")
+
+        return processed_orders
+
+    def _transform_order_facts_partitioned(self, order_dataset, source_identifier, workers):
+        """Run the order transform on contiguous partitions in worker processes.
+
+        Partitions are reassembled in their original order, and the object-to-string
+        pass is repeated on the merged frame so columns whose dtype diverged between
+        partitions come out exactly as the serial transform produces them.
+        """
+        boundaries = np.linspace(0, len(order_dataset), workers + 1, dtype=int)
+        partitions = [
+            order_dataset.iloc[start:end]
+            for start, end in zip(boundaries[:-1], boundaries[1:])
+            if end > start
+        ]
+        logger.info(f"  ⚙️  Transforming {len(order_dataset):,} orders in {len(partitions)} partitions ({workers} workers)")
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            processed_partitions = list(pool.map(
+                transform_order_partition, partitions, [source_identifier] * len(partitions)
+            ))
+
+        processed_orders = pd.concat(processed_partitions)
+        for attribute in processed_orders.columns:
+            if processed_orders[attribute].dtype == 'object':
+                processed_orders[attribute] = processed_orders[attribute].astype(str)
+
+        return processed_orders
+
+    @staticmethod
+    def _transform_order_facts(processed_orders, source_identifier):
+        """Order fact transformation proper; free of instance state so worker processes can run it"""
+        if source_identifier in LEGACY_LAYOUT_SOURCES and 'TransactionValue' not in processed_orders.columns:
+            logger.info("  ℹ️  Calculating transaction values from order details...")
+
+        if source_identifier in LEGACY_LAYOUT_SOURCES:
+            attribute_mapping = LEGACY_ORDER_ATTRIBUTES
 
             for legacy_attribute, standard_attribute in attribute_mapping.items():
                 if legacy_attribute in processed_orders.columns:
@@ -819,7 +1208,7 @@ class etl:
 
         processed_orders['SourceSystem'] = source_identifier
 
-        if source_identifier == 'Access':
+        if source_identifier in LEGACY_LAYOUT_SOURCES:
             if 'CustomerID' in processed_orders.columns:
                 try:
                     processed_orders['CustomerID'] = pd.to_numeric(processed_orders['CustomerID'], errors='coerce')
@@ -828,15 +1217,14 @@ class etl:
                     valid_customers = ~invalid_customers
 
                     if invalid_customers.any():
-                        print(f"  ⚠️  Found {invalid_customers.sum()} legacy orders with invalid CustomerID")
-                        processed_orders.loc[invalid_customers, 'CustomerID'] = None
+                        logger.warning(f"  ⚠️  Found {invalid_customers.sum()} legacy orders with invalid CustomerID")
 
-                    if valid_customers.any():
-                        processed_orders.loc[valid_customers, 'CustomerID'] = 'LEG-' + processed_orders.loc[
-                            valid_customers, 'CustomerID'].astype(int).astype(str)
+                    # Built as a whole column: writing strings into the numeric column in place fails on newer pandas
+                    legacy_customer_ids = 'LEG-' + processed_orders['CustomerID'].astype('Int64').astype(str)
+                    processed_orders['CustomerID'] = legacy_customer_ids.astype(object).where(valid_customers, None)
 
                 except Exception as e:
-                    print(f"  ⚠️  CustomerID processing issue: {e}")
+                    logger.warning(f"  ⚠️  CustomerID processing issue: {e}")
                     pass
 
             if 'EmployeeID' in processed_orders.columns:
@@ -847,7 +1235,7 @@ class etl:
                     valid_employees = ~invalid_employees
 
                     if invalid_employees.any():
-                        print(f"  ⚠️  Found {invalid_employees.sum()} legacy orders with invalid EmployeeID")
+                        logger.warning(f"  ⚠️  Found {invalid_employees.sum()} legacy orders with invalid EmployeeID")
                         processed_orders.loc[invalid_employees, 'EmployeeID'] = None
 
                     if valid_employees.any():
@@ -855,24 +1243,9 @@ class etl:
                             valid_employees, 'EmployeeID'].astype(int)
 
                 except Exception as e:
-                    print(f"  ⚠️  EmployeeID processing issue: {e}")
+                    logger.warning(f"  ⚠️  EmployeeID processing issue: {e}")
                     pass
 
-            if 'CustomerID' in processed_orders.columns and 'EmployeeID' in processed_orders.columns:
-                issue_records = processed_orders[
-                    (processed_orders['CustomerID'].isna()) |
-                    (processed_orders['EmployeeID'].isna()) |
-                    (processed_orders['CustomerID'] == 'LEG-0') |
-                    (processed_orders['EmployeeID'] == 2000)
-                    ]
-
-                if not issue_records.empty:
-                    print(f"  ⚠️  Sample problematic records:")
-                    for idx, record in issue_records.head().iterrows():
-                        print(f"    Order {record.get('OrderID', 'N/A')}: "
-                              f"Customer={record.get('CustomerID', 'N/A')}, "
-                              f"Employee={record.get('EmployeeID', 'N/A')}")
-
         if 'Freight' in processed_orders.columns:
             processed_orders['Freight'] = pd.to_numeric(processed_orders['Freight'], errors='coerce').fillna(0)
         if 'TransactionValue' in processed_orders.columns:
@@ -889,471 +1262,1096 @@ class etl:
         if available_attributes:
             processed_orders = processed_orders[available_attributes]
 
-        print(f"  ✅ {len(processed_orders)} orders processed")
-
-        if source_identifier == 'Access':
-            incomplete_records = processed_orders[
-                (processed_orders['CustomerID'].isna()) |
-                (processed_orders['EmployeeID'].isna())
-                ].shape[0]
-            if incomplete_records > 0:
-                print(f"  ℹ️  {incomplete_records} legacy orders have incomplete references")
-
         return processed_orders
 
 
     # DATA LOADING METHODS
     def load_dimension_tables(self, customer_dimension, employee_dimension):
-        print("\n📤 DIMENSION TABLE POPULATION")
-        print("-" * 30)
+        """Load the customer and employee dimensions; False when any part of them failed to load"""
+        logger.info("\n📤 DIMENSION TABLE POPULATION")
+        logger.info("-" * 30)
 
         if self.warehouse_connection is None:
-            print("  ❌ Warehouse connection unavailable")
-            return
+            logger.error("  ❌ Warehouse connection unavailable")
+            return False
 
-        self._verify_customer_dimension_structure()
-        self._verify_employee_dimension_structure()
+        self.ensure_warehouse_schema()
+        loaded = True
 
-        if not customer_dimension.empty:
-            print("  📋 Populating customer dimension...")
-            try:
-                existing_customer_query = "SELECT CustomerID, SourceSystem FROM DimCustomer"
-                existing_customers = pd.read_sql(existing_customer_query, self.warehouse_connection)
+        # Customer and employee addresses join the ship-to locations in DimGeography
+        try:
+            dimension_locations = [normalize_geography(dimension) for dimension in [customer_dimension, employee_dimension]
+                                   if not dimension.empty]
+            if dimension_locations:
+                self._geography_keys(pd.concat(dimension_locations, ignore_index=True))
+        except Exception as e:
+            logger.error(f"    ❌ Geography dimension population error: {e}")
+            loaded = False
 
-                if not existing_customers.empty:
-                    customer_dimension['composite_identifier'] = customer_dimension['CustomerID'].astype(str) + '_' + customer_dimension['SourceSystem'].astype(str)
-                    existing_customers['composite_identifier'] = existing_customers['CustomerID'].astype(str) + '_' + existing_customers['SourceSystem'].astype(str)
+        for table_name, dimension, label in [('DimCustomer', customer_dimension, 'customer'),
+                                             ('DimEmployee', employee_dimension, 'employee')]:
+            if dimension.empty:
+                logger.info(f"  ℹ️  No {label} data to load")
+                continue
 
-                    new_customers = customer_dimension[
-                        ~customer_dimension['composite_identifier'].isin(existing_customers['composite_identifier'])]
-                    customer_dimension = new_customers.drop('composite_identifier', axis=1, errors='ignore')
+            logger.info(f"  📋 Populating {label} dimension...")
+            try:
+                self._load_dimension(table_name, dimension, label)
+            except Exception as e:
+                logger.error(f"    ❌ {label.capitalize()} dimension population error: {e}")
+                loaded = False
 
-                if not customer_dimension.empty:
-                    cursor = self.warehouse_connection.cursor()
-                    insertion_count = 0
+        if self.employee_hierarchies:
+            logger.info("  📋 Populating employee hierarchy bridge...")
+            try:
+                self._load_employee_hierarchy()
+            except Exception as e:
+                logger.error(f"    ❌ Employee hierarchy population error: {e}")
+                loaded = False
 
-                    for _, record in customer_dimension.iterrows():
-                        try:
-                            customer_identifier = str(record.get('CustomerID', '')) if pd.notna(record.get('CustomerID')) else ''
-
-                            if not customer_identifier:
-                                continue
-
-                            cursor.execute("""
-                                INSERT INTO DimCustomer (CustomerID, CompanyName, ContactName, ContactTitle, 
-                                Address, City, Region, PostalCode, Country, Phone, SourceSystem)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
-                                           customer_identifier,
-                                           str(record.get('CompanyName', '')) if pd.notna(record.get('CompanyName')) else '',
-                                           str(record.get('ContactName', '')) if pd.notna(record.get('ContactName')) else '',
-                                           str(record.get('ContactTitle', '')) if pd.notna(record.get('ContactTitle')) else '',
-                                           str(record.get('Address', '')) if pd.notna(record.get('Address')) else '',
-                                           str(record.get('City', '')) if pd.notna(record.get('City')) else '',
-                                           str(record.get('Region', '')) if pd.notna(record.get('Region')) else '',
-                                           str(record.get('PostalCode', '')) if pd.notna(record.get('PostalCode')) else '',
-                                           str(record.get('Country', '')) if pd.notna(record.get('Country')) else '',
-                                           str(record.get('Phone', '')) if pd.notna(record.get('Phone')) else '',
-                                           str(record.get('SourceSystem', 'Unknown')) if pd.notna(record.get('SourceSystem')) else 'Unknown')
-
-                            insertion_count += 1
+        return loaded
 
-                        except Exception as record_error:
-                            print(f"    ⚠️  Record error {_}: {record_error}")
-                            continue
+    def _load_dimension(self, table_name, dimension, label):
+        """Insert new rows and update changed ones, detected by comparing RowHash with the warehouse"""
+        spec = DIMENSION_LOAD_SPECS[table_name]
+        surrogate_key, business_key = spec['surrogate_key'], spec['business_key']
 
-                    self.warehouse_connection.commit()
-                    cursor.close()
+        if 'RowHash' not in dimension.columns:
+            dimension = self._attach_row_hashes(dimension, spec)
+        dimension = dimension.drop_duplicates([business_key, 'SourceSystem'], keep='last')
 
-                    print(f"    ✅ {insertion_count} new customers added")
-                else:
-                    print("    ℹ️  All customer records already exist")
+        # An unmigrated warehouse may not have RowHash yet, so there is nothing to compare against
+        if self.dry_run and not self.schema.is_current():
+            logger.info(f"    🧪 Dry run: {len(dimension)} {label}s not compared, warehouse schema not migrated")
+            return
 
-            except Exception as e:
-                print(f"    ❌ Customer dimension population error: {e}")
+        # The only read on an unchanged dimension: keys and hashes
+        existing = pd.read_sql(
+            f"SELECT {surrogate_key}, {business_key}, SourceSystem, RowHash FROM {table_name}",
+            self.warehouse_connection
+        )
+        if business_key == 'CustomerID':
+            existing[business_key] = existing[business_key].astype(str)
         else:
-            print("  ℹ️  No customer data to load")
+            existing[business_key] = pd.to_numeric(existing[business_key], errors='coerce').astype('int64')
+        existing['SourceSystem'] = existing['SourceSystem'].astype(str)
+        existing = existing.rename(columns={'RowHash': 'StoredRowHash'})
 
-        if not employee_dimension.empty:
-            print("  📋 Populating employee dimension...")
-            try:
-                existing_employee_query = "SELECT EmployeeID, SourceSystem FROM DimEmployee"
-                existing_employees = pd.read_sql(existing_employee_query, self.warehouse_connection)
+        compared = dimension.merge(existing, on=[business_key, 'SourceSystem'], how='left')
+        new_rows = compared[compared[surrogate_key].isna()]
+        # Rows loaded before RowHash existed carry no hash and are refreshed once
+        changed_rows = compared[compared[surrogate_key].notna() & (compared['StoredRowHash'] != compared['RowHash']).fillna(True)]
 
-                if not existing_employees.empty:
-                    employee_dimension['composite_identifier'] = employee_dimension['EmployeeID'].astype(str) + '_' + employee_dimension['SourceSystem'].astype(str)
-                    existing_employees['composite_identifier'] = existing_employees['EmployeeID'].astype(str) + '_' + existing_employees['SourceSystem'].astype(str)
+        if new_rows.empty and changed_rows.empty:
+            logger.info(f"    ℹ️  All {label} records already exist and are unchanged")
+            return
 
-                    new_employees = employee_dimension[
-                        ~employee_dimension['composite_identifier'].isin(existing_employees['composite_identifier'])]
-                    employee_dimension = new_employees.drop('composite_identifier', axis=1, errors='ignore')
+        if self.dry_run:
+            logger.info(f"    🧪 Dry run: {len(new_rows)} new and {len(changed_rows)} changed {label}s not written")
+            return
 
-                if not employee_dimension.empty:
-                    cursor = self.warehouse_connection.cursor()
-                    insertion_count = 0
+        write_columns = [business_key] + spec['attributes'] + ['SourceSystem', 'RowHash']
+        self.schema.require_columns(table_name, write_columns + [surrogate_key])
+        cursor = self.warehouse_connection.cursor()
+        cursor.fast_executemany = True
+        try:
+            if not new_rows.empty:
+                cursor.executemany(
+                    f"INSERT INTO {table_name} ({', '.join(write_columns)}) VALUES ({', '.join('?' * len(write_columns))})",
+                    self._dimension_parameter_rows(new_rows, write_columns)
+                )
 
-                    for _, record in employee_dimension.iterrows():
-                        try:
-                            employee_identifier = int(record.get('EmployeeID', 0)) if pd.notna(record.get('EmployeeID')) else 0
-
-                            if employee_identifier == 0:
-                                continue
-
-                            supervisor_reference = record.get('ReportsTo')
-                            if pd.isna(supervisor_reference):
-                                supervisor_reference = None
-                            else:
-                                supervisor_reference = int(supervisor_reference)
-
-                            cursor.execute("""
-                                INSERT INTO DimEmployee (EmployeeID, LastName, FirstName, Title, 
-                                TitleOfCourtesy, BirthDate, HireDate, Address, City, Region, 
-                                PostalCode, Country, HomePhone, ReportsTo, SourceSystem)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
-                                           employee_identifier,
-                                           str(record.get('LastName', '')) if pd.notna(record.get('LastName')) else '',
-                                           str(record.get('FirstName', '')) if pd.notna(record.get('FirstName')) else '',
-                                           str(record.get('Title', '')) if pd.notna(record.get('Title')) else '',
-                                           str(record.get('TitleOfCourtesy', '')) if pd.notna(record.get('TitleOfCourtesy')) else '',
-                                           record.get('BirthDate') if pd.notna(record.get('BirthDate')) else None,
-                                           record.get('HireDate') if pd.notna(record.get('HireDate')) else None,
-                                           str(record.get('Address', '')) if pd.notna(record.get('Address')) else '',
-                                           str(record.get('City', '')) if pd.notna(record.get('City')) else '',
-                                           str(record.get('Region', '')) if pd.notna(record.get('Region')) else '',
-                                           str(record.get('PostalCode', '')) if pd.notna(record.get('PostalCode')) else '',
-                                           str(record.get('Country', '')) if pd.notna(record.get('Country')) else '',
-                                           str(record.get('HomePhone', '')) if pd.notna(record.get('HomePhone')) else '',
-                                           supervisor_reference,
-                                           str(record.get('SourceSystem', 'Unknown')) if pd.notna(record.get('SourceSystem')) else 'Unknown')
-
-                            insertion_count += 1
+            if not changed_rows.empty:
+                update_columns = spec['attributes'] + ['RowHash']
+                changed_rows = changed_rows.assign(**{surrogate_key: changed_rows[surrogate_key].astype('int64')})
+                cursor.executemany(
+                    f"UPDATE {table_name} SET {', '.join(f'{column} = ?' for column in update_columns)} "
+                    f"WHERE {surrogate_key} = ?",
+                    self._dimension_parameter_rows(changed_rows, update_columns + [surrogate_key])
+                )
 
-                        except Exception as record_error:
-                            print(f"    ⚠️  Record error {_}: {record_error}")
-                            continue
+            self.warehouse_connection.commit()
+        except Exception:
+            self.warehouse_connection.rollback()
+            raise
+        finally:
+            cursor.close()
 
-                    self.warehouse_connection.commit()
-                    cursor.close()
+        logger.info(f"    ✅ {len(new_rows)} new {label}s added, {len(changed_rows)} changed {label}s updated")
 
-                    print(f"    ✅ {insertion_count} new employees added")
-                else:
-                    print("    ℹ️  All employee records already exist")
+    def _load_employee_hierarchy(self):
+        """Bulk-load the ReportsTo closures computed during the employee transforms, keyed by EmployeeKey"""
+        hierarchies = [hierarchy.assign(SourceSystem=source_identifier)
+                       for source_identifier, hierarchy in self.employee_hierarchies.items() if not hierarchy.empty]
+        if not hierarchies:
+            return
+        hierarchy = pd.concat(hierarchies, ignore_index=True)
 
-            except Exception as e:
-                print(f"    ❌ Employee dimension population error: {e}")
-        else:
-            print("  ℹ️  No employee data to load")
+        if self.dry_run:
+            logger.info(f"    🧪 Dry run: {len(hierarchy)} hierarchy pairs not written")
+            return
 
-    def load_fact_tables(self, order_facts):
-        print("\n📤 FACT TABLE POPULATION")
-        print("-" * 30)
+        employee_keys = pd.read_sql("SELECT EmployeeKey, EmployeeID, SourceSystem FROM DimEmployee", self.warehouse_connection)
+        employee_keys['EmployeeID'] = pd.to_numeric(employee_keys['EmployeeID'], errors='coerce').astype('Int64')
+        employee_by_id = employee_keys.drop_duplicates(['SourceSystem', 'EmployeeID']).set_index(
+            ['SourceSystem', 'EmployeeID']
+        )['EmployeeKey']
+        for role in ['Ancestor', 'Descendant']:
+            lookup = pd.MultiIndex.from_arrays([hierarchy['SourceSystem'], hierarchy[f'{role}ID'].astype('Int64')])
+            hierarchy[f'{role}Key'] = employee_by_id.reindex(lookup).to_numpy()
+
+        # Employees whose dimension row failed to load have no key and drop out
+        hierarchy = hierarchy.dropna(subset=['AncestorKey', 'DescendantKey'])
+        bridge_columns = ['AncestorKey', 'DescendantKey', 'Depth']
+        hierarchy = hierarchy.astype({column: 'int64' for column in bridge_columns})
+        self.schema.require_columns('BridgeEmployeeHierarchy', bridge_columns)
+
+        removed, added = self._staged_merge(
+            HIERARCHY_STAGING_CREATE_QUERY, HIERARCHY_STAGING_CLEAR_QUERY, HIERARCHY_STAGE_QUERY,
+            self._dimension_parameter_rows(hierarchy, bridge_columns + ['SourceSystem']),
+            [HIERARCHY_PRUNE_QUERY, HIERARCHY_MERGE_QUERY]
+        )
+
+        logger.info(f"    ✅ {len(hierarchy)} hierarchy pairs: {added} added, {removed} removed")
+
+    @staticmethod
+    def _dimension_parameter_rows(rows, columns):
+        """Parameter tuples with None for missing values and plain Python scalars"""
+        parameter_columns = []
+        for column in columns:
+            values = rows[column]
+            if pd.api.types.is_integer_dtype(values.dtype):
+                parameter_columns.append([None if pd.isna(value) else int(value) for value in values.astype(object)])
+            else:
+                parameter_columns.append(values.astype(object).where(values.notna(), None).tolist())
+        return list(zip(*parameter_columns))
 
-        if self.warehouse_connection is None or order_facts.empty:
-            print("  ℹ️  No fact data available")
-            return
+    def _staged_merge(self, create_query, clear_query, stage_query, rows, statements, commit=True):
+        """Bulk-copy rows into a session staging table, then run statements against it.
+
+        Returns one result per statement: the single value of a SELECT, the rowcount
+        otherwise. Any failure rolls the transaction back before re-raising, so a
+        half-applied merge is never committed by a later stage. With commit=False the
+        caller commits, together with its other work.
+        """
+        cursor = self.warehouse_connection.cursor()
+        cursor.fast_executemany = True
+        try:
+            cursor.execute(create_query)
+            cursor.execute(clear_query)
+            if rows:
+                cursor.executemany(stage_query, rows)
+
+            results = []
+            for statement in statements:
+                cursor.execute(statement)
+                results.append(cursor.fetchone()[0] if cursor.description is not None else cursor.rowcount)
+
+            if commit:
+                self.warehouse_connection.commit()
+            return results
+        except Exception:
+            self.warehouse_connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def load_fact_tables(self, order_facts, workers=None):
+        """Load order facts; False when the load or any fact row failed (quarantined orders are not failures)"""
+        logger.info("\n📤 FACT TABLE POPULATION")
+        logger.info("-" * 30)
+
+        if self.warehouse_connection is None:
+            logger.error("  ❌ Warehouse connection unavailable")
+            return False
+        if order_facts.empty:
+            logger.info("  ℹ️  No fact data available")
+            return True
 
         legacy_mapping = self.build_legacy_system_mapping()
 
-        self._verify_order_facts_structure()
+        self.ensure_warehouse_schema()
+
+        logger.info("  🔍 Intelligent reference resolution...")
+
+        try:
+            # Orders already in the warehouse are matched by the staging merge; only
+            # duplicates within this batch are dropped here, the latest state winning
+            order_facts = order_facts.drop_duplicates(['OrderID', 'SourceSystem'], keep='last')
+
+            prepared_facts = self._resolve_fact_references(order_facts, legacy_mapping)
+
+            prepared_facts, rejected_facts, _ = self.quality.validate(prepared_facts, FACT_LOAD_RULES, 'fact_orders')
+            if self.dry_run:
+                logger.info(f"  🧪 Dry run: {len(prepared_facts):,} fact records and "
+                            f"{len(rejected_facts):,} quarantined orders not written")
+                return True
+
+            self.schema.require_columns('FactOrders', FACT_LOAD_COLUMN_NAMES)
+            if not rejected_facts.empty:
+                self._quarantine_rejected_orders(rejected_facts)
+            if prepared_facts.empty:
+                logger.info("  ℹ️  No valid fact records to load")
+                return True
+
+            if workers is None:
+                workers = self.load_workers
+
+            if workers > 1 and len(prepared_facts) > self.load_batch_size:
+                insertion_count, update_count, skipped_count, error_count = self._load_fact_rows_parallel(
+                    prepared_facts, workers)
+            else:
+                metrics = self._load_fact_partition(self.warehouse_connection, self._fact_insert_rows(prepared_facts))
+                insertion_count, update_count, skipped_count, error_count = (
+                    metrics['rows'], metrics['updated'], metrics['skipped'], metrics['errors'])
+
+            flush_limited('fact_row_error', description='fact rows failed to insert')
+
+            if insertion_count == 0 and update_count == 0 and error_count == 0:
+                logger.info("  ℹ️  All fact records already loaded and up to date")
+                return True
+
+            logger.info(f"\n  ✅ {insertion_count} fact records loaded, {update_count} milestones updated, "
+                        f"{skipped_count} unchanged")
+            logger.info(f"  ℹ️  Loading summary:")
+            logger.info(f"    - Records with customer reference: {int(prepared_facts['CustomerKey'].notna().sum())}")
+            logger.info(f"    - Records with employee reference: {int(prepared_facts['EmployeeKey'].notna().sum())}")
+            if error_count > 0:
+                logger.info(f"    - Loading errors: {error_count}")
+            return error_count == 0
+
+        except Exception as e:
+            logger.exception(f"  ❌ Fact loading error: {e}")
+            return False
+
+    def _resolve_fact_references(self, order_facts, legacy_mapping):
+        """Attach the date keys, CustomerKey, EmployeeKey and ship-to GeographyKey to every order in bulk.
+
+        Both dimensions are read once and joined on (SourceSystem, business ID);
+        Access and Excel orders that miss on ID fall back to the legacy company or personnel name.
+        """
+        prepared_facts = order_facts.copy()
+        prepared_facts['OrderID'] = pd.to_numeric(prepared_facts['OrderID'], errors='coerce')
+
+        for milestone in ['OrderDate', 'RequiredDate', 'ShippedDate']:
+            milestone_dates = pd.to_datetime(prepared_facts[milestone], errors='coerce')
+            prepared_facts[milestone] = milestone_dates
+            prepared_facts[f'{milestone}Key'] = (
+                milestone_dates.dt.year * 10000 + milestone_dates.dt.month * 100 + milestone_dates.dt.day
+            ).astype('Int64')
+
+        # Legacy fallback names resolved in bulk rather than one dictionary probe per order,
+        # each source's orders against the tables that source extracted
+        legacy_customer_ids = prepared_facts['CustomerID'].astype(str).str.replace('^LEG-', '', regex=True)
+        legacy_employee_ids = (pd.to_numeric(prepared_facts['EmployeeID'], errors='coerce') - 2000).astype('Int64').astype(str)
+        prepared_facts['LegacyCustomerName'] = pd.Series(None, index=prepared_facts.index, dtype=object)
+        prepared_facts['LegacyEmployeeName'] = pd.Series(None, index=prepared_facts.index, dtype=object)
+        for source_identifier, entity_mapping in legacy_mapping.items():
+            source_rows = prepared_facts['SourceSystem'] == source_identifier
+            prepared_facts['LegacyCustomerName'] = prepared_facts['LegacyCustomerName'].mask(
+                source_rows, legacy_customer_ids.map(entity_mapping['customer_mapping'])
+            )
+            prepared_facts['LegacyEmployeeName'] = prepared_facts['LegacyEmployeeName'].mask(
+                source_rows, legacy_employee_ids.map(entity_mapping['employee_mapping'])
+            )
+
+        customer_keys = pd.read_sql(
+            "SELECT CustomerKey, CustomerID, CompanyName, SourceSystem FROM DimCustomer",
+            self.warehouse_connection
+        )
+        customer_keys['CustomerID'] = customer_keys['CustomerID'].astype(str)
+        customer_by_id = customer_keys.drop_duplicates(['SourceSystem', 'CustomerID']).set_index(
+            ['SourceSystem', 'CustomerID']
+        )['CustomerKey']
+        customer_lookup = pd.MultiIndex.from_arrays([
+            prepared_facts['SourceSystem'].astype(str), prepared_facts['CustomerID'].astype(str)
+        ])
+        prepared_facts['CustomerKey'] = customer_by_id.reindex(customer_lookup).to_numpy()
+
+        legacy_customers = customer_keys[customer_keys['SourceSystem'].isin(LEGACY_LAYOUT_SOURCES)].drop_duplicates('CompanyName')
+        customer_by_name = legacy_customers.set_index('CompanyName')['CustomerKey']
+        prepared_facts['CustomerKey'] = prepared_facts['CustomerKey'].fillna(
+            prepared_facts['LegacyCustomerName'].map(customer_by_name)
+        )
+
+        employee_keys = pd.read_sql(
+            "SELECT EmployeeKey, EmployeeID, FirstName, LastName, SourceSystem FROM DimEmployee",
+            self.warehouse_connection
+        )
+        employee_keys['EmployeeID'] = pd.to_numeric(employee_keys['EmployeeID'], errors='coerce').astype('Int64')
+        employee_by_id = employee_keys.drop_duplicates(['SourceSystem', 'EmployeeID']).set_index(
+            ['SourceSystem', 'EmployeeID']
+        )['EmployeeKey']
+        employee_lookup = pd.MultiIndex.from_arrays([
+            prepared_facts['SourceSystem'].astype(str),
+            pd.to_numeric(prepared_facts['EmployeeID'], errors='coerce').astype('Int64')
+        ])
+        prepared_facts['EmployeeKey'] = employee_by_id.reindex(employee_lookup).to_numpy()
+
+        legacy_employees = employee_keys[employee_keys['SourceSystem'].isin(LEGACY_LAYOUT_SOURCES)]
+        legacy_employee_names = legacy_employees['FirstName'].astype(str) + ' ' + legacy_employees['LastName'].astype(str)
+        employee_by_name = legacy_employees.set_index(legacy_employee_names)['EmployeeKey']
+        employee_by_name = employee_by_name[~employee_by_name.index.duplicated()]
+        prepared_facts['EmployeeKey'] = prepared_facts['EmployeeKey'].fillna(
+            prepared_facts['LegacyEmployeeName'].map(employee_by_name)
+        )
+
+        prepared_facts['CustomerKey'] = prepared_facts['CustomerKey'].astype('Int64')
+        prepared_facts['EmployeeKey'] = prepared_facts['EmployeeKey'].astype('Int64')
+        prepared_facts['GeographyKey'] = self._geography_keys(normalize_geography(prepared_facts, SHIP_TO_GEOGRAPHY))
+
+        return prepared_facts
+
+    def _geography_keys(self, locations):
+        """GeographyKey per row of a normalize_geography frame, adding unseen locations to DimGeography first"""
+        codes, distinct_locations = factorize_geographies(locations)
+
+        if not self.dry_run and not distinct_locations.empty:
+            added, = self._staged_merge(
+                GEOGRAPHY_STAGING_CREATE_QUERY, GEOGRAPHY_STAGING_CLEAR_QUERY, GEOGRAPHY_STAGE_QUERY,
+                list(distinct_locations.itertuples(index=False, name=None)), [GEOGRAPHY_MERGE_QUERY]
+            )
+            if added > 0:
+                logger.info(f"    🌍 {added} new locations added to DimGeography")
+
+        # DimGeography only exists from schema version 7: an unmigrated dry run resolves no keys
+        if self.dry_run and not self.schema.is_current():
+            return pd.Series(pd.NA, index=locations.index, dtype='Int64')
 
-        print("  🔍 Intelligent reference resolution...")
+        stored = pd.read_sql(GEOGRAPHY_KEYS_QUERY, self.warehouse_connection)
+        stored_keys = pd.Series(stored['GeographyKey'].to_numpy(), index=geography_match_index(stored.fillna('')))
+        stored_keys = stored_keys[~stored_keys.index.duplicated()]
+
+        # One lookup per distinct location, broadcast back to the rows through the codes
+        distinct_keys = stored_keys.reindex(geography_match_index(distinct_locations)).to_numpy()
+        return pd.Series(distinct_keys[codes], index=locations.index).astype('Int64')
+
+    def _quarantine_rejected_orders(self, rejected_facts):
+        """Bulk-copy rejected fact candidates, with their rule violations, to QuarantineOrders"""
+        self.ensure_warehouse_schema()
 
         try:
+            quarantine_rows = list(zip(
+                pd.to_numeric(rejected_facts['OrderID'], errors='coerce').astype('Int64').astype(object).where(
+                    rejected_facts['OrderID'].notna(), None).tolist(),
+                rejected_facts['SourceSystem'].astype(str).tolist(),
+                rejected_facts['RejectReasons'].tolist(),
+                quarantine_payloads(rejected_facts)
+            ))
+
             cursor = self.warehouse_connection.cursor()
+            cursor.fast_executemany = True
+            cursor.executemany("""
+                INSERT INTO QuarantineOrders (OrderID, SourceSystem, RejectReasons, RecordPayload)
+                VALUES (?, ?, ?, ?)
+            """, quarantine_rows)
+            self.warehouse_connection.commit()
+            cursor.close()
+            logger.info(f"  🚧 {len(quarantine_rows):,} rejected orders quarantined")
+        except Exception as e:
+            logger.warning(f"  ⚠️  Quarantine load issue: {e}")
+
+    @staticmethod
+    def _fact_insert_rows(prepared_facts):
+        """Parameter tuples in FACT_LOAD_COLUMNS order, with None in place of every missing value"""
+        def sql_values(column):
+            return column.astype(object).where(column.notna(), None).tolist()
+
+        def text_values(attribute):
+            return prepared_facts[attribute].where(prepared_facts[attribute].notna(), '').astype(str).tolist()
+
+        columns = [
+            prepared_facts['OrderID'].astype(int).tolist(),
+            sql_values(prepared_facts['CustomerKey']),
+            sql_values(prepared_facts['EmployeeKey']),
+            prepared_facts['OrderDateKey'].astype(int).tolist(),
+            sql_values(prepared_facts['OrderDate']),
+            sql_values(prepared_facts['RequiredDateKey']),
+            sql_values(prepared_facts['RequiredDate']),
+            sql_values(prepared_facts['ShippedDateKey']),
+            sql_values(prepared_facts['ShippedDate']),
+            pd.to_numeric(prepared_facts['ShipVia'], errors='coerce').fillna(0).astype(int).tolist(),
+            pd.to_numeric(prepared_facts['Freight'], errors='coerce').fillna(0.0).astype(float).tolist(),
+            text_values('ShipName'),
+            text_values('ShipAddress'),
+            sql_values(prepared_facts['GeographyKey']),
+            pd.to_numeric(prepared_facts['TransactionValue'], errors='coerce').fillna(0.0).astype(float).tolist(),
+            pd.to_numeric(prepared_facts['DeliveryStatus'], errors='coerce').fillna(0).astype(int).tolist(),
+            sql_values(pd.to_numeric(prepared_facts['DeliveryDelay'], errors='coerce').astype('Int64')),
+            prepared_facts['SourceSystem'].fillna('SQL').astype(str).tolist(),
+        ]
+        return list(zip(*columns))
 
-            existing_fact_query = "SELECT OrderID, SourceSystem FROM FactOrders"
-            existing_facts = pd.read_sql(existing_fact_query, self.warehouse_connection)
+    def _merge_staged_facts(self, cursor, fact_rows):
+        """Stage fact rows, refresh changed orders per the fact load mode and insert new orders: (inserted, updated)"""
+        cursor.execute(FACT_STAGING_CLEAR_QUERY)
+        cursor.executemany(FACT_STAGE_QUERY, fact_rows)
 
-            if not existing_facts.empty:
-                order_facts['composite_identifier'] = order_facts['OrderID'].astype(str) + '_' + order_facts['SourceSystem'].astype(str)
-                existing_facts['composite_identifier'] = existing_facts['OrderID'].astype(str) + '_' + existing_facts['SourceSystem'].astype(str)
+        updated_rows = 0
+        if self.fact_load_mode in FACT_UPDATE_QUERIES:
+            cursor.execute(FACT_UPDATE_QUERIES[self.fact_load_mode])
+            updated_rows = cursor.rowcount
 
-                new_facts = order_facts[~order_facts['composite_identifier'].isin(existing_facts['composite_identifier'])]
-                order_facts = new_facts.drop('composite_identifier', axis=1, errors='ignore')
+        cursor.execute(FACT_MERGE_QUERY)
+        return cursor.rowcount, updated_rows
 
-            if order_facts.empty:
-                print("  ℹ️  All fact records already exist")
-                return
+    def _load_fact_partition(self, connection, fact_rows, worker_label=None):
+        """Stage fact rows in fast_executemany batches and merge them, committing each batch.
 
-            prepared_facts = order_facts.copy()
-            if 'OrderDate' in prepared_facts.columns:
-                prepared_facts['OrderDate'] = pd.to_datetime(prepared_facts['OrderDate'], errors='coerce')
-                prepared_facts['OrderDateKey'] = prepared_facts['OrderDate'].dt.strftime('%Y%m%d').astype('Int64')
+        Deadlocked batches are retried with exponential backoff; any other batch
+        failure falls back to staging one row at a time so one bad record only costs itself.
+        """
+        metrics = {'worker': worker_label, 'rows': 0, 'updated': 0, 'skipped': 0, 'errors': 0, 'retries': 0, 'seconds': 0.0}
+        started = time.perf_counter()
 
-            insertion_count = 0
-            error_count = 0
+        cursor = connection.cursor()
+        cursor.fast_executemany = True
+        cursor.execute(FACT_STAGING_CREATE_QUERY)
+        connection.commit()
 
-            for idx, record in prepared_facts.iterrows():
-                try:
-                    source_system = record.get('SourceSystem', 'SQL')
-                    order_identifier = int(record.get('OrderID', 0)) if pd.notna(record.get('OrderID')) else 0
+        # 'row' mode sends one statement per order, for isolating driver or data problems
+        batch_size = self.load_batch_size if self.bulk_load_mode == 'batch' else 1
 
-                    if order_identifier == 0:
+        for batch_start in range(0, len(fact_rows), batch_size):
+            batch = fact_rows[batch_start:batch_start + batch_size]
+
+            for attempt in range(FACT_LOAD_MAX_RETRIES + 1):
+                try:
+                    inserted, updated = self._merge_staged_facts(cursor, batch)
+                    connection.commit()
+                    metrics['rows'] += inserted
+                    metrics['updated'] += updated
+                    metrics['skipped'] += len(batch) - inserted - updated
+                    break
+                except Exception as batch_error:
+                    connection.rollback()
+                    if is_deadlock_error(batch_error) and attempt < FACT_LOAD_MAX_RETRIES:
+                        metrics['retries'] += 1
+                        time.sleep(FACT_LOAD_RETRY_BACKOFF * (2 ** attempt) * (1 + random.random()))
                         continue
 
-                    order_date = record.get('OrderDate')
-                    date_key = None
-                    if pd.notna(order_date):
+                    for record in batch:
                         try:
-                            date_key = int(pd.to_datetime(order_date).strftime('%Y%m%d'))
-                        except:
-                            pass
+                            inserted, updated = self._merge_staged_facts(cursor, [record])
+                            connection.commit()
+                            metrics['rows'] += inserted
+                            metrics['updated'] += updated
+                            metrics['skipped'] += 1 - inserted - updated
+                        except Exception as record_error:
+                            connection.rollback()
+                            metrics['errors'] += 1
+                            log_limited('fact_row_error', 'WARNING', "    ⚠️  Order {} error: {:.80}", record[0], str(record_error))
+                    break
 
-                    if date_key is None:
-                        print(f"    ⚠️  Order {order_identifier} excluded: missing order date")
-                        continue
+            logger.debug("    {} fact records inserted, {} updated...", metrics['rows'], metrics['updated'])
 
-                    customer_reference = None
-                    customer_identifier = record.get('CustomerID')
-
-                    if source_system == 'SQL':
-                        if pd.notna(customer_identifier):
-                            cursor.execute("""
-                                SELECT TOP 1 CustomerKey FROM DimCustomer 
-                                WHERE CustomerID = ? AND SourceSystem = 'SQL'
-                            """, (str(customer_identifier),))
-                            reference_result = cursor.fetchone()
-                            if reference_result:
-                                customer_reference = reference_result[0]
-                            else:
-                                print(f"    ⚠️  SQL customer {customer_identifier} not located")
-
-                    elif source_system == 'Access':
-                        if pd.notna(customer_identifier):
-                            legacy_customer_identifier = f"LEG-{customer_identifier}"
-                            cursor.execute("""
-                                SELECT TOP 1 CustomerKey FROM DimCustomer 
-                                WHERE CustomerID = ? AND SourceSystem = 'Access'
-                            """, (legacy_customer_identifier,))
-                            reference_result = cursor.fetchone()
-
-                            if reference_result:
-                                customer_reference = reference_result[0]
-                            else:
-                                organization_name = legacy_mapping['customer_mapping'].get(str(customer_identifier))
-                                if organization_name:
-                                    cursor.execute("""
-                                        SELECT TOP 1 CustomerKey FROM DimCustomer 
-                                        WHERE CompanyName LIKE ? AND SourceSystem = 'Access'
-                                    """, (f"%{organization_name}%",))
-                                    reference_result = cursor.fetchone()
-                                    if reference_result:
-                                        customer_reference = reference_result[0]
-                                else:
-                                    print(f"    ⚠️  Legacy customer {customer_identifier} not located")
-
-                    employee_reference = None
-                    employee_identifier = record.get('EmployeeID')
-
-                    if source_system == 'SQL':
-                        if pd.notna(employee_identifier):
-                            try:
-                                personnel_identifier = int(employee_identifier)
-                                cursor.execute("""
-                                    SELECT TOP 1 EmployeeKey FROM DimEmployee 
-                                    WHERE EmployeeID = ? AND SourceSystem = 'SQL'
-                                """, (personnel_identifier,))
-                                reference_result = cursor.fetchone()
-                                if reference_result:
-                                    employee_reference = reference_result[0]
-                                else:
-                                    print(f"    ⚠️  SQL employee {employee_identifier} not located")
-                            except:
-                                pass
-
-                    elif source_system == 'Access':
-                        if pd.notna(employee_identifier):
-                            try:
-                                legacy_employee_identifier = 2000 + int(employee_identifier)
-                                cursor.execute("""
-                                    SELECT TOP 1 EmployeeKey FROM DimEmployee 
-                                    WHERE EmployeeID = ? AND SourceSystem = 'Access'
-                                """, (legacy_employee_identifier,))
-                                reference_result = cursor.fetchone()
-
-                                if reference_result:
-                                    employee_reference = reference_result[0]
-                                else:
-                                    personnel_name = legacy_mapping['employee_mapping'].get(str(employee_identifier))
-                                    if personnel_name:
-                                        cursor.execute("""
-                                            SELECT TOP 1 EmployeeKey FROM DimEmployee 
-                                            WHERE (FirstName + ' ' + LastName LIKE ? 
-                                                   OR LastName + ', ' + FirstName LIKE ?)
-                                            AND SourceSystem = 'Access'
-                                        """, (f"%{personnel_name}%", f"%{personnel_name}%"))
-                                        reference_result = cursor.fetchone()
-                                        if reference_result:
-                                            employee_reference = reference_result[0]
-                                    else:
-                                        print(f"    ⚠️  Legacy employee {employee_identifier} not located")
-                            except:
-                                pass
-
-                    if customer_reference is None:
-                        print(f"    ℹ️  Order {order_identifier}: Customer reference missing (ID: {customer_identifier})")
-                    if employee_reference is None:
-                        print(f"    ℹ️  Order {order_identifier}: Employee reference missing (ID: {employee_identifier})")
-
-                    cursor.execute("""
-                        INSERT INTO FactOrders (
-                            OrderID, CustomerKey, EmployeeKey, OrderDateKey,
-                            OrderDate, ShippedDate, ShipVia, Freight,
-                            ShipName, ShipAddress, ShipCity, ShipRegion,
-                            ShipPostalCode, ShipCountry, TotalAmount,
-                            DeliveryStatus, SourceSystem
-                        )
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                                   order_identifier,
-                                   customer_reference,
-                                   employee_reference,
-                                   date_key,
-                                   order_date if pd.notna(order_date) else None,
-                                   record.get('ShippedDate') if pd.notna(record.get('ShippedDate')) else None,
-                                   int(record.get('ShipVia', 0)) if pd.notna(record.get('ShipVia')) else 0,
-                                   float(record.get('Freight', 0)) if pd.notna(record.get('Freight')) else 0.0,
-                                   str(record.get('ShipName', '')) if pd.notna(record.get('ShipName')) else '',
-                                   str(record.get('ShipAddress', '')) if pd.notna(record.get('ShipAddress')) else '',
-                                   str(record.get('ShipCity', '')) if pd.notna(record.get('ShipCity')) else '',
-                                   str(record.get('ShipRegion', '')) if pd.notna(record.get('ShipRegion')) else '',
-                                   str(record.get('ShipPostalCode', '')) if pd.notna(record.get('ShipPostalCode')) else '',
-                                   str(record.get('ShipCountry', '')) if pd.notna(record.get('ShipCountry')) else '',
-                                   float(record.get('TransactionValue', 0)) if pd.notna(record.get('TransactionValue')) else 0.0,
-                                   int(record.get('DeliveryStatus', 0)) if pd.notna(record.get('DeliveryStatus')) else 0,
-                                   str(source_system)
-                                   )
-
-                    insertion_count += 1
-
-                    if insertion_count % 20 == 0:
-                        print(f"    {insertion_count} fact records inserted...")
-
-                except Exception as record_error:
-                    error_count += 1
-                    if error_count <= 10:
-                        print(f"    ⚠️  Record error {idx}: {str(record_error)[:80]}")
-                    continue
+        cursor.close()
+        metrics['seconds'] = time.perf_counter() - started
+        return metrics
+
+    def _load_fact_rows_parallel(self, prepared_facts, workers):
+        """Spread fact rows over worker threads by OrderDateKey range, one connection per worker"""
+        ordered_facts = prepared_facts.sort_values(['OrderDateKey', 'OrderID'], kind='stable')
+        boundaries = np.linspace(0, len(ordered_facts), workers + 1, dtype=int)
+        partitions = [
+            ordered_facts.iloc[start:end]
+            for start, end in zip(boundaries[:-1], boundaries[1:])
+            if end > start
+        ]
+        logger.info(f"  ⚙️  Parallel load: {len(ordered_facts):,} facts across {len(partitions)} connections")
 
-            self.warehouse_connection.commit()
+        def load_partition(worker_index, partition):
+            connection = connect_to_database(DatabaseConfig.TARGET_DATABASE)
+            if connection is None:
+                return {'worker': worker_index, 'rows': 0, 'updated': 0, 'skipped': 0, 'errors': len(partition),
+                        'retries': 0, 'seconds': 0.0}
+            try:
+                return self._load_fact_partition(connection, self._fact_insert_rows(partition), worker_index)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(partitions)) as pool:
+            worker_metrics = list(pool.map(load_partition, range(1, len(partitions) + 1), partitions))
+
+        for metrics in worker_metrics:
+            throughput = metrics['rows'] / metrics['seconds'] if metrics['seconds'] else 0
+            logger.info(f"    Worker {metrics['worker']}: {metrics['rows']:,} rows, {metrics['updated']:,} updated "
+                        f"in {metrics['seconds']:.1f}s "
+                        f"({throughput:,.0f} rows/s, {metrics['retries']} deadlock retries, {metrics['errors']} errors)")
+
+        return tuple(sum(m[metric] for m in worker_metrics) for metric in ['rows', 'updated', 'skipped', 'errors'])
+
+
+    # CUSTOMER ENTITY RESOLUTION
+    def resolve_customer_entities(self):
+        """Cross-reference customers that are one company across sources to a master CustomerKey.
+
+        Only customers new or changed since they were last resolved, and the rest of
+        their clusters, are blocked and scored; settled clusters cost one read.
+        """
+        logger.info("\n🔗 CUSTOMER ENTITY RESOLUTION")
+        logger.info("-" * 30)
+
+        if self.warehouse_connection is None:
+            logger.error("  ❌ Warehouse connection unavailable")
+            return
+
+        self.ensure_warehouse_schema()
+
+        try:
+            customers = pd.read_sql(CUSTOMER_RESOLUTION_QUERY, self.warehouse_connection)
+            xref = pd.read_sql(XREF_QUERY, self.warehouse_connection)
+            resolved, statistics = resolve_customers(customers, xref)
+
+            if resolved.empty:
+                logger.info("  ℹ️  No new or changed customers to resolve")
+                return
+
+            logger.info(f"  🔍 {statistics['pending']} new or changed customers: {statistics['pairs']} candidate pairs "
+                        f"scored, {statistics['matches']} matched")
+
+            if self.dry_run:
+                logger.info(f"  🧪 Dry run: {len(resolved)} customer cross-references not written")
+                return
+
+            self.schema.require_columns('CustomerMasterXref', XREF_COLUMNS)
+            updated, inserted = self._staged_merge(
+                XREF_STAGING_CREATE_QUERY, XREF_STAGING_CLEAR_QUERY, XREF_STAGE_QUERY,
+                self._dimension_parameter_rows(resolved, XREF_COLUMNS), [XREF_UPDATE_QUERY, XREF_MERGE_QUERY]
+            )
+
+            logger.info(f"  ✅ {inserted} customers cross-referenced, {updated} updated; "
+                        f"{statistics['clusters']} master customers span several records")
+        except Exception as e:
+            logger.exception(f"  ❌ Customer entity resolution error: {e}")
+
+    # INVENTORY SUBJECT AREA
+    def load_inventory_subject_area(self, directory=EXCEL_DIRECTORY):
+        """Load DimProduct and the inventory transaction fact, then extend the daily stock snapshot"""
+        logger.info("\n📦 INVENTORY SUBJECT AREA")
+        logger.info("-" * 30)
+
+        if self.warehouse_connection is None:
+            logger.error("  ❌ Warehouse connection unavailable")
+            return
+
+        try:
+            workbooks = read_inventory_workbooks(directory)
+            products = transform_products(workbooks['product_raw'])
+            transactions = transform_inventory_transactions(
+                workbooks['inventory_transaction_raw'], workbooks['inventory_type_raw'], workbooks['product_raw']
+            )
+            logger.info(f"  ✅ {len(products)} products, {len(transactions)} inventory transactions extracted")
+        except Exception as e:
+            logger.error(f"  ❌ Inventory extraction error: {e}")
+            return
+
+        self.ensure_warehouse_schema()
+
+        try:
+            logger.info("  📋 Populating product dimension...")
+            self._load_dimension('DimProduct', products, 'product')
+
+            if self.dry_run:
+                logger.info(f"  🧪 Dry run: {len(transactions):,} inventory transactions and the stock snapshot not written")
+                return
+
+            # Transactions and snapshot days outside the run's date window still need their DimDate rows
+            self._extend_date_dimension(transactions, ['TransactionDateKey'])
+
+            # New transactions and the snapshot days they reopen are committed together:
+            # a failed rebuild must not leave transactions the next run no longer sees as new
+            try:
+                rebuild_from_key = self._load_inventory_transactions(transactions)
+                self._extend_stock_snapshot(rebuild_from_key)
+                self.warehouse_connection.commit()
+            except Exception:
+                self.warehouse_connection.rollback()
+                raise
+        except Exception as e:
+            logger.exception(f"  ❌ Inventory loading error: {e}")
+
+    def _surrogate_keys(self, table_name):
+        """Business key -> surrogate key for a dimension in DIMENSION_LOAD_SPECS, read in one query"""
+        spec = DIMENSION_LOAD_SPECS[table_name]
+        surrogate_key, business_key = spec['surrogate_key'], spec['business_key']
+        keys = pd.read_sql(f"SELECT {surrogate_key}, {business_key} FROM {table_name}", self.warehouse_connection)
+        return keys.drop_duplicates(business_key).set_index(business_key)[surrogate_key]
+
+    def _load_inventory_transactions(self, transactions):
+        """Stage the transactions and insert the unseen ones, uncommitted; returns the earliest new TransactionDateKey"""
+        self.schema.require_columns('FactInventoryTransactions', INVENTORY_LOAD_COLUMN_NAMES)
+        transactions = transactions.assign(ProductKey=transactions['ProductID'].map(self._surrogate_keys('DimProduct')).astype('Int64'))
+
+        earliest_new_key, inserted = self._staged_merge(
+            INVENTORY_STAGING_CREATE_QUERY, INVENTORY_STAGING_CLEAR_QUERY, INVENTORY_STAGE_QUERY,
+            self._dimension_parameter_rows(transactions, INVENTORY_LOAD_COLUMN_NAMES),
+            [INVENTORY_EARLIEST_NEW_QUERY, INVENTORY_MERGE_QUERY], commit=False
+        )
+
+        logger.info(f"  ✅ {inserted} inventory transactions loaded, {len(transactions) - inserted} already present")
+        return earliest_new_key
+
+    def _extend_stock_snapshot(self, rebuild_from_key=None):
+        """Append snapshot days after the last one stored, reopening earlier days only for back-dated transactions.
+
+        Runs in the caller's transaction, which commits or rolls back the clear and the inserts together.
+        """
+        cursor = self.warehouse_connection.cursor()
+        cursor.execute(SNAPSHOT_RANGE_QUERY)
+        last_snapshot_key, first_transaction_key, last_transaction_key = cursor.fetchone()
+
+        if last_transaction_key is None:
             cursor.close()
+            logger.info("  ℹ️  No inventory transactions to snapshot")
+            return
 
-            print(f"\n  ✅ {insertion_count} fact records loaded")
-            print(f"  ℹ️  Loading summary:")
-            print(f"    - Records with customer reference: {insertion_count - error_count}")
-            print(f"    - Records with employee reference: {insertion_count - error_count}")
-            if error_count > 0:
-                print(f"    - Loading errors: {error_count}")
+        if last_snapshot_key is None:
+            start_date = dates_from_keys([first_transaction_key])[0]
+        else:
+            start_date = dates_from_keys([last_snapshot_key])[0] + pd.Timedelta(days=1)
+            if rebuild_from_key is not None:
+                start_date = min(start_date, dates_from_keys([rebuild_from_key])[0])
+        end_date = dates_from_keys([last_transaction_key])[0]
+
+        if start_date > end_date:
+            cursor.close()
+            logger.info(f"  ℹ️  Stock snapshot already current through {end_date.date()}")
+            return
+
+        start_key = int(start_date.strftime('%Y%m%d'))
+        opening_levels = pd.read_sql(SNAPSHOT_OPENING_QUERY, self.warehouse_connection, params=[start_key])
+        opening_levels = opening_levels.set_index('ProductID')['StockLevel']
+        daily_movements = pd.read_sql(DAILY_MOVEMENT_QUERY, self.warehouse_connection, params=[start_key])
+
+        snapshot = daily_stock_snapshot(daily_movements, opening_levels, start_date, end_date)
+        snapshot['ProductKey'] = snapshot['ProductID'].map(self._surrogate_keys('DimProduct')).astype('Int64')
+
+        cursor.fast_executemany = True
+        cursor.execute(SNAPSHOT_CLEAR_QUERY, start_key)
+        snapshot_rows = self._dimension_parameter_rows(snapshot, SNAPSHOT_LOAD_COLUMNS)
+        for batch_start in range(0, len(snapshot_rows), self.load_batch_size):
+            cursor.executemany(SNAPSHOT_INSERT_QUERY, snapshot_rows[batch_start:batch_start + self.load_batch_size])
+        cursor.close()
+
+        logger.info(f"  ✅ Stock snapshot: {len(snapshot):,} product-days from {start_date.date()} to {end_date.date()}"
+                    f" ({len(opening_levels)} opening levels carried forward)")
+
+
+    # PURCHASING SUBJECT AREA
+    def load_purchasing_subject_area(self, directory=EXCEL_DIRECTORY):
+        """Load DimSupplier and the purchase order line fact, keyed to DimDate and DimProduct"""
+        logger.info("\n🧾 PURCHASING SUBJECT AREA")
+        logger.info("-" * 30)
 
+        if self.warehouse_connection is None:
+            logger.error("  ❌ Warehouse connection unavailable")
+            return
+
+        try:
+            workbooks = read_purchasing_workbooks(directory)
+            suppliers = transform_suppliers(workbooks['supplier_raw'])
+            products = transform_products(workbooks['product_raw'])
+            order_lines = transform_purchase_order_lines(
+                workbooks['purchase_order_raw'], workbooks['purchase_order_line_raw'],
+                workbooks['purchase_status_raw'], workbooks['supplier_raw'], workbooks['product_raw']
+            )
+            logger.info(f"  ✅ {len(suppliers)} suppliers, {len(order_lines)} purchase order lines extracted")
         except Exception as e:
-            print(f"  ❌ Fact loading error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"  ❌ Purchasing extraction error: {e}")
+            return
+
+        self.ensure_warehouse_schema()
+
+        try:
+            # Products are shared with the inventory stage; unchanged rows cost one keys-and-hashes read
+            for table_name, dimension, label in [('DimSupplier', suppliers, 'supplier'),
+                                                 ('DimProduct', products, 'product')]:
+                logger.info(f"  📋 Populating {label} dimension...")
+                self._load_dimension(table_name, dimension, label)
+
+            if self.dry_run:
+                logger.info(f"  🧪 Dry run: {len(order_lines):,} purchase order lines not written")
+                return
+
+            # CreationDateKey references DimDate, which the dates stage only fills for the run's window
+            self._extend_date_dimension(order_lines, [f'{milestone}Key' for milestone in PURCHASE_ORDER_MILESTONES])
+            self._load_purchase_order_lines(order_lines)
+        except Exception as e:
+            logger.exception(f"  ❌ Purchasing loading error: {e}")
+
+    def _load_purchase_order_lines(self, order_lines):
+        """Resolve supplier and product keys in bulk, then update changed lines and insert new ones via staging"""
+        self.schema.require_columns('FactPurchaseOrders', PURCHASE_LOAD_COLUMN_NAMES)
+        order_lines = order_lines.assign(
+            SupplierKey=order_lines['SupplierID'].map(self._surrogate_keys('DimSupplier')).astype('Int64'),
+            ProductKey=order_lines['ProductID'].map(self._surrogate_keys('DimProduct')).astype('Int64')
+        )
+
+        unresolved = order_lines['SupplierKey'].isna() | order_lines['ProductKey'].isna()
+        if unresolved.any():
+            logger.warning(f"  ⚠️  {int(unresolved.sum())} purchase order lines without a supplier or product reference")
+
+        updated, inserted = self._staged_merge(
+            PURCHASE_STAGING_CREATE_QUERY, PURCHASE_STAGING_CLEAR_QUERY, PURCHASE_STAGE_QUERY,
+            self._dimension_parameter_rows(order_lines, PURCHASE_LOAD_COLUMN_NAMES),
+            [PURCHASE_UPDATE_QUERY, PURCHASE_MERGE_QUERY]
+        )
 
+        logger.info(f"  ✅ {inserted} purchase order lines loaded, {updated} updated, "
+                    f"{len(order_lines) - inserted - updated} unchanged")
 
     # SUMMARY REPORTING
     def generate_warehouse_summary(self):
-        print("\n📊 DATA WAREHOUSE SUMMARY REPORT")
-        print("-" * 30)
+        logger.info("\n📊 DATA WAREHOUSE SUMMARY REPORT")
+        logger.info("-" * 30)
 
         if self.warehouse_connection is None:
-            print("❌ Warehouse connection unavailable")
+            logger.error("❌ Warehouse connection unavailable")
             return
 
-        warehouse_tables = ['DimDate', 'DimCustomer', 'DimEmployee', 'FactOrders']
+        warehouse_tables = ['DimDate', 'DimCustomer', 'DimEmployee', 'FactOrders',
+                            'DimProduct', 'FactInventoryTransactions', 'FactInventorySnapshot',
+                            'DimSupplier', 'FactPurchaseOrders', 'DimGeography', 'BridgeEmployeeHierarchy',
+                            'CustomerMasterXref']
         for table in warehouse_tables:
             try:
                 cursor = self.warehouse_connection.cursor()
                 cursor.execute(f"SELECT COUNT(*) FROM {table}")
                 record_count = cursor.fetchone()[0]
                 cursor.close()
-                print(f"  {table}: {record_count} records")
+                logger.info(f"  {table}: {record_count} records")
             except Exception as e:
-                print(f"  {table}: TABLE UNAVAILABLE")
+                logger.info(f"  {table}: TABLE UNAVAILABLE")
 
 
-    def execute_full_pipeline(self):
-        print("\n" + "=" * 50)
-        print("🚀 COMPLETE DATA INTEGRATION PIPELINE")
-        print("=" * 50)
+    def export_warehouse_snapshot(self):
+        """Publish the warehouse tables as memory-mappable Arrow files for notebook and dashboard readers"""
+        logger.info("\n📦 WAREHOUSE ARROW EXPORT")
+        logger.info("-" * 30)
+
+        if self.warehouse_connection is None:
+            logger.error("  ❌ Warehouse connection unavailable")
+            return {}
+
+        if self.dry_run:
+            logger.info("  🧪 Dry run: Arrow export skipped")
+            return {}
 
         try:
-            self._verify_date_dimension_structure()
-            self._verify_customer_dimension_structure()
-            self._verify_employee_dimension_structure()
-            self._verify_order_facts_structure()
+            # pyarrow is only needed here, so pure-transform runs never pay for importing it
+            from warehouse_export import EXPORT_DIRECTORY, export_warehouse_tables
+
+            exported, failed = export_warehouse_tables(self.warehouse_connection)
+            for table, record_count in exported.items():
+                logger.info(f"  ✅ {table}: {record_count} records -> {EXPORT_DIRECTORY}/{table}.current")
+            for table, error in failed.items():
+                logger.warning(f"  ⚠️  {table}: export failed, previous version kept: {error}")
+            return exported
+        except Exception as e:
+            logger.warning(f"  ⚠️  Arrow export issue: {e}")
+            return {}
 
-            self.populate_date_dimension(1990, 2025)
+    def publish_kpi_snapshot(self):
+        """Write the dashboard's headline metrics and filter values once per load"""
+        logger.info("\n📈 KPI SNAPSHOT")
+        logger.info("-" * 30)
 
-            operational_data = self.acquire_operational_data()
+        if self.warehouse_connection is None:
+            logger.error("  ❌ Warehouse connection unavailable")
+            return None
 
-            processed_customers_sql = self.process_customer_dimension(operational_data.get('customer_data', pd.DataFrame()), 'SQL')
-            processed_employees_sql = self.process_employee_dimension(operational_data.get('employee_data', pd.DataFrame()), 'SQL')
-            processed_orders_sql = self.process_order_facts(operational_data.get('order_data', pd.DataFrame()), 'SQL')
+        if self.dry_run:
+            logger.info("  🧪 Dry run: KPI snapshot not written")
+            return None
 
-            legacy_data = self.acquire_legacy_system_data()
+        try:
+            data_version = self.reporting_cache.data_version(self.warehouse_connection)
+            snapshot = build_kpi_snapshot(self.warehouse_connection, data_version)
+            write_kpi_snapshot(snapshot)
+            totals = snapshot['totals']
+            logger.info(f"  ✅ {totals['total_orders']:,} orders, {totals['delivery_rate']:.1f}% delivered -> {KPI_SNAPSHOT_PATH}")
+            return snapshot
+        except Exception as e:
+            logger.warning(f"  ⚠️  KPI snapshot issue: {e}")
+            return None
+
+    def attach_profiler(self, profiler):
+        """Profile each pipeline stage and count SQL round trips on the instance's connections"""
+        self.profiler = profiler
+        self.source_connection = profiler.instrument(self.source_connection)
+        self.target_connection = profiler.instrument(self.target_connection)
+        self.warehouse_connection = profiler.instrument(self.warehouse_connection)
+        self.schema.connection = self.warehouse_connection
+
+    def _stage(self, stage_name):
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.stage(stage_name)
+
+    def _table_row_count(self, table_name):
+        cursor = self.warehouse_connection.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+        row_count = cursor.fetchone()[0]
+        cursor.close()
+        return row_count
+
+    def reset_warehouse_tables(self, stages):
+        """Full refresh: empty the tables the selected load stages will rebuild"""
+        tables = []
+        if 'facts' in stages or 'dimensions' in stages:
+            # Without a sync version the next CDC run re-extracts in full as its baseline
+            tables.extend(['FactOrders', 'SourceSyncVersion'])
+        if 'dimensions' in stages or 'resolution' in stages:
+            tables.append('CustomerMasterXref')
+        if 'dimensions' in stages:
+            tables.extend(['BridgeEmployeeHierarchy', 'DimCustomer', 'DimEmployee', 'DimGeography'])
+        if 'purchasing' in stages:
+            tables.append('FactPurchaseOrders')
+        if 'inventory' in stages:
+            # DimProduct is referenced by purchase order lines only the purchasing stage reloads
+            if 'purchasing' not in stages and self._table_row_count('FactPurchaseOrders') > 0:
+                raise ValueError("A full refresh of the inventory stage empties DimProduct, which FactPurchaseOrders "
+                                 "references; run it together with the purchasing stage")
+            tables.extend(['FactInventorySnapshot', 'FactInventoryTransactions', 'DimProduct'])
+        if 'purchasing' in stages:
+            tables.append('DimSupplier')
+
+        if self.dry_run:
+            logger.info(f"  🧪 Dry run: full refresh would empty {', '.join(tables)}")
+            return
 
-            if legacy_data:
-                processed_customers_legacy = self.process_customer_dimension(
-                    legacy_data.get('customer_raw', pd.DataFrame()), 'Access'
-                )
-                processed_employees_legacy = self.process_employee_dimension(
-                    legacy_data.get('employee_raw', pd.DataFrame()), 'Access'
-                )
-                processed_orders_legacy = self.process_order_facts(
-                    legacy_data.get('order_raw', pd.DataFrame()), 'Access'
-                )
+        cursor = self.warehouse_connection.cursor()
+        for table in tables:
+            cursor.execute(f"DELETE FROM {table}")
+            logger.info(f"  🧹 {table} emptied for full refresh")
+        self.warehouse_connection.commit()
+        cursor.close()
 
-                consolidated_customers = pd.concat([processed_customers_sql, processed_customers_legacy], ignore_index=True)
-                consolidated_employees = pd.concat([processed_employees_sql, processed_employees_legacy], ignore_index=True)
-                consolidated_orders = pd.concat([processed_orders_sql, processed_orders_legacy], ignore_index=True)
-            else:
-                consolidated_customers = processed_customers_sql
-                consolidated_employees = processed_employees_sql
-                consolidated_orders = processed_orders_sql
+    def execute_full_pipeline(self, stages=None, sources=None, start_date=DEFAULT_START_DATE,
+                              end_date=DEFAULT_END_DATE, refresh='incremental'):
+        stages = stages or PIPELINE_STAGES
+        sources = sources or DEFAULT_SOURCES
+        window_start = pd.Timestamp(start_date)
+        window_end = pd.Timestamp(end_date)
 
-            self.load_dimension_tables(consolidated_customers, consolidated_employees)
-            self.load_fact_tables(consolidated_orders)
+        logger.info("\n" + "=" * 50)
+        logger.info("🚀 COMPLETE DATA INTEGRATION PIPELINE")
+        logger.info("=" * 50)
+        # Re-extracted orders may have changed anywhere, not only in their milestones
+        if self.source_mode == 'cdc' and self.fact_load_mode == 'accumulating':
+            self.fact_load_mode = 'upsert'
 
-            print("\n🎯 ANALYTICAL DATA PREPARATION")
-            print("-" * 30)
+        logger.info(f"  Stages: {', '.join(stages)} | Sources: {', '.join(sources)} | "
+                    f"Window: {window_start.date()} to {window_end.date()} | Refresh: {refresh} | Source mode: {self.source_mode}"
+                    f"{' | DRY RUN' if self.dry_run else ''}")
 
-            try:
-                import os
-                if not os.path.exists('data'):
-                    os.makedirs('data')
-                consolidated_orders.to_csv('data/processed/consolidated_order_facts.csv', index=False)
-                print("  ✅ Data archived to data/consolidated_order_facts.csv")
-            except Exception as e:
-                print(f"  ⚠️  Data archiving issue: {e}")
+        try:
+            with self._stage('schema'):
+                self.ensure_warehouse_schema()
+
+            if refresh == 'full':
+                self.reset_warehouse_tables(stages)
+
+            if 'dates' in stages:
+                with self._stage('dates'):
+                    self.populate_date_dimension(window_start.year, window_end.year)
+
+            if {'extract', 'dimensions', 'facts'} & set(stages):
+                source_extractors = {
+                    'SQL': self.acquire_operational_data,
+                    'Access': self.acquire_legacy_system_data,
+                    'Excel': self.acquire_excel_data,
+                }
+                source_datasets = {
+                    'SQL': ('customer_data', 'employee_data', 'order_data'),
+                    'Access': ('customer_raw', 'employee_raw', 'order_raw'),
+                    'Excel': ('customer_raw', 'employee_raw', 'order_raw'),
+                }
+
+                processed_customers, processed_employees, processed_orders = [], [], []
+                for source_identifier in sources:
+                    with self._stage(f'extract_{source_identifier.lower()}'):
+                        source_data = source_extractors[source_identifier]()
+                    if not source_data:
+                        continue
+
+                    customer_key, employee_key, order_key = source_datasets[source_identifier]
+                    with self._stage(f'transform_{source_identifier.lower()}'):
+                        processed_customers.append(self.process_customer_dimension(
+                            source_data.get(customer_key, pd.DataFrame()), source_identifier
+                        ))
+                        processed_employees.append(self.process_employee_dimension(
+                            source_data.get(employee_key, pd.DataFrame()), source_identifier
+                        ))
+                        processed_orders.append(self.process_order_facts(
+                            source_data.get(order_key, pd.DataFrame()), source_identifier
+                        ))
+
+                consolidated_customers = pd.concat(processed_customers, ignore_index=True) if processed_customers else pd.DataFrame()
+                consolidated_employees = pd.concat(processed_employees, ignore_index=True) if processed_employees else pd.DataFrame()
+                consolidated_orders = pd.concat(processed_orders, ignore_index=True) if processed_orders else pd.DataFrame()
+
+                if not consolidated_orders.empty:
+                    order_dates = pd.to_datetime(consolidated_orders['OrderDate'], errors='coerce')
+                    in_window = order_dates.isna() | order_dates.between(window_start, window_end)
+                    if not in_window.all():
+                        logger.info(f"  ℹ️  {int((~in_window).sum())} orders outside the date window skipped")
+                    consolidated_orders = consolidated_orders[in_window]
+
+                loads_succeeded = True
+                if 'dimensions' in stages:
+                    with self._stage('dimensions'):
+                        loads_succeeded &= self.load_dimension_tables(consolidated_customers, consolidated_employees)
+                if 'facts' in stages:
+                    with self._stage('facts'):
+                        loads_succeeded &= self.load_fact_tables(consolidated_orders)
+                        if self.source_deletes:
+                            self._apply_source_deletes()
+                if loads_succeeded:
+                    self._save_sync_versions(stages)
+                elif self.pending_sync_versions:
+                    # Keep the last sync versions so the next run fetches the changes that failed to load again
+                    logger.warning("  ⚠️  Load errors: source sync versions not advanced")
+                    self.pending_sync_versions = {}
+
+                if 'extract' in stages:
+                    # A change extract holds only the changed orders and must not replace the full archive
+                    archive_name = 'changed_order_facts.csv' if self.extracted_changes else 'consolidated_order_facts.csv'
+                    archive_path = os.path.join('data', 'processed', archive_name)
+                    try:
+                        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+                        consolidated_orders.to_csv(archive_path, index=False)
+                        logger.info(f"  ✅ Data archived to {archive_path}")
+                    except Exception as e:
+                        logger.warning(f"  ⚠️  Data archiving issue: {e}")
+
+            if 'resolution' in stages:
+                with self._stage('resolution'):
+                    self.resolve_customer_entities()
+
+            if 'inventory' in stages:
+                with self._stage('inventory'):
+                    self.load_inventory_subject_area()
+
+            if 'purchasing' in stages:
+                with self._stage('purchasing'):
+                    self.load_purchasing_subject_area()
+
+            if 'aggregates' in stages:
+                logger.info("\n🎯 ANALYTICAL DATA PREPARATION")
+                logger.info("-" * 30)
+                with self._stage('aggregates'):
+                    self.prepare_reporting_dataset()
 
             self.generate_warehouse_summary()
 
-            print("\n" + "=" * 50)
-            print("🎉 DATA INTEGRATION COMPLETED SUCCESSFULLY!")
-            print("=" * 50)
+            if {'dimensions', 'facts', 'aggregates'} & set(stages):
+                with self._stage('kpis'):
+                    self.publish_kpi_snapshot()
+
+            if 'export' in stages:
+                with self._stage('export'):
+                    self.export_warehouse_snapshot()
+
+            logger.info("\n" + "=" * 50)
+            logger.info("🎉 DATA INTEGRATION COMPLETED SUCCESSFULLY!")
+            logger.info("=" * 50)
 
         except Exception as e:
-            print(f"\n❌ PIPELINE EXECUTION ERROR: {e}")
+            logger.error(f"\n❌ PIPELINE EXECUTION ERROR: {e}")
             raise
-
+        finally:
+            # The Access handle is released whether or not a stage failed
+            if self.legacy_source is not None:
+                self.legacy_source.close()
+
+
+
+def build_argument_parser():
+    argument_parser = argparse.ArgumentParser(description="Northwind data integration pipeline")
+
+    scope = argument_parser.add_argument_group("scope")
+    scope.add_argument('--stages', nargs='+', choices=PIPELINE_STAGES, default=PIPELINE_STAGES,
+                       help="pipeline stages to run (default: all)")
+    scope.add_argument('--sources', nargs='+', choices=SOURCE_SYSTEMS, default=DEFAULT_SOURCES,
+                       help="source systems to extract (default: SQL Access)")
+    scope.add_argument('--start-date', default=DEFAULT_START_DATE,
+                       help="first order date loaded, also the first DimDate year")
+    scope.add_argument('--end-date', default=DEFAULT_END_DATE,
+                       help="last order date loaded, also the last DimDate year")
+    scope.add_argument('--refresh', choices=['incremental', 'full'], default='incremental',
+                       help="incremental appends new rows; full empties the loaded tables first")
+    scope.add_argument('--fact-mode', choices=FACT_LOAD_MODES, default='accumulating',
+                       help="accumulating also refreshes milestones of loaded orders, upsert every changed column; "
+                            "insert only adds new orders")
+    scope.add_argument('--source-mode', choices=SOURCE_MODES, default='full',
+                       help="cdc re-extracts only SQL customers and orders reported by Change Tracking")
+    scope.add_argument('--change-log', default=None,
+                       help="simulated change log CSV used instead of SQL Server Change Tracking in cdc mode")
+    scope.add_argument('--dry-run', action='store_true',
+                       help="extract, transform and validate without writing to the warehouse")
+
+    performance = argument_parser.add_argument_group("performance")
+    performance.add_argument('--chunk-size', type=int, default=FACT_LOAD_BATCH_SIZE,
+                             help="fact rows per executemany batch and commit")
+    performance.add_argument('--transform-workers', type=int, default=1,
+                             help="processes for the partitioned order transform")
+    performance.add_argument('--load-workers', type=int, default=1,
+                             help="concurrent connections for the fact load")
+    performance.add_argument('--bulk-mode', choices=['batch', 'row'], default='batch',
+                             help="batch uses fast_executemany; row inserts one order per statement")
+
+    diagnostics = argument_parser.add_argument_group("diagnostics")
+    diagnostics.add_argument('--log-level', default=DEFAULT_LEVEL,
+                             choices=['TRACE', 'DEBUG', 'INFO', 'SUCCESS', 'WARNING', 'ERROR'])
+    diagnostics.add_argument('--json-logs', action='store_true', help="emit one JSON record per log message")
+    diagnostics.add_argument('--quiet', action='store_true', help="only warnings and errors")
+    diagnostics.add_argument('--profile', action='store_true',
+                             help="capture a cProfile per stage and count SQL statements")
+    diagnostics.add_argument('--profile-dir', default=PROFILE_DIRECTORY,
+                             help="directory for the per-stage .prof files")
+    diagnostics.add_argument('--profile-top', type=int, default=PROFILE_TOP_N,
+                             help="hot functions and statements listed per report")
+    return argument_parser
 
 
 # EXECUTION ENTRY POINT
 if __name__ == "__main__":
+    arguments = build_argument_parser().parse_args()
+    configure_logging(arguments.log_level, arguments.json_logs, arguments.quiet)
+
+    pipeline_profiler = None
     try:
-        print("🚀 INITIATING DATA INTEGRATION PIPELINE")
-        print("=" * 50)
+        logger.info("🚀 INITIATING DATA INTEGRATION PIPELINE")
+        logger.info("=" * 50)
 
         integration_pipeline = etl()
-        integration_pipeline.execute_full_pipeline()
+        integration_pipeline.load_batch_size = arguments.chunk_size
+        integration_pipeline.transform_workers = arguments.transform_workers
+        integration_pipeline.load_workers = arguments.load_workers
+        integration_pipeline.bulk_load_mode = arguments.bulk_mode
+        integration_pipeline.fact_load_mode = arguments.fact_mode
+        integration_pipeline.source_mode = arguments.source_mode
+        integration_pipeline.change_log_path = arguments.change_log
+        integration_pipeline.dry_run = arguments.dry_run
+        if arguments.profile:
+            pipeline_profiler = PipelineProfiler(arguments.profile_dir, arguments.profile_top)
+            integration_pipeline.attach_profiler(pipeline_profiler)
+
+        integration_pipeline.execute_full_pipeline(
+            stages=arguments.stages,
+            sources=arguments.sources,
+            start_date=arguments.start_date,
+            end_date=arguments.end_date,
+            refresh=arguments.refresh
+        )
 
     except Exception as e:
-        print(f"\n❌ EXECUTION TERMINATION: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"\n❌ EXECUTION TERMINATION: {e}")
     finally:
-        print("\n" + "=" * 50)
-        print("🏁 PIPELINE EXECUTION COMPLETE")
-        print("=" * 50)
\ No newline at end of file
+        if pipeline_profiler is not None:
+            pipeline_profiler.report()
+        logger.info("\n" + "=" * 50)
+        logger.info("🏁 PIPELINE EXECUTION COMPLETE")
+        logger.info("=" * 50)
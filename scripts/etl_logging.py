@@ -0,0 +1,65 @@
+import os
+import sys
+from collections import Counter
+
+from loguru import logger
+
+
+CONSOLE_FORMAT = "{message}"
+DEFAULT_LEVEL = os.environ.get('ETL_LOG_LEVEL', 'INFO')
+DEFAULT_JSON_OUTPUT = os.environ.get('ETL_LOG_JSON', '').lower() in ('1', 'true', 'yes')
+
+# Messages emitted per rate-limit key before the rest are only counted
+RATE_LIMIT_SHOWN = 10
+
+_minimum_level = 0
+_limited_counts = Counter()
+
+
+def configure_logging(level=DEFAULT_LEVEL, json_output=DEFAULT_JSON_OUTPUT, quiet=False, log_file=None):
+    """Route ETL output through a single loguru sink.
+
+    quiet raises the threshold to WARNING; json_output emits one JSON record per
+    message (level, time, module, text) for log shippers instead of console text.
+    """
+    global _minimum_level
+
+    if quiet:
+        level = 'WARNING'
+
+    logger.remove()
+    if json_output:
+        logger.add(sys.stdout, level=level, serialize=True)
+    else:
+        logger.add(sys.stdout, level=level, format=CONSOLE_FORMAT, colorize=False)
+    if log_file:
+        logger.add(log_file, level='DEBUG', serialize=True, rotation='50 MB')
+
+    _minimum_level = logger.level(level).no
+    _limited_counts.clear()
+
+
+def is_enabled(level):
+    """Cheap guard for hot loops: skip building a message nobody will see"""
+    return logger.level(level).no >= _minimum_level
+
+
+def log_limited(key, level, message, *args):
+    """Log at most RATE_LIMIT_SHOWN messages for key; later ones are only counted.
+
+    message is formatted with args by loguru, and only when the message is emitted.
+    """
+    _limited_counts[key] += 1
+    if _limited_counts[key] <= RATE_LIMIT_SHOWN and is_enabled(level):
+        logger.opt(depth=1).log(level, message, *args)
+
+
+def flush_limited(key, level='WARNING', description=None):
+    """Summarise a rate-limited key ('N ... , first 10 shown') and reset its counter"""
+    total = _limited_counts.pop(key, 0)
+    if total > RATE_LIMIT_SHOWN:
+        logger.opt(depth=1).log(level, "    {} {}, first {} shown", total, description or key, RATE_LIMIT_SHOWN)
+    return total
+
+
+configure_logging()
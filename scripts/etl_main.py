@@ -6,30 +6,92 @@ import sys
 import os
 import webbrowser
 import time
+from importlib import metadata
 from threading import Thread
 
 
+# Import name -> distribution name checked through package metadata
+REQUIRED_PACKAGES = {
+    "streamlit": "streamlit",
+    "plotly": "plotly",
+    "pandas": "pandas",
+    "numpy": "numpy",
+    "pyodbc": "pyodbc",
+    "openpyxl": "openpyxl",
+    "pyarrow": "pyarrow",
+    "loguru": "loguru"
+}
+
+# Cold-import ceilings (seconds) checked with -X importtime; streamlit is the
+# dashboard's own import floor, everything else it needs is imported on first use
+STARTUP_IMPORT_BUDGET = {
+    "etl": 1.5,
+    "streamlit": 2.5
+}
+
+
 def verify_packages():
-    """Verify required Python libraries and install missing ones."""
-    packages = [
-        "streamlit",
-        "plotly",
-        "pandas",
-        "numpy",
-        "pyodbc",
-        "openpyxl"
-    ]
+    """Verify required Python libraries and install missing ones.
 
+    Installed distributions are looked up in package metadata instead of being
+    imported, so the launcher does not load libraries the dashboard imports again.
+    """
     print("🔍 Verifying required libraries...\n")
-    for lib in packages:
+    missing = []
+    for lib, distribution in REQUIRED_PACKAGES.items():
         try:
-            __import__(lib)
-            print(f"✔ {lib} available")
-        except ImportError:
-            print(f"⬇ Installing missing library: {lib}")
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "install", lib]
-            )
+            print(f"✔ {lib} {metadata.version(distribution)} available")
+        except metadata.PackageNotFoundError:
+            missing.append(distribution)
+
+    if missing:
+        print(f"⬇ Installing missing libraries: {', '.join(missing)}")
+        subprocess.check_call(
+            [sys.executable, "-m", "pip", "install", *missing]
+        )
+
+
+def measure_import_time(module_name):
+    """Cold import of module_name in a fresh interpreter: (total seconds, heaviest imports)"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=base_dir, capture_output=True, text=True
+    )
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((int(cumulative_us), int(self_us), name.strip()))
+
+    total = next((cumulative for cumulative, _, name in timings if name == module_name), None)
+    if result.returncode != 0 or total is None:
+        return None, []
+
+    heaviest = sorted(timings, key=lambda timing: timing[1], reverse=True)[:5]
+    return total / 1e6, [(name, self_us / 1e6) for _, self_us, name in heaviest]
+
+
+def check_startup_budget():
+    """Report entry-point import times against STARTUP_IMPORT_BUDGET"""
+    print("\n⏱️  Startup import budget")
+    within_budget = True
+    for module_name, budget in STARTUP_IMPORT_BUDGET.items():
+        elapsed, heaviest = measure_import_time(module_name)
+        if elapsed is None:
+            print(f"⚠ {module_name}: import failed")
+            within_budget = False
+            continue
+
+        status = "✔" if elapsed <= budget else "⚠"
+        print(f"{status} {module_name}: {elapsed:.2f}s (budget {budget:.2f}s)")
+        if elapsed > budget:
+            within_budget = False
+            for name, seconds in heaviest:
+                print(f"    {name}: {seconds:.3f}s")
+    return within_budget
 
 
 def launch_browser_later(delay=3):
@@ -71,4 +133,6 @@ def run():
 
 if __name__ == "__main__":
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    if "--check-startup" in sys.argv:
+        sys.exit(0 if check_startup_budget() else 1)
     run()
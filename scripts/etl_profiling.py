@@ -0,0 +1,163 @@
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from etl_logging import logger
+
+
+PROFILE_DIRECTORY = os.path.join('data', 'profiles')
+PROFILE_TOP_N = 25
+
+
+def normalize_statement(sql):
+    """Collapse whitespace so the same statement text always lands in the same bucket"""
+    return re.sub(r'\s+', ' ', str(sql)).strip()[:160]
+
+
+class StatementStats:
+    """Call count and cumulative time per SQL statement across instrumented connections"""
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.rows = defaultdict(int)
+        self.seconds = defaultdict(float)
+
+    def record(self, sql, started, row_count=1):
+        statement = normalize_statement(sql)
+        self.calls[statement] += 1
+        self.rows[statement] += row_count
+        self.seconds[statement] += time.perf_counter() - started
+
+
+class CountingCursor:
+    def __init__(self, cursor, statement_stats):
+        self._cursor = cursor
+        self._statement_stats = statement_stats
+
+    def execute(self, sql, *params):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, *params)
+        finally:
+            self._statement_stats.record(sql, started)
+
+    def executemany(self, sql, param_rows):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, param_rows)
+        finally:
+            self._statement_stats.record(sql, started, len(param_rows))
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class CountingConnection:
+    """DB-API connection wrapper that attributes every round trip to its SQL text"""
+
+    def __init__(self, connection, statement_stats):
+        self._connection = connection
+        self._statement_stats = statement_stats
+
+    def cursor(self):
+        return CountingCursor(self._connection.cursor(), self._statement_stats)
+
+    def execute(self, sql, *params):
+        started = time.perf_counter()
+        try:
+            return self._connection.execute(sql, *params)
+        finally:
+            self._statement_stats.record(sql, started)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+class PipelineProfiler:
+    """cProfile capture per pipeline stage plus SQL statement counts.
+
+    Every stage is written to its own .prof file (open with snakeviz, or convert to
+    a flamegraph with flameprof / speedscope) and its top-N functions are logged.
+    """
+
+    def __init__(self, output_directory=PROFILE_DIRECTORY, top_n=PROFILE_TOP_N):
+        self.output_directory = output_directory
+        self.top_n = top_n
+        self.run_identifier = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.statement_stats = StatementStats()
+        self.stage_timings = []
+        self._active_stage = None
+
+    def instrument(self, connection):
+        if connection is None or isinstance(connection, CountingConnection):
+            return connection
+        return CountingConnection(connection, self.statement_stats)
+
+    @contextlib.contextmanager
+    def stage(self, stage_name):
+        # cProfile allows one active profiler; nested stages are folded into the outer one
+        if self._active_stage is not None:
+            yield
+            return
+
+        self._active_stage = stage_name
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            self._active_stage = None
+            self._save_stage(stage_name, profile, elapsed)
+
+    def _save_stage(self, stage_name, profile, elapsed):
+        stage_number = len(self.stage_timings) + 1
+        self.stage_timings.append((stage_name, elapsed))
+
+        os.makedirs(self.output_directory, exist_ok=True)
+        profile_path = os.path.join(
+            self.output_directory, f"{self.run_identifier}_{stage_number:02d}_{stage_name}.prof"
+        )
+        profile.dump_stats(profile_path)
+
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats('cumulative').print_stats(self.top_n)
+        logger.info(report.getvalue())
+        logger.info(f"  ⏱️  Stage '{stage_name}': {elapsed:.2f}s -> {profile_path}")
+
+    def report(self):
+        logger.info("\n⏱️  PROFILE SUMMARY")
+        logger.info("-" * 30)
+
+        total = sum(elapsed for _, elapsed in self.stage_timings) or 1.0
+        for stage_name, elapsed in self.stage_timings:
+            logger.info(f"  {stage_name:<20} {elapsed:8.2f}s  {elapsed / total:6.1%}")
+
+        statements = sorted(
+            self.statement_stats.calls,
+            key=lambda statement: self.statement_stats.seconds[statement],
+            reverse=True
+        )
+        logger.info(f"\n  SQL round trips: {sum(self.statement_stats.calls.values()):,} "
+                    f"across {len(statements)} distinct statements")
+        for statement in statements[:self.top_n]:
+            logger.info(f"  {self.statement_stats.calls[statement]:>8,} calls "
+                        f"{self.statement_stats.rows[statement]:>10,} rows "
+                        f"{self.statement_stats.seconds[statement]:8.2f}s  {statement}")
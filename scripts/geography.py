@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+
+GEOGRAPHY_ATTRIBUTES = ['City', 'Region', 'PostalCode', 'Country']
+
+# Ship-to columns of the order transforms, in DimGeography terms
+SHIP_TO_GEOGRAPHY = {
+    'ShipCity': 'City',
+    'ShipRegion': 'Region',
+    'ShipPostalCode': 'PostalCode',
+    'ShipCountry': 'Country'
+}
+
+# Text the transforms leave behind for missing values (object columns go through astype(str)),
+# plus the 'Unknown' placeholder the dimension transforms fill Region and PostalCode with
+MISSING_TEXT = ['nan', 'None', 'NaT', '<NA>', 'Unknown']
+
+GEOGRAPHY_STAGING_CREATE_QUERY = """
+    IF OBJECT_ID('tempdb..#GeographyStaging') IS NULL
+        CREATE TABLE #GeographyStaging (
+            City VARCHAR(50) NOT NULL,
+            Region VARCHAR(50) NOT NULL,
+            PostalCode VARCHAR(20) NOT NULL,
+            Country VARCHAR(50) NOT NULL
+        )
+"""
+
+GEOGRAPHY_STAGE_QUERY = "INSERT INTO #GeographyStaging (City, Region, PostalCode, Country) VALUES (?, ?, ?, ?)"
+
+GEOGRAPHY_MERGE_QUERY = """
+    INSERT INTO DimGeography (City, Region, PostalCode, Country)
+    SELECT DISTINCT s.City, s.Region, s.PostalCode, s.Country
+    FROM #GeographyStaging s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM DimGeography g
+        WHERE g.City = s.City AND g.Region = s.Region AND g.PostalCode = s.PostalCode AND g.Country = s.Country
+    )
+"""
+
+GEOGRAPHY_STAGING_CLEAR_QUERY = "TRUNCATE TABLE #GeographyStaging"
+
+GEOGRAPHY_KEYS_QUERY = "SELECT GeographyKey, City, Region, PostalCode, Country FROM DimGeography"
+
+
+def normalized_text_sql(column):
+    """T-SQL equivalent of normalize_geography for one column, used to backfill existing rows"""
+    trimmed = f"LTRIM(RTRIM(ISNULL({column}, '')))"
+    missing = ', '.join(f"'{token}'" for token in MISSING_TEXT)
+    return f"CASE WHEN {trimmed} IN ({missing}) THEN '' ELSE {trimmed} END"
+
+
+def normalize_geography(frame, columns=None):
+    """City, Region, PostalCode and Country as trimmed text, '' where missing.
+
+    columns maps the frame's column names to GEOGRAPHY_ATTRIBUTES; by default the
+    frame already uses them. Absent columns are treated as entirely missing.
+    """
+    columns = columns or {attribute: attribute for attribute in GEOGRAPHY_ATTRIBUTES}
+    normalized = pd.DataFrame(index=frame.index)
+    for source_column, attribute in columns.items():
+        if source_column not in frame.columns:
+            normalized[attribute] = ''
+            continue
+        values = frame[source_column]
+        text = values.where(values.notna(), '').astype(str).str.strip()
+        normalized[attribute] = text.mask(text.isin(MISSING_TEXT), '')
+    return normalized[GEOGRAPHY_ATTRIBUTES]
+
+
+def geography_match_index(normalized):
+    """Case-insensitive composite key, matching the warehouse's default collation"""
+    return pd.MultiIndex.from_arrays([normalized[attribute].str.casefold() for attribute in GEOGRAPHY_ATTRIBUTES])
+
+
+def factorize_geographies(normalized):
+    """(codes, distinct): one integer code per row and one row per distinct geography.
+
+    The composite key is factorized in a single vectorized pass; each distinct
+    geography keeps the spelling of its first occurrence.
+    """
+    codes, _ = geography_match_index(normalized).factorize()
+    _, first_rows = np.unique(codes, return_index=True)
+    distinct = normalized.iloc[first_rows].reset_index(drop=True)
+    return codes, distinct
@@ -0,0 +1,200 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Effect of each Inventory Transaction Types entry on the stock on hand;
+# held stock is allocated to an order and no longer available
+INVENTORY_TYPE_DIRECTION = {
+    'Purchased': 1,
+    'Sold': -1,
+    'On Hold': -1,
+    'Waste': -1
+}
+
+PRODUCT_ATTRIBUTES = {
+    'ID': 'ProductID',
+    'Product Code': 'ProductCode',
+    'Product Name': 'ProductName',
+    'Category': 'Category',
+    'Reorder Level': 'ReorderLevel',
+    'Target Level': 'TargetLevel'
+}
+
+INVENTORY_TRANSACTION_ATTRIBUTES = {
+    'Transaction ID': 'TransactionID',
+    'Transaction Type': 'TransactionType',
+    'Transaction Created Date': 'TransactionDate',
+    'Product ID': 'ProductName',
+    'Quantity': 'Quantity',
+    'Purchase Order ID': 'PurchaseOrderID',
+    'Customer Order ID': 'CustomerOrderID'
+}
+
+INVENTORY_LOAD_COLUMNS = """
+        TransactionID, ProductKey, ProductID, TransactionTypeID, TransactionType,
+        TransactionDateKey, TransactionDate, Quantity, StockChange,
+        PurchaseOrderID, CustomerOrderID
+"""
+
+INVENTORY_LOAD_COLUMN_NAMES = [column.strip() for column in INVENTORY_LOAD_COLUMNS.split(',')]
+
+# Same staging pattern as FactOrders: bulk-copy, then insert what the warehouse lacks
+INVENTORY_STAGING_CREATE_QUERY = """
+    IF OBJECT_ID('tempdb..#InventoryStaging') IS NULL
+        CREATE TABLE #InventoryStaging (
+            TransactionID INT NOT NULL,
+            ProductKey INT,
+            ProductID INT,
+            TransactionTypeID INT,
+            TransactionType VARCHAR(20),
+            TransactionDateKey INT,
+            TransactionDate DATETIME,
+            Quantity INT,
+            StockChange INT,
+            PurchaseOrderID INT,
+            CustomerOrderID INT
+        )
+"""
+
+INVENTORY_STAGE_QUERY = f"""
+    INSERT INTO #InventoryStaging ({INVENTORY_LOAD_COLUMNS})
+    VALUES ({', '.join('?' * len(INVENTORY_LOAD_COLUMN_NAMES))})
+"""
+
+# Earliest day touched by transactions the warehouse has not seen: the snapshot
+# is rebuilt from there, which also covers late-arriving, back-dated movements
+INVENTORY_EARLIEST_NEW_QUERY = """
+    SELECT MIN(s.TransactionDateKey)
+    FROM #InventoryStaging s
+    WHERE NOT EXISTS (SELECT 1 FROM FactInventoryTransactions f WHERE f.TransactionID = s.TransactionID)
+"""
+
+INVENTORY_MERGE_QUERY = f"""
+    INSERT INTO FactInventoryTransactions ({INVENTORY_LOAD_COLUMNS})
+    SELECT {INVENTORY_LOAD_COLUMNS}
+    FROM #InventoryStaging s
+    WHERE NOT EXISTS (SELECT 1 FROM FactInventoryTransactions f WHERE f.TransactionID = s.TransactionID)
+"""
+
+INVENTORY_STAGING_CLEAR_QUERY = "TRUNCATE TABLE #InventoryStaging"
+
+SNAPSHOT_RANGE_QUERY = """
+    SELECT
+        (SELECT MAX(SnapshotDateKey) FROM FactInventorySnapshot),
+        (SELECT MIN(TransactionDateKey) FROM FactInventoryTransactions),
+        (SELECT MAX(TransactionDateKey) FROM FactInventoryTransactions)
+"""
+
+# Every active product has a row on every snapshot day, so the last day before
+# the rebuild holds the opening level of all of them
+SNAPSHOT_OPENING_QUERY = """
+    SELECT ProductID, StockLevel
+    FROM FactInventorySnapshot
+    WHERE SnapshotDateKey = (SELECT MAX(SnapshotDateKey) FROM FactInventorySnapshot WHERE SnapshotDateKey < ?)
+"""
+
+DAILY_MOVEMENT_QUERY = """
+    SELECT
+        ProductID,
+        TransactionDateKey,
+        SUM(CASE WHEN StockChange > 0 THEN StockChange ELSE 0 END) AS Received,
+        SUM(CASE WHEN StockChange < 0 THEN -StockChange ELSE 0 END) AS Issued
+    FROM FactInventoryTransactions
+    WHERE TransactionDateKey >= ? AND ProductID IS NOT NULL
+    GROUP BY ProductID, TransactionDateKey
+"""
+
+SNAPSHOT_CLEAR_QUERY = "DELETE FROM FactInventorySnapshot WHERE SnapshotDateKey >= ?"
+
+SNAPSHOT_LOAD_COLUMNS = ['SnapshotDateKey', 'SnapshotDate', 'ProductKey', 'ProductID',
+                         'Received', 'Issued', 'NetChange', 'StockLevel']
+
+SNAPSHOT_INSERT_QUERY = f"""
+    INSERT INTO FactInventorySnapshot ({', '.join(SNAPSHOT_LOAD_COLUMNS)})
+    VALUES ({', '.join('?' * len(SNAPSHOT_LOAD_COLUMNS))})
+"""
+
+
+def date_keys(dates):
+    return (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).astype('Int64')
+
+
+def dates_from_keys(keys):
+    return pd.to_datetime(pd.Series(keys).astype('int64').astype(str), format='%Y%m%d')
+
+
+def read_inventory_workbooks(directory):
+    def read_workbook(workbook_name, columns):
+        return pd.read_excel(os.path.join(directory, f"{workbook_name}.xlsx"), usecols=lambda column: column in columns)
+
+    return {
+        'product_raw': read_workbook('Products', PRODUCT_ATTRIBUTES),
+        'inventory_type_raw': read_workbook('Inventory Transaction Types', ['ID', 'Type Name']),
+        'inventory_transaction_raw': read_workbook('Inventory Transactions', INVENTORY_TRANSACTION_ATTRIBUTES)
+    }
+
+
+def transform_products(products, source_identifier='Excel'):
+    """DimProduct rows in the warehouse attribute names"""
+    processed_products = products.rename(columns=PRODUCT_ATTRIBUTES)
+    processed_products['SourceSystem'] = source_identifier
+    return processed_products
+
+
+def transform_inventory_transactions(transactions, transaction_types, products):
+    """Transaction fact rows: workbook display names mapped back to IDs and a signed StockChange"""
+    processed = transactions.rename(columns=INVENTORY_TRANSACTION_ATTRIBUTES)
+
+    # The workbook carries product and type names where the Access tables store foreign keys
+    product_ids = products.drop_duplicates('Product Name').set_index('Product Name')['ID']
+    type_ids = transaction_types.drop_duplicates('Type Name').set_index('Type Name')['ID']
+    processed['ProductID'] = processed['ProductName'].map(product_ids).astype('Int64')
+    processed['TransactionTypeID'] = processed['TransactionType'].map(type_ids).astype('Int64')
+
+    processed['TransactionDate'] = pd.to_datetime(processed['TransactionDate'], errors='coerce')
+    processed['TransactionDateKey'] = date_keys(processed['TransactionDate'])
+    processed['Quantity'] = pd.to_numeric(processed['Quantity'], errors='coerce').fillna(0).astype('int64')
+
+    direction = processed['TransactionType'].map(INVENTORY_TYPE_DIRECTION).fillna(0).astype('int64')
+    processed['StockChange'] = processed['Quantity'] * direction
+
+    for reference in ['PurchaseOrderID', 'CustomerOrderID']:
+        processed[reference] = pd.to_numeric(processed[reference], errors='coerce').astype('Int64')
+
+    processed = processed[processed['TransactionDateKey'].notna()]
+    return processed.drop_duplicates('TransactionID', keep='last')
+
+
+def daily_stock_snapshot(daily_movements, opening_levels, start_date, end_date):
+    """One row per product per day from start_date to end_date, with the running stock level.
+
+    daily_movements holds (ProductID, TransactionDateKey, Received, Issued) from
+    start_date on; opening_levels maps ProductID to its level the day before.
+    Levels are opening plus a per-product cumulative sum over a dense day grid, so
+    only the days being added are ever computed. Products enter the snapshot on
+    their first movement.
+    """
+    days = pd.date_range(start_date, end_date, freq='D')
+    products = np.union1d(opening_levels.index.to_numpy(dtype='int64'),
+                          daily_movements['ProductID'].to_numpy(dtype='int64'))
+    if len(days) == 0 or len(products) == 0:
+        return pd.DataFrame(columns=SNAPSHOT_LOAD_COLUMNS)
+
+    movements = daily_movements.assign(
+        ProductID=daily_movements['ProductID'].astype('int64'),
+        SnapshotDate=dates_from_keys(daily_movements['TransactionDateKey']).to_numpy()
+    ).groupby(['ProductID', 'SnapshotDate'])[['Received', 'Issued']].sum()
+
+    grid = pd.MultiIndex.from_product([products, days], names=['ProductID', 'SnapshotDate'])
+    snapshot = movements.reindex(grid, fill_value=0).astype('int64').reset_index()
+    snapshot['NetChange'] = snapshot['Received'] - snapshot['Issued']
+
+    by_product = snapshot.groupby('ProductID', sort=False)
+    opening = snapshot['ProductID'].map(opening_levels).fillna(0).astype('int64')
+    snapshot['StockLevel'] = opening + by_product['NetChange'].cumsum()
+
+    has_moved = by_product['Received'].cumsum() + by_product['Issued'].cumsum() > 0
+    snapshot = snapshot[has_moved | snapshot['ProductID'].isin(opening_levels.index)]
+    return snapshot.assign(SnapshotDateKey=date_keys(snapshot['SnapshotDate'])).reset_index(drop=True)
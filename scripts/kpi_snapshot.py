@@ -0,0 +1,122 @@
+import json
+import os
+from datetime import datetime
+
+from etl_logging import logger
+
+
+KPI_SNAPSHOT_PATH = os.path.join('data', 'cache', 'kpi_snapshot.json')
+
+# Every figure is aggregated server-side, so the snapshot costs a handful of
+# grouped scans instead of shipping the fact table to Python
+KPI_TOTALS_QUERY = """
+    SELECT
+        COUNT_BIG(*) AS TotalOrders,
+        SUM(CAST(DeliveryStatus AS INT)) AS DeliveredOrders,
+        SUM(TotalAmount) AS TotalAmount,
+        MIN(OrderDate) AS FirstOrderDate,
+        MAX(OrderDate) AS LastOrderDate
+    FROM FactOrders
+    WHERE OrderDate IS NOT NULL
+"""
+
+KPI_BREAKDOWN_QUERY = """
+    SELECT
+        {group_expression} AS GroupValue,
+        COUNT_BIG(*) AS TotalOrders,
+        SUM(CAST(DeliveryStatus AS INT)) AS DeliveredOrders,
+        SUM(TotalAmount) AS TotalAmount
+    FROM FactOrders
+    WHERE OrderDate IS NOT NULL
+    GROUP BY {group_expression}
+    ORDER BY {group_expression}
+"""
+
+# Distinct sidebar options, labelled exactly as the dashboard's detail query labels them
+FILTER_VALUE_QUERIES = {
+    'years': """
+        SELECT DISTINCT YEAR(OrderDate) FROM FactOrders
+        WHERE OrderDate IS NOT NULL ORDER BY 1
+    """,
+    'customers': """
+        SELECT DISTINCT dc.CompanyName FROM FactOrders fo
+        JOIN DimCustomer dc ON fo.CustomerKey = dc.CustomerKey
+        WHERE fo.OrderDate IS NOT NULL AND dc.CompanyName IS NOT NULL ORDER BY 1
+    """,
+    'employees': """
+        SELECT DISTINCT de.FirstName + ' ' + de.LastName FROM FactOrders fo
+        JOIN DimEmployee de ON fo.EmployeeKey = de.EmployeeKey
+        WHERE fo.OrderDate IS NOT NULL AND de.FirstName IS NOT NULL ORDER BY 1
+    """,
+    'sources': """
+        SELECT DISTINCT SourceSystem FROM FactOrders
+        WHERE SourceSystem IS NOT NULL ORDER BY 1
+    """
+}
+
+
+def _delivery_figures(total_orders, delivered_orders, total_amount):
+    total_orders = int(total_orders or 0)
+    delivered_orders = int(delivered_orders or 0)
+    return {
+        'total_orders': total_orders,
+        'delivered_orders': delivered_orders,
+        'pending_orders': total_orders - delivered_orders,
+        'delivery_rate': round(delivered_orders / total_orders * 100, 2) if total_orders else 0.0,
+        'total_amount': float(total_amount or 0)
+    }
+
+
+def build_kpi_snapshot(connection, data_version=None):
+    """Headline metrics, per-year and per-source breakdowns and filter values as plain JSON types"""
+    cursor = connection.cursor()
+
+    cursor.execute(KPI_TOTALS_QUERY)
+    total_orders, delivered_orders, total_amount, first_order, last_order = cursor.fetchone()
+
+    breakdowns = {}
+    for breakdown_name, group_expression in [('by_year', 'YEAR(OrderDate)'), ('by_source', 'SourceSystem')]:
+        cursor.execute(KPI_BREAKDOWN_QUERY.format(group_expression=group_expression))
+        breakdowns[breakdown_name] = {
+            str(group_value): _delivery_figures(group_orders, group_delivered, group_amount)
+            for group_value, group_orders, group_delivered, group_amount in cursor.fetchall()
+        }
+
+    filter_values = {}
+    for filter_name, filter_query in FILTER_VALUE_QUERIES.items():
+        cursor.execute(filter_query)
+        filter_values[filter_name] = [row[0] for row in cursor.fetchall()]
+    filter_values['years'] = [int(year) for year in filter_values['years']]
+
+    cursor.close()
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'data_version': data_version,
+        'totals': _delivery_figures(total_orders, delivered_orders, total_amount),
+        'first_order_date': str(first_order) if first_order is not None else None,
+        'last_order_date': str(last_order) if last_order is not None else None,
+        **breakdowns,
+        'filters': filter_values
+    }
+
+
+def write_kpi_snapshot(snapshot, path=KPI_SNAPSHOT_PATH):
+    """Write beside the final name and swap in, so the dashboard never reads a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    staging_path = path + '.tmp'
+    with open(staging_path, 'w', encoding='utf-8') as snapshot_file:
+        json.dump(snapshot, snapshot_file, ensure_ascii=False, indent=2)
+    os.replace(staging_path, path)
+
+
+def load_kpi_snapshot(path=KPI_SNAPSHOT_PATH):
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, encoding='utf-8') as snapshot_file:
+            return json.load(snapshot_file)
+    except Exception as e:
+        logger.warning(f"  ⚠️  KPI snapshot unreadable: {e}")
+        return None
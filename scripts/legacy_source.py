@@ -0,0 +1,69 @@
+import pandas as pd
+from DatabaseConfig import DatabaseConfig
+
+
+class LegacySourceAdapter:
+    """Single-connection reader over the legacy Access database"""
+
+    def __init__(self, access_path=None):
+        self.access_path = access_path or DatabaseConfig.ACCESS_DB_PATH
+        self._connection = None
+        self._table_catalog = None
+        self._column_catalog = {}
+
+    def connect(self):
+        """Open the Access file on first use and reuse the handle afterwards"""
+        if self._connection is None:
+            import pyodbc
+
+            connection_string = f"DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={self.access_path};"
+            self._connection = pyodbc.connect(connection_string)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def table_catalog(self):
+        """User tables of the legacy file, enumerated once per adapter"""
+        if self._table_catalog is None:
+            cursor = self.connect().cursor()
+            self._table_catalog = [table.table_name for table in cursor.tables(tableType='TABLE')]
+            cursor.close()
+        return self._table_catalog
+
+    def table_columns(self, table_name):
+        """Column names of a legacy table, cached per table"""
+        if table_name not in self._column_catalog:
+            cursor = self.connect().cursor()
+            self._column_catalog[table_name] = [column.column_name for column in cursor.columns(table=table_name)]
+            cursor.close()
+        return self._column_catalog[table_name]
+
+    def resolve_table(self, preferred_name, matcher):
+        """Return the preferred table name, or the first catalog entry accepted by matcher"""
+        catalog = self.table_catalog()
+        if preferred_name in catalog:
+            return preferred_name
+        for table in catalog:
+            if matcher(table.lower()):
+                return table
+        return preferred_name
+
+    def extract(self, preferred_name, matcher, columns=None):
+        """Read a legacy table, restricted to the requested columns that actually exist"""
+        table_name = self.resolve_table(preferred_name, matcher)
+
+        projection = '*'
+        if columns:
+            available = set(self.table_columns(table_name))
+            selected = [column for column in dict.fromkeys(columns) if column in available]
+            if selected:
+                projection = ', '.join(f"[{column}]" for column in selected)
+
+        query = f"SELECT {projection} FROM [{table_name}]"
+        return pd.read_sql(query, self.connect())
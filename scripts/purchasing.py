@@ -0,0 +1,162 @@
+import os
+
+import pandas as pd
+
+from inventory import PRODUCT_ATTRIBUTES, date_keys
+
+
+SUPPLIER_ATTRIBUTES = {
+    'ID': 'SupplierID',
+    'Company': 'CompanyName',
+    'Last Name': 'LastName',
+    'First Name': 'FirstName',
+    'Job Title': 'ContactTitle',
+    'Business Phone': 'Phone',
+    'Address': 'Address',
+    'City': 'City',
+    'State/Province': 'Region',
+    'ZIP/Postal Code': 'PostalCode',
+    'Country/Region': 'Country'
+}
+
+PURCHASE_ORDER_ATTRIBUTES = {
+    'Purchase Order ID': 'PurchaseOrderID',
+    'Supplier ID': 'SupplierName',
+    'Status ID': 'Status',
+    'Creation Date': 'CreationDate',
+    'Submitted Date': 'SubmittedDate',
+    'Approved Date': 'ApprovedDate',
+    'Expected Date': 'ExpectedDate'
+}
+
+PURCHASE_ORDER_LINE_ATTRIBUTES = {
+    'ID': 'PurchaseOrderLineID',
+    'Purchase Order ID': 'PurchaseOrderID',
+    'Product': 'ProductName',
+    'Quantity': 'Quantity',
+    'Unit Cost': 'UnitCost',
+    'Date Received': 'ReceivedDate',
+    'Posted To Inventory': 'PostedToInventory',
+    'Inventory ID': 'InventoryTransactionID'
+}
+
+# Header dates carried to every line as DimDate keys
+PURCHASE_ORDER_MILESTONES = ['CreationDate', 'SubmittedDate', 'ApprovedDate', 'ExpectedDate', 'ReceivedDate']
+
+PURCHASE_LOAD_COLUMNS = """
+        PurchaseOrderLineID, PurchaseOrderID, SupplierKey, SupplierID,
+        ProductKey, ProductID, StatusID, Status,
+        CreationDateKey, SubmittedDateKey, ApprovedDateKey, ExpectedDateKey, ReceivedDateKey,
+        Quantity, UnitCost, LineAmount, PostedToInventory, InventoryTransactionID
+"""
+
+PURCHASE_LOAD_COLUMN_NAMES = [column.strip() for column in PURCHASE_LOAD_COLUMNS.split(',')]
+
+# Everything a purchase order line can still change after it is first loaded
+PURCHASE_MUTABLE_COLUMNS = [
+    'SupplierKey', 'ProductKey', 'StatusID', 'Status', 'SubmittedDateKey', 'ApprovedDateKey',
+    'ExpectedDateKey', 'ReceivedDateKey', 'Quantity', 'UnitCost', 'LineAmount',
+    'PostedToInventory', 'InventoryTransactionID'
+]
+
+PURCHASE_STAGING_CREATE_QUERY = """
+    IF OBJECT_ID('tempdb..#PurchaseOrderStaging') IS NULL
+        CREATE TABLE #PurchaseOrderStaging (
+            PurchaseOrderLineID INT NOT NULL,
+            PurchaseOrderID INT NOT NULL,
+            SupplierKey INT,
+            SupplierID INT,
+            ProductKey INT,
+            ProductID INT,
+            StatusID INT,
+            Status VARCHAR(20),
+            CreationDateKey INT,
+            SubmittedDateKey INT,
+            ApprovedDateKey INT,
+            ExpectedDateKey INT,
+            ReceivedDateKey INT,
+            Quantity INT,
+            UnitCost DECIMAL(10,4),
+            LineAmount DECIMAL(12,2),
+            PostedToInventory BIT,
+            InventoryTransactionID INT
+        )
+"""
+
+PURCHASE_STAGE_QUERY = f"""
+    INSERT INTO #PurchaseOrderStaging ({PURCHASE_LOAD_COLUMNS})
+    VALUES ({', '.join('?' * len(PURCHASE_LOAD_COLUMN_NAMES))})
+"""
+
+PURCHASE_UPDATE_QUERY = f"""
+    UPDATE f
+    SET {', '.join(f'{column} = s.{column}' for column in PURCHASE_MUTABLE_COLUMNS)}
+    FROM FactPurchaseOrders f
+    JOIN #PurchaseOrderStaging s ON f.PurchaseOrderLineID = s.PurchaseOrderLineID
+    WHERE EXISTS (
+        SELECT {', '.join(f's.{column}' for column in PURCHASE_MUTABLE_COLUMNS)}
+        EXCEPT
+        SELECT {', '.join(f'f.{column}' for column in PURCHASE_MUTABLE_COLUMNS)}
+    )
+"""
+
+PURCHASE_MERGE_QUERY = f"""
+    INSERT INTO FactPurchaseOrders ({PURCHASE_LOAD_COLUMNS})
+    SELECT {PURCHASE_LOAD_COLUMNS}
+    FROM #PurchaseOrderStaging s
+    WHERE NOT EXISTS (SELECT 1 FROM FactPurchaseOrders f WHERE f.PurchaseOrderLineID = s.PurchaseOrderLineID)
+"""
+
+PURCHASE_STAGING_CLEAR_QUERY = "TRUNCATE TABLE #PurchaseOrderStaging"
+
+
+def read_purchasing_workbooks(directory):
+    def read_workbook(workbook_name, columns):
+        return pd.read_excel(os.path.join(directory, f"{workbook_name}.xlsx"), usecols=lambda column: column in columns)
+
+    return {
+        'supplier_raw': read_workbook('Suppliers', SUPPLIER_ATTRIBUTES),
+        'product_raw': read_workbook('Products', PRODUCT_ATTRIBUTES),
+        'purchase_order_raw': read_workbook('Purchase Orders', PURCHASE_ORDER_ATTRIBUTES),
+        'purchase_order_line_raw': read_workbook('Purchase Order Details', PURCHASE_ORDER_LINE_ATTRIBUTES),
+        'purchase_status_raw': read_workbook('Purchase Order Status', ['Status ID', 'Status'])
+    }
+
+
+def transform_suppliers(suppliers, source_identifier='Excel'):
+    """DimSupplier rows in the warehouse attribute names, contact name assembled column-wise"""
+    processed_suppliers = suppliers.rename(columns=SUPPLIER_ATTRIBUTES)
+    first_names = processed_suppliers.pop('FirstName').fillna('').astype(str)
+    last_names = processed_suppliers.pop('LastName').fillna('').astype(str)
+    processed_suppliers['ContactName'] = (first_names + ' ' + last_names).str.strip()
+    processed_suppliers['SourceSystem'] = source_identifier
+    return processed_suppliers
+
+
+def transform_purchase_order_lines(purchase_orders, order_lines, order_statuses, suppliers, products):
+    """One row per purchase order line with the header joined on and display names mapped back to IDs"""
+    headers = purchase_orders.rename(columns=PURCHASE_ORDER_ATTRIBUTES)
+    lines = order_lines.rename(columns=PURCHASE_ORDER_LINE_ATTRIBUTES)
+
+    # The workbooks carry supplier, status and product names where Access stores foreign keys
+    supplier_ids = suppliers.drop_duplicates('Company').set_index('Company')['ID']
+    status_ids = order_statuses.drop_duplicates('Status').set_index('Status')['Status ID']
+    product_ids = products.drop_duplicates('Product Name').set_index('Product Name')['ID']
+    headers['SupplierID'] = headers['SupplierName'].map(supplier_ids).astype('Int64')
+    headers['StatusID'] = headers['Status'].map(status_ids).astype('Int64')
+    lines['ProductID'] = lines['ProductName'].map(product_ids).astype('Int64')
+
+    processed = lines.merge(
+        headers.drop(columns=['SupplierName']), on='PurchaseOrderID', how='left', validate='many_to_one'
+    )
+
+    for milestone in PURCHASE_ORDER_MILESTONES:
+        processed[f'{milestone}Key'] = date_keys(pd.to_datetime(processed[milestone], errors='coerce'))
+
+    processed['Quantity'] = pd.to_numeric(processed['Quantity'], errors='coerce').fillna(0).astype('int64')
+    processed['UnitCost'] = pd.to_numeric(processed['UnitCost'], errors='coerce').fillna(0.0)
+    processed['LineAmount'] = (processed['Quantity'] * processed['UnitCost']).round(2)
+    processed['PostedToInventory'] = processed['PostedToInventory'].fillna(False).astype(bool)
+    processed['InventoryTransactionID'] = pd.to_numeric(processed['InventoryTransactionID'], errors='coerce').astype('Int64')
+
+    return processed.drop_duplicates('PurchaseOrderLineID', keep='last')
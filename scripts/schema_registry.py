@@ -0,0 +1,475 @@
+from DatabaseConfig import DatabaseConfig
+from etl_logging import logger
+from geography import SHIP_TO_GEOGRAPHY, normalized_text_sql
+
+
+SCHEMA_VERSION_DDL = """
+    IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='SchemaVersion' AND xtype='U')
+        CREATE TABLE SchemaVersion (
+            Version INT PRIMARY KEY,
+            Description VARCHAR(200) NOT NULL,
+            AppliedAt DATETIME NOT NULL DEFAULT GETDATE()
+        )
+"""
+
+# Every table and column the loaders touch, read in one catalog round trip
+CATALOG_QUERY = """
+    SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
+    FROM INFORMATION_SCHEMA.COLUMNS
+    ORDER BY TABLE_NAME, ORDINAL_POSITION
+"""
+
+def _when_column_exists(table_name, column_name, statements):
+    """Run statements only while a column exists; dynamic SQL so the batch compiles after it is dropped"""
+    executed = ' '.join("EXEC('{}');".format(statement.replace("'", "''")) for statement in statements)
+    return f"IF COL_LENGTH('{table_name}', '{column_name}') IS NOT NULL BEGIN {executed} END"
+
+
+_SHIP_TO_NORMALIZED = "CROSS APPLY (SELECT {}) n".format(', '.join(
+    f"{normalized_text_sql(f'f.{column}')} AS {attribute}" for column, attribute in SHIP_TO_GEOGRAPHY.items()
+))
+_GEOGRAPHY_MATCH = ' AND '.join(f"g.{attribute} = n.{attribute}" for attribute in SHIP_TO_GEOGRAPHY.values())
+
+# Ordered, append-only. Statements are guarded so warehouses built before the
+# registry existed adopt each version without failing on objects already there.
+SCHEMA_MIGRATIONS = [
+    (1, "Baseline warehouse tables", [
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimDate' AND xtype='U')
+        BEGIN
+            CREATE TABLE DimDate (
+                DateKey INT PRIMARY KEY,
+                Date DATE NOT NULL,
+                Year INT NOT NULL,
+                Quarter INT NOT NULL,
+                Month INT NOT NULL,
+                Day INT NOT NULL,
+                MonthName VARCHAR(20) NOT NULL,
+                DayOfWeek VARCHAR(20) NOT NULL,
+                IsWeekend BIT NOT NULL
+            );
+
+            -- Temporal query optimization
+            CREATE INDEX IX_Temporal_Date ON DimDate(Date);
+            CREATE INDEX IX_Temporal_Year ON DimDate(Year);
+            CREATE INDEX IX_Temporal_YearMonth ON DimDate(Year, Month);
+        END
+        """,
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimCustomer' AND xtype='U')
+            CREATE TABLE DimCustomer (
+                CustomerKey INT IDENTITY(1,1) PRIMARY KEY,
+                CustomerID VARCHAR(10) NOT NULL,
+                CompanyName VARCHAR(100) NOT NULL,
+                ContactName VARCHAR(100),
+                ContactTitle VARCHAR(100),
+                Address VARCHAR(200),
+                City VARCHAR(50),
+                Region VARCHAR(50),
+                PostalCode VARCHAR(20),
+                Country VARCHAR(50),
+                Phone VARCHAR(30),
+                SourceSystem VARCHAR(20),
+                UNIQUE(CustomerID, SourceSystem)
+            )
+        """,
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimEmployee' AND xtype='U')
+            CREATE TABLE DimEmployee (
+                EmployeeKey INT IDENTITY(1,1) PRIMARY KEY,
+                EmployeeID INT NOT NULL,
+                LastName VARCHAR(50) NOT NULL,
+                FirstName VARCHAR(50) NOT NULL,
+                Title VARCHAR(100),
+                TitleOfCourtesy VARCHAR(25),
+                BirthDate DATE,
+                HireDate DATE,
+                Address VARCHAR(200),
+                City VARCHAR(50),
+                Region VARCHAR(50),
+                PostalCode VARCHAR(20),
+                Country VARCHAR(50),
+                HomePhone VARCHAR(30),
+                ReportsTo INT,
+                SourceSystem VARCHAR(20),
+                UNIQUE(EmployeeID, SourceSystem)
+            )
+        """,
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='FactOrders' AND xtype='U')
+        BEGIN
+            CREATE TABLE FactOrders (
+                FactOrderKey INT IDENTITY(1,1) PRIMARY KEY,
+                OrderID INT NOT NULL,
+                CustomerKey INT,
+                EmployeeKey INT,
+                OrderDateKey INT,
+                OrderDate DATE,
+                RequiredDate DATE,
+                ShippedDate DATE,
+                ShipVia INT,
+                Freight DECIMAL(10,2),
+                ShipName VARCHAR(100),
+                ShipAddress VARCHAR(200),
+                ShipCity VARCHAR(50),
+                ShipRegion VARCHAR(50),
+                ShipPostalCode VARCHAR(20),
+                ShipCountry VARCHAR(50),
+                TotalAmount DECIMAL(10,2),
+                DeliveryStatus BIT,
+                DeliveryDelay INT,
+                SourceSystem VARCHAR(20),
+                FOREIGN KEY (CustomerKey) REFERENCES DimCustomer(CustomerKey),
+                FOREIGN KEY (EmployeeKey) REFERENCES DimEmployee(EmployeeKey),
+                FOREIGN KEY (OrderDateKey) REFERENCES DimDate(DateKey)
+            );
+
+            -- Performance optimization indexes
+            CREATE INDEX IX_OrderDate_Reference ON FactOrders(OrderDateKey);
+            CREATE INDEX IX_Customer_Reference ON FactOrders(CustomerKey);
+            CREATE INDEX IX_Employee_Reference ON FactOrders(EmployeeKey);
+        END
+        """,
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='QuarantineOrders' AND xtype='U')
+            CREATE TABLE QuarantineOrders (
+                QuarantineKey INT IDENTITY(1,1) PRIMARY KEY,
+                OrderID INT,
+                SourceSystem VARCHAR(20),
+                RejectReasons VARCHAR(400) NOT NULL,
+                RecordPayload NVARCHAR(MAX),
+                QuarantinedAt DATETIME NOT NULL DEFAULT GETDATE()
+            )
+        """
+    ]),
+    (2, "Dimension row hashes for change detection", [
+        "IF COL_LENGTH('DimCustomer', 'RowHash') IS NULL ALTER TABLE DimCustomer ADD RowHash BIGINT",
+        "IF COL_LENGTH('DimEmployee', 'RowHash') IS NULL ALTER TABLE DimEmployee ADD RowHash BIGINT"
+    ]),
+    (3, "Unique (OrderID, SourceSystem) for the staging anti-join", [
+        # The baseline loader never deduplicated its first batch: the first-loaded row of each
+        # order is kept, the later copies are quarantined and removed so the index can be built
+        """
+        WITH RankedOrders AS (
+            SELECT FactOrderKey, ROW_NUMBER() OVER (PARTITION BY OrderID, SourceSystem ORDER BY FactOrderKey) AS KeyRank
+            FROM FactOrders
+        )
+        INSERT INTO QuarantineOrders (OrderID, SourceSystem, RejectReasons, RecordPayload)
+        SELECT f.OrderID, f.SourceSystem, 'duplicate_order_key', payload.RecordPayload
+        FROM FactOrders f
+        JOIN RankedOrders r ON r.FactOrderKey = f.FactOrderKey
+        CROSS APPLY (SELECT f.* FOR JSON PATH, WITHOUT_ARRAY_WRAPPER) payload (RecordPayload)
+        WHERE r.KeyRank > 1
+        """,
+        """
+        WITH RankedOrders AS (
+            SELECT ROW_NUMBER() OVER (PARTITION BY OrderID, SourceSystem ORDER BY FactOrderKey) AS KeyRank
+            FROM FactOrders
+        )
+        DELETE FROM RankedOrders WHERE KeyRank > 1
+        """,
+        """
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'UX_FactOrders_Order_Source')
+            CREATE UNIQUE INDEX UX_FactOrders_Order_Source ON FactOrders(OrderID, SourceSystem)
+        """
+    ]),
+    (4, "Order lifecycle milestones for the accumulating snapshot", [
+        "IF COL_LENGTH('FactOrders', 'RequiredDateKey') IS NULL ALTER TABLE FactOrders ADD RequiredDateKey INT",
+        "IF COL_LENGTH('FactOrders', 'ShippedDateKey') IS NULL ALTER TABLE FactOrders ADD ShippedDateKey INT",
+        "IF COL_LENGTH('FactOrders', 'MilestoneUpdatedAt') IS NULL ALTER TABLE FactOrders ADD MilestoneUpdatedAt DATETIME"
+    ]),
+    (5, "Inventory subject area: products, transactions and daily stock snapshot", [
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimProduct' AND xtype='U')
+            CREATE TABLE DimProduct (
+                ProductKey INT IDENTITY(1,1) PRIMARY KEY,
+                ProductID INT NOT NULL,
+                ProductCode VARCHAR(25),
+                ProductName VARCHAR(100) NOT NULL,
+                Category VARCHAR(50),
+                ReorderLevel INT,
+                TargetLevel INT,
+                SourceSystem VARCHAR(20),
+                RowHash BIGINT,
+                UNIQUE(ProductID, SourceSystem)
+            )
+        """,
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='FactInventoryTransactions' AND xtype='U')
+        BEGIN
+            CREATE TABLE FactInventoryTransactions (
+                InventoryTransactionKey INT IDENTITY(1,1) PRIMARY KEY,
+                TransactionID INT NOT NULL UNIQUE,
+                ProductKey INT,
+                ProductID INT,
+                TransactionTypeID INT,
+                TransactionType VARCHAR(20),
+                TransactionDateKey INT NOT NULL,
+                TransactionDate DATETIME,
+                Quantity INT NOT NULL,
+                StockChange INT NOT NULL,
+                PurchaseOrderID INT,
+                CustomerOrderID INT,
+                FOREIGN KEY (ProductKey) REFERENCES DimProduct(ProductKey)
+            );
+
+            CREATE INDEX IX_Inventory_Date_Product ON FactInventoryTransactions(TransactionDateKey, ProductID)
+                INCLUDE (StockChange);
+        END
+        """,
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='FactInventorySnapshot' AND xtype='U')
+            CREATE TABLE FactInventorySnapshot (
+                SnapshotDateKey INT NOT NULL,
+                ProductID INT NOT NULL,
+                ProductKey INT,
+                SnapshotDate DATE NOT NULL,
+                Received INT NOT NULL,
+                Issued INT NOT NULL,
+                NetChange INT NOT NULL,
+                StockLevel INT NOT NULL,
+                PRIMARY KEY (SnapshotDateKey, ProductID),
+                FOREIGN KEY (ProductKey) REFERENCES DimProduct(ProductKey)
+            )
+        """
+    ]),
+    (6, "Purchasing subject area: suppliers and purchase order lines", [
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimSupplier' AND xtype='U')
+            CREATE TABLE DimSupplier (
+                SupplierKey INT IDENTITY(1,1) PRIMARY KEY,
+                SupplierID INT NOT NULL,
+                CompanyName VARCHAR(100) NOT NULL,
+                ContactName VARCHAR(100),
+                ContactTitle VARCHAR(100),
+                Address VARCHAR(200),
+                City VARCHAR(50),
+                Region VARCHAR(50),
+                PostalCode VARCHAR(20),
+                Country VARCHAR(50),
+                Phone VARCHAR(30),
+                SourceSystem VARCHAR(20),
+                RowHash BIGINT,
+                UNIQUE(SupplierID, SourceSystem)
+            )
+        """,
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='FactPurchaseOrders' AND xtype='U')
+        BEGIN
+            CREATE TABLE FactPurchaseOrders (
+                PurchaseOrderLineKey INT IDENTITY(1,1) PRIMARY KEY,
+                PurchaseOrderLineID INT NOT NULL UNIQUE,
+                PurchaseOrderID INT NOT NULL,
+                SupplierKey INT,
+                SupplierID INT,
+                ProductKey INT,
+                ProductID INT,
+                StatusID INT,
+                Status VARCHAR(20),
+                CreationDateKey INT,
+                SubmittedDateKey INT,
+                ApprovedDateKey INT,
+                ExpectedDateKey INT,
+                ReceivedDateKey INT,
+                Quantity INT NOT NULL,
+                UnitCost DECIMAL(10,4),
+                LineAmount DECIMAL(12,2),
+                PostedToInventory BIT,
+                InventoryTransactionID INT,
+                FOREIGN KEY (SupplierKey) REFERENCES DimSupplier(SupplierKey),
+                FOREIGN KEY (ProductKey) REFERENCES DimProduct(ProductKey),
+                FOREIGN KEY (CreationDateKey) REFERENCES DimDate(DateKey)
+            );
+
+            CREATE INDEX IX_Purchase_CreationDate ON FactPurchaseOrders(CreationDateKey);
+            CREATE INDEX IX_Purchase_Supplier ON FactPurchaseOrders(SupplierKey);
+            CREATE INDEX IX_Purchase_Product ON FactPurchaseOrders(ProductKey);
+        END
+        """
+    ]),
+    (7, "DimGeography replaces the FactOrders ship-to location columns", [
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimGeography' AND xtype='U')
+            CREATE TABLE DimGeography (
+                GeographyKey INT IDENTITY(1,1) PRIMARY KEY,
+                City VARCHAR(50) NOT NULL,
+                Region VARCHAR(50) NOT NULL,
+                PostalCode VARCHAR(20) NOT NULL,
+                Country VARCHAR(50) NOT NULL,
+                CONSTRAINT UX_DimGeography UNIQUE (Country, Region, City, PostalCode)
+            )
+        """,
+        """
+        IF COL_LENGTH('FactOrders', 'GeographyKey') IS NULL
+            ALTER TABLE FactOrders ADD GeographyKey INT
+                CONSTRAINT FK_FactOrders_Geography REFERENCES DimGeography(GeographyKey)
+        """,
+        # Existing rows keep their location through the key before the columns go
+        _when_column_exists('FactOrders', 'ShipCity', [
+            f"""
+            INSERT INTO DimGeography (City, Region, PostalCode, Country)
+            SELECT DISTINCT n.City, n.Region, n.PostalCode, n.Country
+            FROM FactOrders f
+            {_SHIP_TO_NORMALIZED}
+            WHERE NOT EXISTS (SELECT 1 FROM DimGeography g WHERE {_GEOGRAPHY_MATCH})
+            """,
+            f"""
+            UPDATE f SET GeographyKey = g.GeographyKey
+            FROM FactOrders f
+            {_SHIP_TO_NORMALIZED}
+            JOIN DimGeography g ON {_GEOGRAPHY_MATCH}
+            """,
+            f"ALTER TABLE FactOrders DROP COLUMN {', '.join(SHIP_TO_GEOGRAPHY)}"
+        ]),
+        """
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Geography_Reference')
+            CREATE INDEX IX_Geography_Reference ON FactOrders(GeographyKey)
+        """
+    ]),
+    (8, "Employee hierarchy closure bridge", [
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='BridgeEmployeeHierarchy' AND xtype='U')
+        BEGIN
+            CREATE TABLE BridgeEmployeeHierarchy (
+                AncestorKey INT NOT NULL,
+                DescendantKey INT NOT NULL,
+                Depth INT NOT NULL,
+                PRIMARY KEY (AncestorKey, DescendantKey),
+                FOREIGN KEY (AncestorKey) REFERENCES DimEmployee(EmployeeKey),
+                FOREIGN KEY (DescendantKey) REFERENCES DimEmployee(EmployeeKey)
+            );
+
+            -- Reverse lookups: the managers above an employee
+            CREATE INDEX IX_Hierarchy_Descendant ON BridgeEmployeeHierarchy(DescendantKey) INCLUDE (Depth);
+        END
+        """
+    ]),
+    (9, "Master customer cross-reference", [
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='CustomerMasterXref' AND xtype='U')
+        BEGIN
+            CREATE TABLE CustomerMasterXref (
+                CustomerKey INT PRIMARY KEY,
+                MasterCustomerKey INT NOT NULL,
+                MatchScore DECIMAL(5,4),
+                ResolvedRowHash BIGINT,
+                ResolvedAt DATETIME NOT NULL DEFAULT GETDATE(),
+                FOREIGN KEY (CustomerKey) REFERENCES DimCustomer(CustomerKey),
+                FOREIGN KEY (MasterCustomerKey) REFERENCES DimCustomer(CustomerKey)
+            );
+
+            -- Rollups group the members of each master customer
+            CREATE INDEX IX_CustomerXref_Master ON CustomerMasterXref(MasterCustomerKey);
+        END
+        """
+    ]),
+    (10, "Change Tracking sync versions", [
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='SourceSyncVersion' AND xtype='U')
+            CREATE TABLE SourceSyncVersion (
+                SourceTable VARCHAR(128) PRIMARY KEY,
+                LastSyncVersion BIGINT NOT NULL,
+                SyncedAt DATETIME NOT NULL DEFAULT GETDATE()
+            )
+        """
+    ])
+]
+
+LATEST_SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+
+class SchemaRegistry:
+    """Versioned warehouse schema, verified once per process per database.
+
+    The first ensure_current() reads the applied version and the column catalog,
+    applies pending migrations in order and caches both; later calls, and other ETL
+    instances in the same process, return immediately once the cached version is
+    the latest. A dry run caches the unmigrated state, which a later applying call
+    still migrates.
+    """
+
+    _catalogs = {}
+
+    def __init__(self, connection, database=None):
+        self.connection = connection
+        self.database = database or DatabaseConfig.TARGET_DATABASE
+
+    @property
+    def catalog(self):
+        cached = self._catalogs.get(self.database)
+        return cached[1] if cached is not None else None
+
+    def _read_state(self):
+        cursor = self.connection.cursor()
+        cursor.execute(CATALOG_QUERY)
+        catalog = {}
+        for table_name, column_name, data_type in cursor.fetchall():
+            catalog.setdefault(table_name, {})[column_name] = data_type
+
+        applied_version = 0
+        if 'SchemaVersion' in catalog:
+            cursor.execute("SELECT MAX(Version) FROM SchemaVersion")
+            applied_version = cursor.fetchone()[0] or 0
+        cursor.close()
+        return applied_version, catalog
+
+    def ensure_current(self, apply=True):
+        """Bring the warehouse to LATEST_SCHEMA_VERSION; returns the version in place afterwards"""
+        cached = self._catalogs.get(self.database)
+        if cached is not None and (cached[0] == LATEST_SCHEMA_VERSION or not apply):
+            return cached[0]
+
+        applied_version, catalog = self._read_state()
+        pending = [migration for migration in SCHEMA_MIGRATIONS if migration[0] > applied_version]
+
+        if pending and not apply:
+            logger.info(f"  🧪 Schema at version {applied_version}, {len(pending)} migrations not applied")
+            self._catalogs[self.database] = (applied_version, catalog)
+            return applied_version
+
+        for version, description, statements in pending:
+            self._apply(version, description, statements)
+
+        if pending:
+            _, catalog = self._read_state()
+        self._catalogs[self.database] = (LATEST_SCHEMA_VERSION, catalog)
+        logger.info(f"  ✅ Warehouse schema at version {LATEST_SCHEMA_VERSION}"
+                    f"{f' ({len(pending)} migrations applied)' if pending else ''}")
+        return LATEST_SCHEMA_VERSION
+
+    def _apply(self, version, description, statements):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(SCHEMA_VERSION_DDL)
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute("INSERT INTO SchemaVersion (Version, Description) VALUES (?, ?)", version, description)
+            self.connection.commit()
+            logger.info(f"    ⬆️  Schema migration {version}: {description}")
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def is_current(self):
+        """Whether this process verified the warehouse at LATEST_SCHEMA_VERSION; a dry run may cache an older one"""
+        cached = self._catalogs.get(self.database)
+        return cached is not None and cached[0] == LATEST_SCHEMA_VERSION
+
+    def columns(self, table_name):
+        return list((self.catalog or {}).get(table_name, {}))
+
+    def require_columns(self, table_name, columns):
+        """Fail before loading when the warehouse lacks a column the loader writes"""
+        if self.catalog is None:
+            raise ValueError(f"Cannot load {table_name}: the warehouse schema was not verified "
+                             f"(migration to version {LATEST_SCHEMA_VERSION} failed or never ran)")
+        missing = [column for column in columns if column not in self.catalog.get(table_name, {})]
+        if missing:
+            raise ValueError(f"{table_name} is missing columns {', '.join(missing)}; "
+                             f"schema version {LATEST_SCHEMA_VERSION} expected")
+
+    @classmethod
+    def invalidate(cls, database=None):
+        cls._catalogs.pop(database or DatabaseConfig.TARGET_DATABASE, None)
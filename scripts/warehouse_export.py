@@ -0,0 +1,94 @@
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+EXPORT_DIRECTORY = os.path.join('data', 'warehouse')
+# Star schema tables the reporting side reads; pipeline bookkeeping (SchemaVersion,
+# SourceSyncVersion) and QuarantineOrders stay in the warehouse
+WAREHOUSE_TABLES = [
+    'DimDate', 'DimCustomer', 'DimEmployee', 'DimGeography', 'DimProduct', 'DimSupplier',
+    'BridgeEmployeeHierarchy', 'CustomerMasterXref',
+    'FactOrders', 'FactInventoryTransactions', 'FactInventorySnapshot', 'FactPurchaseOrders'
+]
+
+
+def _pointer_path(table_name, directory):
+    return os.path.join(directory, f"{table_name}.current")
+
+
+def _export_path(table_name, directory):
+    """Arrow file currently published for a table, as named by its pointer file"""
+    pointer_path = _pointer_path(table_name, directory)
+    if not os.path.exists(pointer_path):
+        # Exports that predate versioned file names
+        return os.path.join(directory, f"{table_name}.arrow")
+    with open(pointer_path, encoding='utf-8') as pointer:
+        return os.path.join(directory, pointer.read().strip())
+
+
+def _remove_superseded_versions(table_name, directory, current_file):
+    """Delete earlier versions of a table; files a reader still has mapped are left for the next export"""
+    for file_name in os.listdir(directory):
+        if file_name.startswith(f"{table_name}.") and file_name.endswith('.arrow') and file_name != current_file:
+            try:
+                os.remove(os.path.join(directory, file_name))
+            except OSError:
+                pass
+
+
+def export_warehouse_tables(connection, tables=None, directory=EXPORT_DIRECTORY):
+    """Write each warehouse table as an uncompressed Arrow IPC (Feather v2) file: (exported, failed).
+
+    Every export writes a new versioned file and then swaps the table's small
+    pointer file with os.replace. A mapped Arrow file is never overwritten, which
+    Windows refuses while a reader holds it, so readers keep the version they opened
+    and new readers get the new one. A table that fails is reported in failed
+    (table -> error message) without stopping the others.
+    """
+    os.makedirs(directory, exist_ok=True)
+    exported, failed = {}, {}
+
+    for table_name in tables or WAREHOUSE_TABLES:
+        try:
+            table_data = pd.read_sql(f"SELECT * FROM {table_name}", connection)
+            arrow_table = pa.Table.from_pandas(table_data, preserve_index=False)
+
+            version_file = f"{table_name}.{time.time_ns()}.arrow"
+            # Uncompressed buffers are what make memory-mapped reads zero-copy
+            feather.write_feather(arrow_table, os.path.join(directory, version_file), compression='uncompressed')
+
+            pointer_path = _pointer_path(table_name, directory)
+            with open(pointer_path + '.tmp', 'w', encoding='utf-8') as pointer:
+                pointer.write(version_file)
+            os.replace(pointer_path + '.tmp', pointer_path)
+
+            _remove_superseded_versions(table_name, directory, version_file)
+            exported[table_name] = len(table_data)
+        except Exception as e:
+            failed[table_name] = str(e)
+
+    return exported, failed
+
+
+def load_warehouse_arrow(table_name, columns=None, directory=EXPORT_DIRECTORY):
+    """Memory-map an exported table; buffers stay in the shared OS page cache"""
+    source = pa.memory_map(_export_path(table_name, directory), 'r')
+    arrow_table = pa.ipc.open_file(source).read_all()
+    if columns:
+        arrow_table = arrow_table.select(columns)
+    return arrow_table
+
+
+def load_warehouse_table(table_name, columns=None, directory=EXPORT_DIRECTORY):
+    """DataFrame view of an exported table; null-free numeric columns are not copied"""
+    arrow_table = load_warehouse_arrow(table_name, columns, directory)
+    return arrow_table.to_pandas(split_blocks=True)
+
+
+def load_warehouse(tables=None, directory=EXPORT_DIRECTORY):
+    """All exported tables keyed by name, for notebook and dashboard consumers"""
+    return {table_name: load_warehouse_table(table_name, directory=directory) for table_name in tables or WAREHOUSE_TABLES}